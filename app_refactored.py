@@ -4,13 +4,13 @@ Clean, modular implementation with separated concerns.
 """
 
 import tkinter as tk
-import subprocess
+import multiprocessing
 import os
-import pyperclip
 from typing import Optional
 
-from config import JOTFORM_TEMPLATES, APP_SETTINGS
-from utils import DataProcessor, HTMLProcessor, FileHandler
+from config import (JOTFORM_TEMPLATES, APP_SETTINGS, SUPPORTED_FILE_TYPES, BATCH_SETTINGS,
+                    PREWARM_SETTINGS)
+from utils import DataProcessor, HTMLProcessor, FileHandler, CompressionHandler
 from gui_components import DialogHelper, MenuBuilder, ButtonGrid
 
 
@@ -20,6 +20,8 @@ class UniteToolboxApp:
     def __init__(self):
         """Initialize the application."""
         self.root = tk.Tk()
+        self.validator_window = None
+        self.batch_task = None
         self.setup_window()
         self.setup_menu()
         self.setup_gui()
@@ -53,6 +55,7 @@ class UniteToolboxApp:
         button_grid.add_button("CSV 2 UWP", self.convert_csv_to_uwp)
         button_grid.add_button("CSV 2 SMS List", self.create_sms_list)
         button_grid.add_button("CSV Divide by Workplace", self.divide_by_workplace)
+        button_grid.add_button("CSV 2 UWP (Batch)", self.convert_csv_batch_to_uwp)
         
         # HTML Tools Section
         button_grid.new_row()
@@ -62,11 +65,14 @@ class UniteToolboxApp:
         button_grid.add_button("Process HTML File", self.process_html_file)
     
     def launch_validator(self):
-        """Launch the JotForm validator application."""
+        """Open the JotForm validator window (in-process; reused if already open)."""
         try:
-            script_dir = os.path.dirname(os.path.realpath(__file__))
-            validator_path = os.path.join(script_dir, 'validate-jot.py')
-            subprocess.Popen(['python3', validator_path])
+            if self.validator_window is not None and self.validator_window.winfo_exists():
+                self.validator_window.show()
+                return
+            from validator_window import ValidatorWindow
+            self.validator_window = ValidatorWindow(self.root)
+            self.validator_window.attributes("-topmost", APP_SETTINGS["topmost"])
         except Exception as e:
             DialogHelper.show_error(f"Failed to launch validator: {e}")
     
@@ -101,6 +107,54 @@ class UniteToolboxApp:
         except Exception as e:
             DialogHelper.show_error(f"An error occurred: {e}")
     
+    def convert_csv_batch_to_uwp(self):
+        """Convert a folder of branch files to UWP format in one go."""
+        if self.batch_task is not None and not self.batch_task.done():
+            DialogHelper.show_info("A batch conversion is already running.")
+            return
+        try:
+            from batch_convert import convert_batch
+            
+            # Select input folder
+            input_dir = DialogHelper.select_directory("Select folder of files to convert")
+            if not input_dir:
+                return
+            
+            # Select output file (zip of per-file outputs, or one combined CSV)
+            output_file = DialogHelper.select_save_file(
+                "Save UWP files as",
+                default_extension=".zip",
+                file_types=SUPPORTED_FILE_TYPES["zip"] + SUPPORTED_FILE_TYPES["csv"]
+            )
+            if not output_file:
+                return
+            
+            report_path = None
+            if not output_file.lower().endswith('.zip'):
+                report_path = os.path.splitext(output_file)[0] + "_report.csv"
+            
+            def show_result(result):
+                failed = [entry for entry in result.report if entry['error']]
+                message = (f"Converted {len(result.report) - len(failed)} of {len(result.report)} files "
+                           f"({result.total_rows} rows, {result.duplicates_dropped} duplicates removed) "
+                           f"in {result.seconds:.1f}s.\nSaved to: {output_file}")
+                if failed:
+                    message += "\n\nFailed files:\n" + "\n".join(
+                        f"{entry['file']}: {entry['error']}" for entry in failed[:10])
+                DialogHelper.show_info(message)
+            
+            # Convert on a worker thread so the window stays responsive
+            self.batch_task = self.run_in_background(
+                lambda: convert_batch(input_dir, output_file,
+                                      workers=BATCH_SETTINGS["max_workers"],
+                                      report_path=report_path),
+                show_result)
+            
+        except ValueError as e:
+            DialogHelper.show_error(str(e))
+        except Exception as e:
+            DialogHelper.show_error(f"An error occurred: {e}")
+    
     def create_sms_list(self):
         """Create SMS list from data file."""
         try:
@@ -158,7 +212,10 @@ class UniteToolboxApp:
             workplaces = DataProcessor.divide_by_workplace(df, workplace_column)
             
             # Save individual files
-            file_extension = '.xlsx' if input_file.endswith('.xlsx') else '.csv'
+            base_name, _ = CompressionHandler.split_compression(input_file)
+            file_extension = os.path.splitext(base_name)[1].lower()
+            if file_extension not in ('.xlsx', '.parquet', '.feather'):
+                file_extension = '.csv'
             num_workplaces = len(workplaces)
             for workplace_name, workplace_df in workplaces.items():
                 safe_filename = FileHandler.get_safe_filename(workplace_name)
@@ -206,6 +263,7 @@ class UniteToolboxApp:
                 file.write(processed_html)
             
             # Copy to clipboard
+            import pyperclip
             pyperclip.copy(processed_html)
             
             DialogHelper.show_info("HTML processed successfully and copied to clipboard!")
@@ -213,13 +271,66 @@ class UniteToolboxApp:
         except Exception as e:
             DialogHelper.show_error(f"An error occurred: {e}")
     
+    def run_in_background(self, work, on_done):
+        """
+        Run a long operation on a worker thread, keeping the window responsive.
+        Tk is only used from the main thread, which polls for the result.
+        
+        Args:
+            work: Function to run on the worker thread
+            on_done: Function called on the main thread with the result
+            
+        Returns:
+            Future of the result
+        """
+        import threading
+        from concurrent.futures import Future
+        future = Future()
+        
+        def target():
+            try:
+                future.set_result(work())
+            except Exception as e:
+                future.set_exception(e)
+        
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+                return
+            self.root.config(cursor='')
+            try:
+                result = future.result()
+            except ValueError as e:
+                DialogHelper.show_error(str(e))
+                return
+            except Exception as e:
+                DialogHelper.show_error(f"An error occurred: {e}")
+                return
+            on_done(result)
+        
+        self.root.config(cursor='watch')
+        threading.Thread(target=target, name='toolbox-worker', daemon=True).start()
+        self.root.after(100, poll)
+        return future
+    
+    def prewarm(self):
+        """Import heavy modules on a background thread so the first click is fast."""
+        import lazy_imports
+        lazy_imports.prewarm(PREWARM_SETTINGS["modules"])
+    
     def run(self):
         """Start the application."""
+        if PREWARM_SETTINGS["enabled"]:
+            # Start once the window is up and the event loop is idle
+            delay_ms = int(PREWARM_SETTINGS["delay_seconds"] * 1000)
+            self.root.after(delay_ms, lambda: self.root.after_idle(self.prewarm))
         self.root.mainloop()
 
 
 def main():
     """Main entry point for the application."""
+    # Needed for batch conversion worker processes in frozen executables
+    multiprocessing.freeze_support()
     app = UniteToolboxApp()
     app.run()
 
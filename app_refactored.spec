@@ -10,11 +10,19 @@ a = Analysis(
     datas=[
         ('config.py', '.'),          # Include config
         ('utils.py', '.'),           # Include utils
+        ('lazy_imports.py', '.'),    # Include lazy import registry
+        ('instrumentation.py', '.'), # Include stage instrumentation
+        ('batch_convert.py', '.'),   # Include batch UWP conversion
+        ('snapshot_store.py', '.'),  # Include SQLite snapshot store
         ('gui_components.py', '.'),  # Include GUI components
         ('validate-jot.py', '.'),    # Include validator script
+        ('validator_window.py', '.'), # Include in-process validator window
+        ('jotform_validator.py', '.'), # Include bulk JotForm validation
+        ('http_cache.py', '.'),      # Include JotForm page cache
     ],
     hiddenimports=[
         'pandas',
+        'sqlite3',
         'premailer',
         'pyperclip',
         'openpyxl',
@@ -26,7 +34,7 @@ a = Analysis(
         'requests',
         'beautifulsoup4',
         'bs4',
-        'tkhtmlview',
+        'lxml',
     ],
     hookspath=[],
     hooksconfig={},
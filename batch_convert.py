@@ -0,0 +1,322 @@
+"""
+Batch CSV to UWP conversion for the Unite Toolbox.
+Converts a directory, zip archive or list of branch files in a shared process
+pool, deduplicates members across files and reports per-file timings. Zip
+output can be streamed entry by entry.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, NamedTuple, Optional, Dict, List, Tuple
+
+import lazy_imports
+from utils import DataProcessor, CompressionHandler, FileHandler
+
+_get_pandas = lazy_imports.getter('pandas')
+
+MEMBERSHIP_COLUMN = "MembershipNumber"
+DATA_EXTENSIONS = ('.csv', '.xlsx', '.parquet', '.feather')
+
+# Worker pools shared by all batches, keyed by worker count (see get_executor)
+_executors: Dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+class BatchInput(NamedTuple):
+    """One file to convert: a path, or a member inside a zip archive."""
+    path: str
+    member: Optional[str]
+    name: str
+
+
+class BatchResult(NamedTuple):
+    """Outcome of a batch conversion."""
+    report: List[Dict]        # One entry per input file, in input order
+    total_rows: int           # Rows written to the output
+    duplicates_dropped: int   # Rows dropped as repeated membership numbers
+    seconds: float            # Wall time for the whole batch
+
+
+def _is_data_file(file_name: str) -> bool:
+    """Check whether a file name looks like a supported (possibly compressed) data file."""
+    base_name, compression = CompressionHandler.split_compression(file_name)
+    return compression != 'zip' and base_name.lower().endswith(DATA_EXTENSIONS)
+
+
+def collect_inputs(source) -> List[BatchInput]:
+    """
+    List the files to convert.
+
+    Args:
+        source: Directory path, path to a .zip archive, or a list of file paths
+                (or BatchInput entries when display names differ from paths)
+
+    Returns:
+        List of BatchInput in a stable (sorted) order
+
+    Raises:
+        ValueError: If no data files are found
+    """
+    inputs = []
+    if isinstance(source, (list, tuple)):
+        inputs = [item if isinstance(item, BatchInput) else BatchInput(item, None, os.path.basename(item))
+                  for item in source]
+    elif os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if os.path.isfile(path) and _is_data_file(name):
+                inputs.append(BatchInput(path, None, name))
+    elif source.lower().endswith('.zip'):
+        with zipfile.ZipFile(source) as zip_file:
+            for info in sorted(zip_file.infolist(), key=lambda item: item.filename):
+                base = os.path.basename(info.filename)
+                if (not info.is_dir() and not info.filename.startswith('__MACOSX/')
+                        and not base.startswith('._') and _is_data_file(base)):
+                    inputs.append(BatchInput(source, info.filename, info.filename))
+    else:
+        raise ValueError("Batch input must be a directory, a .zip file or a list of files.")
+    if not inputs:
+        raise ValueError("No .csv, .xlsx, .parquet or .feather files found to convert.")
+    return inputs
+
+
+def _convert_one(batch_input: BatchInput, column_mapping: Optional[Dict[str, str]]) -> Tuple:
+    """
+    Load and convert a single file (runs in a worker process).
+
+    Returns:
+        Tuple of (converted DataFrame or None, report entry)
+    """
+    entry = {'file': batch_input.name}
+    try:
+        start = time.perf_counter()
+        if batch_input.member is None:
+            df = DataProcessor.load_data_file(batch_input.path)
+        else:
+            with zipfile.ZipFile(batch_input.path) as zip_file:
+                with zip_file.open(batch_input.member) as stream:
+                    df = DataProcessor.load_data_file(stream, file_name=batch_input.member)
+        loaded = time.perf_counter()
+        df_uwp = DataProcessor.convert_csv_to_uwp(df, column_mapping=column_mapping)
+        converted = time.perf_counter()
+        entry.update({
+            'rows_in': len(df),
+            'load_seconds': round(loaded - start, 4),
+            'convert_seconds': round(converted - loaded, 4),
+            'error': ''
+        })
+        return df_uwp, entry
+    except Exception as e:
+        entry.update({'rows_in': 0, 'load_seconds': 0.0, 'convert_seconds': 0.0, 'error': str(e)})
+        return None, entry
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared worker pool for a worker count, creating it on first use.
+    Workers are started with 'spawn' rather than fork, so a multi-threaded
+    caller (the GUI's worker thread, a web server) is never forked, and the
+    pool is reused by later batches instead of being started for each one.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    with _executors_lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context('spawn'))
+            _executors[workers] = executor
+        return executor
+
+
+def _iter_converted(inputs: List[BatchInput], column_mapping, workers: int):
+    """Yield (DataFrame, report entry) per input in order, using the worker pool if useful."""
+    if workers <= 1 or len(inputs) == 1:
+        for batch_input in inputs:
+            yield _convert_one(batch_input, column_mapping)
+        return
+    try:
+        yield from get_executor(workers).map(_convert_one, inputs, [column_mapping] * len(inputs))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next batch
+        with _executors_lock:
+            _executors.pop(workers, None)
+        raise
+
+
+def _iter_deduplicated(inputs: List[BatchInput], column_mapping, workers: int,
+                       deduplicate: bool, report: List[Dict]):
+    """
+    Yield (report entry, DataFrame) for each converted input in order, with
+    members already seen in an earlier file dropped. Rows without a
+    membership number are always kept. Every entry, including failed files,
+    is appended to report.
+    """
+    seen_members = set()
+    for df_uwp, entry in _iter_converted(inputs, column_mapping, workers):
+        if df_uwp is not None and deduplicate and MEMBERSHIP_COLUMN in df_uwp.columns:
+            present = df_uwp[MEMBERSHIP_COLUMN].notna().to_numpy()
+            keys = df_uwp[MEMBERSHIP_COLUMN][present].astype(str)
+            repeated = (keys.isin(seen_members) | keys.duplicated()).to_numpy()
+            keep = ~present
+            keep[present] = ~repeated
+            entry['duplicates_dropped'] = int(repeated.sum())
+            df_uwp = df_uwp[keep]
+            seen_members.update(keys[~repeated].tolist())
+        else:
+            entry['duplicates_dropped'] = 0
+        entry['rows_out'] = 0 if df_uwp is None else len(df_uwp)
+        report.append(entry)
+        if df_uwp is not None:
+            yield entry, df_uwp
+
+
+def _iter_zip_entries(converted, report: List[Dict]):
+    """Name each converted file's zip entry uniquely, then add the report."""
+    pd = _get_pandas()
+    used_names = set()
+    for entry, df_uwp in converted:
+        stem = CompressionHandler.split_compression(os.path.basename(entry['file']))[0]
+        entry_stem = FileHandler.get_safe_filename(os.path.splitext(stem)[0]) or 'file'
+        entry_name = f"{entry_stem}_uwp.csv"
+        suffix = 1
+        while entry_name in used_names:
+            suffix += 1
+            entry_name = f"{entry_stem}_{suffix}_uwp.csv"
+        used_names.add(entry_name)
+        yield entry_name, df_uwp
+    yield 'batch_report.csv', pd.DataFrame(report)
+
+
+def _batch_result(report: List[Dict], started: float) -> BatchResult:
+    """Total up a finished batch."""
+    return BatchResult(report=report,
+                       total_rows=sum(entry['rows_out'] for entry in report),
+                       duplicates_dropped=sum(entry['duplicates_dropped'] for entry in report),
+                       seconds=round(time.perf_counter() - started, 4))
+
+
+def iter_batch_zip_bytes(source, column_mapping: Dict[str, str] = None,
+                         workers: int = None, deduplicate: bool = True,
+                         level: int = 6, on_complete: Callable[[BatchResult], None] = None):
+    """
+    Convert many files to UWP format as a streamed zip archive: one CSV per
+    input plus batch_report.csv, each entry sent as soon as it is converted.
+    The inputs are listed before the first chunk, so a bad source raises here
+    rather than in the middle of a download.
+
+    Args:
+        source: Directory, .zip archive or list of file paths (see collect_inputs)
+        column_mapping: Optional custom mapping applied to every file
+        workers: Worker processes (defaults to the CPU count; 1 converts in-process)
+        deduplicate: Drop rows whose MembershipNumber appeared in an earlier file
+        level: Deflate level (1-9)
+        on_complete: Optional function called with the BatchResult after the last chunk
+
+    Returns:
+        Generator of zip archive bytes
+
+    Raises:
+        ValueError: If no data files are found
+    """
+    started = time.perf_counter()
+    inputs = collect_inputs(source)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    def generate():
+        report = []
+        converted = _iter_deduplicated(inputs, column_mapping, workers, deduplicate, report)
+        yield from CompressionHandler.iter_zip_bytes(_iter_zip_entries(converted, report), level=level)
+        if on_complete is not None:
+            on_complete(_batch_result(report, started))
+
+    return generate()
+
+
+def convert_batch_frame(source, column_mapping: Dict[str, str] = None,
+                        workers: int = None, deduplicate: bool = True) -> Tuple['pd.DataFrame', BatchResult]:
+    """
+    Convert many files to UWP format as one combined DataFrame.
+
+    Args:
+        source: Directory, .zip archive or list of file paths (see collect_inputs)
+        column_mapping: Optional custom mapping applied to every file
+        workers: Worker processes (defaults to the CPU count; 1 converts in-process)
+        deduplicate: Drop rows whose MembershipNumber appeared in an earlier file
+
+    Returns:
+        Tuple of (combined DataFrame, BatchResult)
+
+    Raises:
+        ValueError: If no data files are found
+    """
+    pd = _get_pandas()
+    started = time.perf_counter()
+    inputs = collect_inputs(source)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    report = []
+    combined = [df_uwp for _, df_uwp in
+                _iter_deduplicated(inputs, column_mapping, workers, deduplicate, report)]
+    df_all = pd.concat(combined, ignore_index=True) if combined else pd.DataFrame(
+        columns=DataProcessor.get_uwp_output_columns())
+    return df_all, _batch_result(report, started)
+
+
+def convert_batch(source, output, column_mapping: Dict[str, str] = None,
+                  workers: int = None, deduplicate: bool = True,
+                  output_format: str = None, report_path: str = None) -> BatchResult:
+    """
+    Convert many files to UWP format.
+
+    Args:
+        source: Directory, .zip archive or list of file paths (see collect_inputs)
+        output: Output path, or a binary file object when output_format is given
+        column_mapping: Optional custom mapping applied to every file
+        workers: Worker processes (defaults to the CPU count; 1 disables the pool)
+        deduplicate: Drop rows whose MembershipNumber appeared in an earlier file
+        output_format: 'zip' for one CSV per input plus batch_report.csv, or a
+                       save_data_file type ('csv', 'xlsx', ...) for one combined
+                       file. If None, inferred from the output path.
+        report_path: Optional path to also save the per-file report as CSV
+
+    Returns:
+        BatchResult with per-file report and totals
+    """
+    pd = _get_pandas()
+    if output_format is None:
+        output_format = 'zip' if str(output).lower().endswith('.zip') else None
+
+    if output_format == 'zip':
+        results = []
+        chunks = iter_batch_zip_bytes(source, column_mapping, workers, deduplicate,
+                                      on_complete=results.append)
+        file = open(output, 'wb') if isinstance(output, str) else output
+        try:
+            for chunk in chunks:
+                file.write(chunk)
+        finally:
+            if isinstance(output, str):
+                file.close()
+        result = results[0]
+    else:
+        df_all, result = convert_batch_frame(source, column_mapping, workers, deduplicate)
+        if isinstance(output, str):
+            DataProcessor.save_data_file(df_all, output, output_format)
+        else:
+            df_all.to_csv(output, index=False, lineterminator='\n', encoding='utf-8')
+
+    if report_path:
+        DataProcessor.save_data_file(pd.DataFrame(result.report), report_path)
+
+    return result
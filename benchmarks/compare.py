@@ -0,0 +1,202 @@
+"""
+Performance regression gate for the Unite Toolbox benchmarks.
+Compares a benchmark run against a stored baseline and exits non-zero when
+an operation's throughput drops or its peak memory rises beyond a threshold.
+
+Usage:
+    python benchmarks/run_benchmarks.py -o benchmarks/results/current.json
+    python benchmarks/compare.py benchmarks/results/baseline.json benchmarks/results/current.json
+
+    # Accept the current run as the new baseline when it passes
+    python benchmarks/compare.py baseline.json current.json --update-baseline
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+from generate_data import format_size
+
+DEFAULT_TIME_THRESHOLD = 0.15
+DEFAULT_MEMORY_THRESHOLD = 0.10
+# Timings below this are dominated by noise and are never flagged
+DEFAULT_MIN_SECONDS = 0.01
+# Environment fields that make runs incomparable when they differ
+ENVIRONMENT_FIELDS = ('python', 'pandas', 'machine', 'cpu_count')
+
+
+def load_report(file_path: str) -> Dict:
+    """
+    Load a benchmark report written by run_benchmarks.py.
+
+    Raises:
+        ValueError: If the file is not a benchmark report
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        report = json.load(file)
+    if not isinstance(report, dict) or 'results' not in report:
+        raise ValueError(f"'{file_path}' is not a benchmark report.")
+    return report
+
+
+def _change(baseline: Optional[float], current: Optional[float]) -> Optional[float]:
+    """Relative change from baseline to current, or None if either is missing."""
+    if baseline is None or current is None or baseline == 0:
+        return None
+    return (current - baseline) / baseline
+
+
+def compare_reports(baseline: Dict, current: Dict,
+                    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+                    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+                    min_seconds: float = DEFAULT_MIN_SECONDS) -> List[Dict]:
+    """
+    Compare two benchmark reports operation by operation.
+    Time is compared on the fastest run (min_seconds), the least noisy figure.
+
+    Args:
+        baseline: Baseline report
+        current: Current report
+        time_threshold: Allowed relative slowdown (0.15 = 15% slower)
+        memory_threshold: Allowed relative rise in peak RSS
+        min_seconds: Timings faster than this in both runs are not flagged
+
+    Returns:
+        One entry per operation and size with the changes and a status of
+        'ok', 'improved', 'regressed', 'error', 'new' or 'missing'
+    """
+    baseline_results = {(entry['operation'], entry['rows']): entry for entry in baseline['results']}
+    current_results = {(entry['operation'], entry['rows']): entry for entry in current['results']}
+
+    comparisons = []
+    for key in list(baseline_results) + [key for key in current_results if key not in baseline_results]:
+        old, new = baseline_results.get(key), current_results.get(key)
+        entry = {'operation': key[0], 'rows': key[1], 'reasons': []}
+        if new is None:
+            entry['status'] = 'missing'
+        elif old is None:
+            entry['status'] = 'new'
+        elif 'error' in new:
+            entry['status'] = 'error'
+            entry['reasons'].append(new['error'])
+        elif 'error' in old:
+            entry['status'] = 'new'
+        else:
+            entry.update({
+                'baseline_seconds': old['min_seconds'],
+                'current_seconds': new['min_seconds'],
+                'time_change': _change(old['min_seconds'], new['min_seconds']),
+                'baseline_peak_rss_mb': old.get('peak_rss_mb'),
+                'current_peak_rss_mb': new.get('peak_rss_mb'),
+                'memory_change': _change(old.get('peak_rss_mb'), new.get('peak_rss_mb'))
+            })
+            above_noise = max(old['min_seconds'], new['min_seconds']) >= min_seconds
+            if above_noise and entry['time_change'] is not None and entry['time_change'] > time_threshold:
+                entry['reasons'].append(f"{entry['time_change']:+.1%} time")
+            if entry['memory_change'] is not None and entry['memory_change'] > memory_threshold:
+                entry['reasons'].append(f"{entry['memory_change']:+.1%} peak memory")
+            if entry['reasons']:
+                entry['status'] = 'regressed'
+            elif above_noise and entry['time_change'] is not None and entry['time_change'] < -time_threshold:
+                entry['status'] = 'improved'
+            else:
+                entry['status'] = 'ok'
+        comparisons.append(entry)
+    return comparisons
+
+
+def environment_differences(baseline: Dict, current: Dict) -> List[str]:
+    """List environment fields that differ between two reports."""
+    old, new = baseline.get('metadata', {}), current.get('metadata', {})
+    return [f"{field}: {old.get(field)} -> {new.get(field)}"
+            for field in ENVIRONMENT_FIELDS if old.get(field) != new.get(field)]
+
+
+def format_report(comparisons: List[Dict]) -> str:
+    """Format a comparison as a plain text table."""
+    def rows_label(rows):
+        return format_size(rows) if rows else '-'
+
+    def change_label(change):
+        return '-' if change is None else f"{change:+.1%}"
+
+    def memory_label(megabytes):
+        return '-' if megabytes is None else f"{megabytes:.1f}"
+
+    lines = [f"{'operation':<24}{'rows':>8}{'base s':>10}{'now s':>10}{'time':>9}"
+             f"{'base MB':>10}{'now MB':>10}{'memory':>9}  status"]
+    for entry in comparisons:
+        if 'time_change' in entry:
+            lines.append(
+                f"{entry['operation']:<24}{rows_label(entry['rows']):>8}"
+                f"{entry['baseline_seconds']:>10.3f}{entry['current_seconds']:>10.3f}"
+                f"{change_label(entry['time_change']):>9}"
+                f"{memory_label(entry['baseline_peak_rss_mb']):>10}"
+                f"{memory_label(entry['current_peak_rss_mb']):>10}"
+                f"{change_label(entry['memory_change']):>9}  {entry['status'].upper()}"
+            )
+        else:
+            lines.append(f"{entry['operation']:<24}{rows_label(entry['rows']):>8}"
+                         f"{'':>58}  {entry['status'].upper()}")
+        if entry['reasons']:
+            lines.append(f"{'':<32}{'; '.join(entry['reasons'])}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when benchmarks regress against a baseline.")
+    parser.add_argument('baseline', help="Baseline JSON report")
+    parser.add_argument('current', help="Current JSON report")
+    parser.add_argument('--time-threshold', type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default: {DEFAULT_TIME_THRESHOLD})")
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help=f"Allowed peak memory rise as a fraction (default: {DEFAULT_MEMORY_THRESHOLD})")
+    parser.add_argument('--min-seconds', type=float, default=DEFAULT_MIN_SECONDS,
+                        help=f"Ignore timings below this many seconds (default: {DEFAULT_MIN_SECONDS})")
+    parser.add_argument('--fail-on-missing', action='store_true',
+                        help="Also fail when a baseline operation is missing from the current run")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Copy the current report over the baseline when there are no regressions")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.baseline):
+        if args.update_baseline:
+            shutil.copyfile(args.current, args.baseline)
+            print(f"No baseline found; saved {args.current} as {args.baseline}")
+            return 0
+        print(f"Error: baseline '{args.baseline}' not found", file=sys.stderr)
+        return 2
+
+    try:
+        baseline, current = load_report(args.baseline), load_report(args.current)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    for difference in environment_differences(baseline, current):
+        print(f"Warning: environment differs ({difference})", file=sys.stderr)
+
+    comparisons = compare_reports(baseline, current, args.time_threshold,
+                                  args.memory_threshold, args.min_seconds)
+    print(format_report(comparisons))
+
+    # An operation that crashed always fails the gate; a missing one only on request
+    failing = {'regressed', 'error'} | ({'missing'} if args.fail_on_missing else set())
+    failures = [entry for entry in comparisons if entry['status'] in failing]
+    if failures:
+        print(f"\n{len(failures)} operation(s) errored or regressed beyond thresholds "
+              f"(time {args.time_threshold:.0%}, memory {args.memory_threshold:.0%})")
+        return 1
+
+    print("\nNo regressions.")
+    if args.update_baseline and not os.path.samefile(args.current, args.baseline):
+        shutil.copyfile(args.current, args.baseline)
+        print(f"Baseline updated from {args.current}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
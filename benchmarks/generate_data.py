@@ -0,0 +1,269 @@
+"""
+Synthetic membership export generator for the Unite Toolbox benchmarks.
+Produces files with the CSV_COLUMN_MAPPING columns and a realistic shape:
+workplace sizes follow a long-tailed (Zipf-like) distribution, each workplace
+belongs to one employer and region, and contact fields are partly blank.
+
+Usage:
+    python benchmarks/generate_data.py 100k -o benchmarks/data/export_100k.csv
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import CSV_COLUMN_MAPPING  # noqa: E402
+
+FIRST_NAMES = np.array([
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda",
+    "David", "Elizabeth", "William", "Susan", "Richard", "Jessica", "Joseph", "Sarah",
+    "Thomas", "Karen", "Mohammed", "Aisha", "Oliver", "Amelia", "Harry", "Olivia",
+    "Jack", "Isla", "George", "Ava", "Noah", "Emily", "Charlie", "Sophie", "Jacob",
+    "Grace", "Alfie", "Lily", "Freddie", "Mia", "Oscar", "Ella", "Priya", "Arjun",
+    "Siobhan", "Ciaran", "Rhys", "Cerys", "Fraser", "Eilidh", "Kwame", "Ngozi"
+])
+SURNAMES = np.array([
+    "Smith", "Jones", "Williams", "Taylor", "Brown", "Davies", "Evans", "Wilson",
+    "Thomas", "Johnson", "Roberts", "Robinson", "Thompson", "Wright", "Walker", "White",
+    "Edwards", "Hughes", "Green", "Hall", "Lewis", "Harris", "Clarke", "Patel", "Jackson",
+    "Wood", "Turner", "Martin", "Cooper", "Hill", "Ward", "Morris", "Moore", "Clark",
+    "Lee", "King", "Baker", "Harrison", "Morgan", "Allen", "James", "Scott", "Phillips",
+    "Watson", "Davis", "Parker", "Price", "Bennett", "Young", "Griffiths", "Khan",
+    "O'Brien", "MacDonald", "Singh", "Campbell", "Kelly", "Murphy", "Ahmed", "Shah"
+])
+STREETS = np.array([
+    "High Street", "Station Road", "Main Street", "Park Road", "Church Road",
+    "Church Street", "London Road", "Victoria Road", "Green Lane", "Manor Road",
+    "Church Lane", "Park Avenue", "The Avenue", "The Crescent", "Queens Road",
+    "New Road", "Grange Road", "Kings Road", "Kingsway", "Windsor Road"
+])
+TOWNS = np.array([
+    "Birmingham", "Leeds", "Glasgow", "Sheffield", "Bradford", "Manchester",
+    "Edinburgh", "Liverpool", "Bristol", "Cardiff", "Coventry", "Nottingham",
+    "Leicester", "Sunderland", "Belfast", "Newcastle", "Brighton", "Hull",
+    "Plymouth", "Stoke-on-Trent", "Wolverhampton", "Derby", "Swansea", "Southampton"
+])
+POSTCODE_AREAS = np.array([
+    "B", "LS", "G", "S", "BD", "M", "EH", "L", "BS", "CF", "CV", "NG",
+    "LE", "SR", "BT", "NE", "BN", "HU", "PL", "ST", "WV", "DE", "SA", "SO"
+])
+REGIONS = np.array([
+    "London & Eastern", "North West", "North East, Yorkshire & Humber",
+    "West Midlands", "East Midlands", "South East", "South West", "Wales",
+    "Scotland", "Ireland"
+])
+JOB_TITLES = np.array([
+    "Warehouse Operative", "Driver", "Care Worker", "Nurse", "Porter", "Cleaner",
+    "Engineer", "Technician", "Administrator", "Production Operative", "Supervisor",
+    "Team Leader", "Machine Operator", "Forklift Driver", "Bus Driver", "Chef",
+    "Security Officer", "Customer Service Advisor", "Electrician", "Fitter"
+])
+EMPLOYER_WORDS = np.array([
+    "Northern", "United", "Royal", "City", "County", "National", "Metro", "Allied",
+    "Premier", "General", "Coastal", "Central", "Western", "Eastern", "Highland"
+])
+EMPLOYER_SECTORS = np.array([
+    "Logistics", "Health Trust", "Manufacturing", "Transport", "Foods", "Care Services",
+    "Engineering", "Council", "Print", "Distribution", "Energy", "Construction"
+])
+
+# Rows per workplace/employer, used to scale cardinality with file size
+ROWS_PER_WORKPLACE = 40
+ROWS_PER_EMPLOYER = 1500
+# Exponent of the workplace size distribution (higher = more skewed)
+WORKPLACE_SKEW = 0.8
+DEFAULT_CHUNK_ROWS = 500_000
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a row count such as '10k', '1M' or '2500'.
+
+    Args:
+        size: Row count with an optional k/M suffix
+
+    Returns:
+        Number of rows
+    """
+    size = size.strip()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(size[-1:].lower(), 1)
+    number = size[:-1] if multiplier > 1 else size
+    return int(float(number) * multiplier)
+
+
+def format_size(rows: int) -> str:
+    """Format a row count the way parse_size reads it (e.g. 100000 -> '100k')."""
+    if rows >= 1_000_000 and rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}M"
+    if rows >= 1_000 and rows % 1_000 == 0:
+        return f"{rows // 1_000}k"
+    return str(rows)
+
+
+def _build_workplaces(rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Build the workplace table (with employer and region) for an export of this size."""
+    workplace_count = max(10, rows // ROWS_PER_WORKPLACE)
+    employer_count = max(5, rows // ROWS_PER_EMPLOYER)
+
+    employer_codes = np.char.add('EMP', np.char.zfill(np.arange(1, employer_count + 1).astype(str), 5))
+    employer_names = (pd.Series(rng.choice(EMPLOYER_WORDS, employer_count)) + ' '
+                      + pd.Series(rng.choice(EMPLOYER_SECTORS, employer_count)) + ' '
+                      + pd.Series(np.arange(1, employer_count + 1)).astype(str)).to_numpy()
+    # Employers also have long-tailed sizes
+    employer_weights = 1.0 / np.arange(1, employer_count + 1) ** 0.8
+    workplace_employer = rng.choice(employer_count, workplace_count, p=employer_weights / employer_weights.sum())
+
+    workplace_codes = np.char.add('WP', np.char.zfill(np.arange(1, workplace_count + 1).astype(str), 6))
+    workplace_towns = rng.choice(TOWNS, workplace_count)
+    workplace_names = (pd.Series(employer_names[workplace_employer]).str.split(' ').str[:2].str.join(' ')
+                       + ' ' + pd.Series(workplace_towns) + ' '
+                       + pd.Series(np.arange(1, workplace_count + 1)).astype(str)).to_numpy()
+
+    weights = 1.0 / np.arange(1, workplace_count + 1) ** WORKPLACE_SKEW
+    return pd.DataFrame({
+        'Name': employer_names[workplace_employer],
+        'Employer': employer_codes[workplace_employer],
+        'Workplace Name': workplace_names,
+        'Workplace': workplace_codes,
+        'Region': rng.choice(REGIONS, workplace_count),
+        'weight': rng.permutation(weights / weights.sum())
+    })
+
+
+def _blank(values: np.ndarray, rng: np.random.Generator, fraction: float) -> np.ndarray:
+    """Blank out a random fraction of values (as missing)."""
+    values = values.astype(object)
+    values[rng.random(len(values)) < fraction] = None
+    return values
+
+
+def _phone_numbers(prefix: str, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate phone numbers; some lose their leading 0 as they do in spreadsheet exports."""
+    digits = np.char.zfill(rng.integers(0, 10 ** 9, count).astype(str), 9)
+    numbers = np.char.add(prefix, digits)
+    return np.where(rng.random(count) < 0.2, np.char.lstrip(numbers, '0'), numbers)
+
+
+def _generate_chunk(start: int, rows: int, member_numbers: np.ndarray,
+                    workplaces: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+    """Generate rows [start, start + rows) of an export."""
+    workplace_rows = workplaces.iloc[rng.choice(len(workplaces), rows, p=workplaces['weight'].to_numpy())]
+    first_names = rng.choice(FIRST_NAMES, rows)
+    surnames = rng.choice(SURNAMES, rows)
+
+    emails = (pd.Series(first_names).str.lower() + '.' + pd.Series(surnames).str.lower()
+              .str.replace("'", '', regex=False) + pd.Series(rng.integers(1, 999, rows)).astype(str)
+              + '@example.com').to_numpy()
+    postcodes = (pd.Series(rng.choice(POSTCODE_AREAS, rows)) + pd.Series(rng.integers(1, 30, rows)).astype(str)
+                 + ' ' + pd.Series(rng.integers(1, 10, rows)).astype(str)
+                 + pd.Series(rng.choice(list('ABDEFGHJLNPQRSTUWXYZ'), rows))
+                 + pd.Series(rng.choice(list('ABDEFGHJLNPQRSTUWXYZ'), rows))).to_numpy()
+    # About 10% of members only give a mobile number in the home phone field
+    home_phones = np.where(rng.random(rows) < 0.1,
+                           _phone_numbers('07', rows, rng), _phone_numbers('01', rows, rng))
+
+    data = {
+        "First Name": first_names,
+        "Surname": surnames,
+        "Member Number": member_numbers[start:start + rows],
+        "Address - Home - Line 1": (pd.Series(rng.integers(1, 250, rows)).astype(str) + ' '
+                                    + pd.Series(rng.choice(STREETS, rows))).to_numpy(),
+        "Address - Home - Line 2": _blank(rng.choice(STREETS, rows), rng, 0.7),
+        "Address - Home - Line 3": rng.choice(TOWNS, rows),
+        "Address - Home - Line 4": _blank(rng.choice(TOWNS, rows), rng, 0.9),
+        "Postcode": postcodes,
+        "Name": workplace_rows['Name'].to_numpy(),
+        "Employer": workplace_rows['Employer'].to_numpy(),
+        "Workplace Name": workplace_rows['Workplace Name'].to_numpy(),
+        "Workplace": workplace_rows['Workplace'].to_numpy(),
+        "Region": workplace_rows['Region'].to_numpy(),
+        "Job Description": _blank(rng.choice(JOB_TITLES, rows), rng, 0.05),
+        "Email Address": _blank(emails, rng, 0.15),
+        "Allow Email": rng.choice(np.array(["Y", "N"]), rows, p=[0.8, 0.2]),
+        "Allow Phone": rng.choice(np.array(["Y", "N"]), rows, p=[0.7, 0.3]),
+        "Allow SMS": rng.choice(np.array(["Y", "N"]), rows, p=[0.75, 0.25]),
+        "Home phone": _blank(home_phones, rng, 0.6),
+        "Mobile phone": _blank(_phone_numbers('07', rows, rng), rng, 0.2),
+        "TPS Flag": rng.choice(np.array(["Y", "N"]), rows, p=[0.1, 0.9])
+    }
+    return pd.DataFrame(data, columns=CSV_COLUMN_MAPPING["columns_to_keep"])
+
+
+def iter_export_chunks(rows: int, seed: int = 0, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """
+    Generate a synthetic membership export in chunks.
+    The same rows and seed always produce the same data.
+
+    Args:
+        rows: Total number of rows
+        seed: Random seed
+        chunk_rows: Rows per yielded chunk
+
+    Yields:
+        DataFrames with the CSV_COLUMN_MAPPING columns
+    """
+    rng = np.random.default_rng(seed)
+    workplaces = _build_workplaces(rows, rng)
+    member_numbers = rng.permutation(np.arange(10_000_000, 10_000_000 + rows))
+    for start in range(0, rows, chunk_rows):
+        yield _generate_chunk(start, min(chunk_rows, rows - start), member_numbers, workplaces, rng)
+
+
+def generate_export(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic membership export in memory.
+
+    Args:
+        rows: Number of rows
+        seed: Random seed
+
+    Returns:
+        DataFrame with the CSV_COLUMN_MAPPING columns
+    """
+    return pd.concat(iter_export_chunks(rows, seed), ignore_index=True)
+
+
+def write_export(file_path: str, rows: int, seed: int = 0) -> str:
+    """
+    Write a synthetic export to a CSV file chunk by chunk, so large files
+    never need to fit in memory.
+
+    Args:
+        file_path: Output CSV path (written via a temporary file)
+        rows: Number of rows
+        seed: Random seed
+
+    Returns:
+        The output path
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+        for index, chunk in enumerate(iter_export_chunks(rows, seed)):
+            chunk.to_csv(file, index=False, header=(index == 0), lineterminator='\n')
+    os.replace(temp_path, file_path)
+    return file_path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic membership export CSV.")
+    parser.add_argument('rows', help="Number of rows, e.g. 10k, 100k, 1M, 10M")
+    parser.add_argument('-o', '--output', help="Output CSV (default: benchmarks/data/export_<rows>.csv)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    rows = parse_size(args.rows)
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         'data', f"export_{format_size(rows)}.csv")
+    write_export(output, rows, args.seed)
+    print(f"Wrote {rows} rows to {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
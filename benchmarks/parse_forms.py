@@ -0,0 +1,160 @@
+"""
+Benchmark of the HTML parser backends used by the JotForm validator.
+Times index_form with html.parser and lxml, each parsing the whole page or
+only the tags the validator reads (SoupStrainer), and checks that every
+configuration finds the same fields.
+
+Runs on synthetic pages shaped like JotForm's (large inline scripts and
+styles, wrapped fields, dropdowns, sub-labels) and on any saved pages given.
+
+Usage:
+    python benchmarks/parse_forms.py --fields 100 500 2000
+    python benchmarks/parse_forms.py saved_form.html another_form.html -o parse.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+import jotform_validator  # noqa: E402
+
+DEFAULT_FIELDS = [100, 500, 2000]
+DEFAULT_REPEAT = 5
+# Inline script and stylesheet size on a typical published form
+INLINE_ASSET_BYTES = 250 * 1024
+DROPDOWN_OPTIONS = 40
+
+
+def synthetic_form(fields: int) -> str:
+    """Build a JotForm-like page with the given number of fields."""
+    script = "var JotForm = {};\n" + "JotForm.setConditions([{\"action\":[],\"terms\":[]}]);\n" * (
+        INLINE_ASSET_BYTES // 2 // 55)
+    style = ".form-line { padding: 12px 10px; }\n" * (INLINE_ASSET_BYTES // 2 // 37)
+    parts = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><script>{script}</script>'
+             f'<style>{style}</style></head><body><form class="jotform-form" method="post">'
+             '<div role="main" class="form-all"><ul class="form-section page-section">'
+             '<li id="cid_1" class="form-input-wide"><div class="form-header-group">'
+             '<h2 id="header_1" class="form-header" data-component="header">Branch Survey</h2>'
+             '</div></li>']
+    for i in range(2, fields + 2):
+        kind = i % 4
+        classes = 'form-textbox validate[required]' + (' form-readonly' if i % 3 == 0 else '')
+        name = f'q{i}_MembershipNumber' if i % 10 == 0 else f'q{i}_field{i}'
+        label = (f'<label class="form-label form-label-top" id="label_{i}" for="input_{i}">'
+                 f' Question {i} <span class="form-required">*</span></label>')
+        if kind == 3:
+            options = ''.join(f'<option value="Option {j}">Option {j}</option>'
+                              for j in range(DROPDOWN_OPTIONS))
+            control = f'<select class="form-dropdown" id="input_{i}" name="q{i}_select">{options}</select>'
+        else:
+            control = (f'<span class="form-sub-label-container"><input type="text" id="input_{i}" '
+                       f'name="{name}" class="{classes}" data-component="textbox" size="20"/>'
+                       f'<label class="form-sub-label" for="input_{i}" style="min-height:13px">'
+                       f'Sub label {i}</label></span>')
+        parts.append(f'<li class="form-line jf-required" data-type="control_textbox" id="id_{i}">'
+                     f'{label}<div id="cid_{i}" class="form-input-wide" data-layout="half">'
+                     f'{control}</div></li>')
+    parts.append('<input type="hidden" id="simple_spc" name="simple_spc" value="1"/>'
+                 '</ul></div></form></body></html>')
+    return ''.join(parts)
+
+
+def _configurations():
+    """Parser configurations to compare: name -> (parser, strain)."""
+    configurations = {'html.parser': ('html.parser', False),
+                      'html.parser+strainer': ('html.parser', True)}
+    if importlib.util.find_spec('lxml'):
+        configurations.update({'lxml': ('lxml', False), 'lxml+strainer': ('lxml', True)})
+    return configurations
+
+
+def _fields_signature(form) -> list:
+    """Comparable summary of what a configuration found."""
+    return [(field['label'], field['input_id'], tuple(field['checks']), field['problem'])
+            for field in form.fields]
+
+
+def benchmark_page(name: str, html: str, repeat: int) -> dict:
+    """
+    Time every parser configuration on one page.
+
+    Args:
+        name: Page name for the report
+        html: Page HTML
+        repeat: Timed runs per configuration
+
+    Returns:
+        Dictionary with page details and per-configuration timings
+    """
+    result = {'page': name, 'bytes': len(html.encode('utf-8')), 'configurations': {}}
+    reference = None
+    for configuration, (parser, strain) in _configurations().items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            form = jotform_validator.index_form(html, parser, strain)
+            timings.append(round(time.perf_counter() - start, 6))
+        signature = _fields_signature(form)
+        if reference is None:
+            reference = signature
+            result['fields'] = len(form.fields)
+        result['configurations'][configuration] = {
+            'min_seconds': min(timings),
+            'seconds': timings,
+            'same_fields': signature == reference
+        }
+    return result
+
+
+def format_table(results: list) -> str:
+    """Format results as a plain text table with speedups over html.parser."""
+    names = list(_configurations())
+    lines = [f"{'page':<28}{'KB':>8}{'fields':>8}" + ''.join(f"{name:>22}" for name in names)]
+    for result in results:
+        base = result['configurations']['html.parser']['min_seconds']
+        cells = []
+        for name in names:
+            entry = result['configurations'][name]
+            mark = '' if entry['same_fields'] else ' !'
+            cells.append(f"{entry['min_seconds']:.3f}s {base / entry['min_seconds']:.1f}x{mark}".rjust(22))
+        lines.append(f"{result['page'][:27]:<28}{result['bytes'] / 1024:>8.0f}{result['fields']:>8}"
+                     + ''.join(cells))
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends for form scraping.")
+    parser.add_argument('pages', nargs='*', help="Saved form pages to benchmark as well")
+    parser.add_argument('--fields', nargs='+', type=int, default=DEFAULT_FIELDS,
+                        help="Field counts of the synthetic pages (default: 100 500 2000)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per configuration (default: {DEFAULT_REPEAT})")
+    parser.add_argument('-o', '--output', help="Also write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    pages = [(f"synthetic {fields} fields", synthetic_form(fields)) for fields in args.fields]
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8', errors='replace') as file:
+            pages.append((os.path.basename(path), file.read()))
+
+    results = []
+    for name, html in pages:
+        print(f"Parsing {name}...", file=sys.stderr)
+        results.append(benchmark_page(name, html, args.repeat))
+    print(format_table(results))
+    if any(not entry['same_fields'] for result in results for entry in result['configurations'].values()):
+        print("\n! = found different fields than html.parser", file=sys.stderr)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""
+Benchmark runner for the Unite Toolbox.
+Times every DataProcessor/HTMLProcessor operation on synthetic exports of
+several sizes. Each operation runs in its own child process so its peak
+memory (RSS) is measured in isolation, and results are written as JSON for
+regression tracking.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10k 100k -o benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1M --operations load_csv convert_csv_to_uwp
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+sys.path.insert(0, REPO_DIR)
+
+from generate_data import parse_size, format_size, write_export  # noqa: E402
+
+DEFAULT_SIZES = ['10k', '100k']
+DEFAULT_REPEAT = 3
+# Share of members removed from the second file in the compare benchmark
+COMPARE_DROP_FRACTION = 0.05
+# Repeats of the email body in the HTML benchmarks (roughly 1 KB each)
+HTML_BLOCKS = 200
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    # On Linux, VmHWM is reset by exec; ru_maxrss can carry over the parent's peak
+    try:
+        with open('/proc/self/status', 'r') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def _synthetic_html() -> str:
+    """Build an HTML email with a stylesheet and MSO conditional blocks."""
+    style = ''.join(f".c{i} {{ color: #{i:06x}; padding: {i % 20}px; }}\n" for i in range(50))
+    block = ('<!--[if mso]><table><tr><td width="600"><![endif]-->'
+             '<div class="c{0}"><p class="c{1}">Dear member, your branch meeting is on '
+             '<a class="c{2}" href="https://example.com/{0}">the usual date</a>.</p></div>'
+             '<!--[if mso]></td></tr></table><![endif]-->\n')
+    body = ''.join(block.format(i % 50, (i + 1) % 50, (i + 2) % 50) for i in range(HTML_BLOCKS))
+    return f"<html><head><style>{style}</style></head><body>{body}</body></html>"
+
+
+def _setup_loaded(data_path):
+    from utils import DataProcessor
+    return DataProcessor.load_data_file(data_path)
+
+
+def _setup_compare(data_path):
+    df1 = _setup_loaded(data_path)
+    df2 = df1.sample(frac=1 - COMPARE_DROP_FRACTION, random_state=0)
+    return df1, df2
+
+
+def _run_save_csv(df):
+    from utils import DataProcessor
+    with tempfile.TemporaryDirectory() as directory:
+        DataProcessor.save_data_file(df, os.path.join(directory, 'output.csv'))
+
+
+def _run_compare(state):
+    from utils import DataProcessor
+    df1, df2 = state
+    return DataProcessor.compare_dataframes(df1, df2, "Member Number")
+
+
+def _operations():
+    """
+    Benchmark operations: name -> (setup(data_path), run(state), uses_data).
+    Setup is not timed; operations that do not use the data file run once
+    per benchmark run rather than once per size.
+    """
+    from utils import DataProcessor, HTMLProcessor
+    return {
+        'load_csv': (lambda path: path, DataProcessor.load_data_file, True),
+        'save_csv': (_setup_loaded, _run_save_csv, True),
+        'convert_csv_to_uwp': (_setup_loaded, DataProcessor.convert_csv_to_uwp, True),
+        'create_sms_list': (_setup_loaded, DataProcessor.create_sms_list, True),
+        'divide_by_workplace': (_setup_loaded, DataProcessor.divide_by_workplace, True),
+        'compare_dataframes': (_setup_compare, _run_compare, True),
+        'html_remove_mso_code': (lambda path: _synthetic_html(), HTMLProcessor.remove_mso_code, False),
+        'html_process': (lambda path: _synthetic_html(), HTMLProcessor.process_html, False)
+    }
+
+
+def run_worker(operation: str, data_path, repeat: int) -> dict:
+    """
+    Run one operation in this process and measure it.
+
+    Args:
+        operation: Operation name
+        data_path: Input CSV path (ignored by operations that do not use data)
+        repeat: Number of timed runs
+
+    Returns:
+        Dictionary of timings and memory figures
+    """
+    setup, run, _ = _operations()[operation]
+    state = setup(data_path)
+    setup_rss = _peak_rss_mb()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(state)
+        timings.append(round(time.perf_counter() - start, 6))
+        del result
+    return {
+        'seconds': timings,
+        'setup_peak_rss_mb': setup_rss,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+
+def _run_in_child(operation: str, data_path, repeat: int) -> dict:
+    """Run one operation in a fresh Python process and return its measurements."""
+    command = [sys.executable, os.path.abspath(__file__), '--worker', operation,
+               '--repeat', str(repeat)]
+    if data_path:
+        command += ['--data', data_path]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr else
+                f"exit code {completed.returncode}"}
+    return json.loads(completed.stdout)
+
+
+def _dataset_path(rows: int, seed: int) -> str:
+    """Get the cached synthetic export for a size, generating it if needed."""
+    path = os.path.join(DATA_DIR, f"export_{format_size(rows)}_seed{seed}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {path}...", file=sys.stderr)
+        write_export(path, rows, seed)
+    return path
+
+
+def _git_commit():
+    """Current git commit of the repository, if available."""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_DIR,
+                                   capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def _metadata(repeat: int, seed: int) -> dict:
+    """Describe the environment the benchmarks ran in."""
+    import pandas as pd
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        'seed': seed
+    }
+
+
+def run_benchmarks(sizes, operations=None, repeat: int = DEFAULT_REPEAT, seed: int = 0) -> dict:
+    """
+    Run the benchmark suite.
+
+    Args:
+        sizes: Row counts to benchmark (ints or strings such as '100k')
+        operations: Operation names to run (default: all)
+        repeat: Timed runs per operation
+        seed: Random seed for the synthetic exports
+
+    Returns:
+        Dictionary with 'metadata' and a 'results' list
+    """
+    all_operations = _operations()
+    operations = operations or list(all_operations)
+    unknown = set(operations) - set(all_operations)
+    if unknown:
+        raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+    jobs = []
+    for name in operations:
+        if not all_operations[name][2]:
+            jobs.append((name, None, None))
+    for size in sizes:
+        rows = parse_size(size) if isinstance(size, str) else size
+        data_path = _dataset_path(rows, seed)
+        jobs.extend((name, rows, data_path) for name in operations if all_operations[name][2])
+
+    results = []
+    for name, rows, data_path in jobs:
+        print(f"Running {name} ({format_size(rows) if rows else 'no data'})...", file=sys.stderr)
+        measurement = _run_in_child(name, data_path, repeat)
+        entry = {'operation': name, 'rows': rows}
+        if 'error' in measurement:
+            entry['error'] = measurement['error']
+        else:
+            timings = measurement['seconds']
+            entry.update({
+                'min_seconds': min(timings),
+                'median_seconds': round(statistics.median(timings), 6),
+                'seconds': timings,
+                'rows_per_second': round(rows / min(timings)) if rows and min(timings) else None,
+                'setup_peak_rss_mb': measurement['setup_peak_rss_mb'],
+                'peak_rss_mb': measurement['peak_rss_mb']
+            })
+        results.append(entry)
+    return {'metadata': _metadata(repeat, seed), 'results': results}
+
+
+def format_table(report: dict) -> str:
+    """Format benchmark results as a plain text table."""
+    lines = [f"{'operation':<24}{'rows':>10}{'min s':>10}{'median s':>10}{'peak MB':>10}"]
+    for entry in report['results']:
+        rows = format_size(entry['rows']) if entry['rows'] else '-'
+        if 'error' in entry:
+            lines.append(f"{entry['operation']:<24}{rows:>10}  error: {entry['error']}")
+            continue
+        peak = entry['peak_rss_mb'] if entry['peak_rss_mb'] is not None else '-'
+        lines.append(f"{entry['operation']:<24}{rows:>10}{entry['min_seconds']:>10.3f}"
+                     f"{entry['median_seconds']:>10.3f}{peak:>10}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the Unite Toolbox benchmarks.")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="Export sizes, e.g. 10k 100k 1M 10M (default: 10k 100k)")
+    parser.add_argument('--operations', nargs='+', help="Operations to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per operation (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument('-o', '--output', help="Write JSON results to this file (default: stdout)")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--data', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.data, args.repeat)))
+        return 0
+
+    report = run_benchmarks(args.sizes, args.operations, args.repeat, args.seed)
+    print(format_table(report), file=sys.stderr)
+    if args.output:
+        directory = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
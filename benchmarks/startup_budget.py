@@ -0,0 +1,223 @@
+"""
+Startup import-time budgets for the Unite Toolbox entry points.
+Imports each entry point (utils, the CLI, the desktop app and the Flask app)
+in a fresh interpreter with `python -X importtime`, parses the report and
+fails when an entry point takes longer than its budget or pulls in a module
+that must stay lazy (pandas, premailer, requests, tkinter dialogs, ...).
+
+Usage:
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --entry app_refactored --repeat 10
+    python benchmarks/startup_budget.py --budget-scale 2 -o benchmarks/results/startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+
+DEFAULT_REPEAT = 5
+# Modules loaded on first use (see lazy_imports.py); none may be imported at startup
+HEAVY_MODULES = ('pandas', 'numpy', 'premailer', 'openpyxl', 'pyarrow', 'zstandard',
+                 'requests', 'bs4', 'lxml')
+GUI_LAZY_MODULES = ('pyperclip', 'tkinter.filedialog', 'tkinter.messagebox',
+                    'tkinter.simpledialog', 'validator_window')
+
+# Entry point -> statement run, cumulative import budget (ms) and forbidden modules.
+# Budgets leave room for slower machines; the measured times are far lower.
+ENTRY_POINTS = {
+    'utils': {
+        'statement': 'import utils',
+        'budget_ms': 100,
+        'forbidden': HEAVY_MODULES
+    },
+    'cli': {
+        'statement': 'import cli; cli.build_parser()',
+        'budget_ms': 100,
+        'forbidden': HEAVY_MODULES
+    },
+    'app_refactored': {
+        'statement': 'import app_refactored',
+        'budget_ms': 250,
+        'forbidden': HEAVY_MODULES + GUI_LAZY_MODULES
+    },
+    'flask_app': {
+        'statement': 'import flask_app',
+        'budget_ms': 750,
+        'forbidden': HEAVY_MODULES
+    }
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Standard error of the interpreter
+
+    Returns:
+        One entry per imported module, in report order, with self and
+        cumulative microseconds, nesting depth and the importing module
+    """
+    entries = []
+    pending = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        entry = {'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us),
+                 'depth': depth, 'parent': None}
+        # Children are reported before their parent, one level deeper
+        while pending and pending[-1]['depth'] > depth:
+            pending.pop()['parent'] = entry['module']
+        pending.append(entry)
+        entries.append(entry)
+    return entries
+
+
+def _import_chain(entries: List[Dict], module: str) -> str:
+    """Describe how a module was reached, e.g. 'pandas <- utils <- cli'."""
+    by_module = {entry['module']: entry for entry in entries}
+    chain = [module]
+    parent = by_module[module]['parent']
+    while parent is not None and len(chain) < 10:
+        chain.append(parent)
+        parent = by_module[parent]['parent']
+    return ' <- '.join(chain)
+
+
+def find_eager_imports(entries: List[Dict], forbidden) -> List[str]:
+    """
+    List the forbidden modules an import report contains.
+
+    Args:
+        entries: Parsed import report (see parse_importtime)
+        forbidden: Module names that must stay lazy
+
+    Returns:
+        One violation per forbidden module imported, with its import chain
+    """
+    imported = {entry['module'] for entry in entries}
+    return [f"imports {_import_chain(entries, module)}" for module in forbidden if module in imported]
+
+
+def measure_entry_point(name: str, statement: str) -> Dict:
+    """
+    Import an entry point once in a fresh interpreter.
+
+    Args:
+        name: Top-level module of the entry point
+        statement: Python code to run
+
+    Returns:
+        Dictionary with the total import time in ms and the parsed entries
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = dict(os.environ)
+    env.pop('UNITE_TOOLBOX_INSTRUMENT', None)
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        lines = [line for line in completed.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(lines[-1] if lines else f"exit code {completed.returncode}")
+    entries = parse_importtime(completed.stderr)
+    top = next((entry for entry in entries if entry['module'] == name and entry['depth'] == 0), None)
+    if top is None:
+        raise RuntimeError(f"'{name}' not found in the import report")
+    return {'milliseconds': top['cumulative_us'] / 1000, 'entries': entries}
+
+
+def check_entry_point(name: str, settings: Dict, repeat: int = DEFAULT_REPEAT,
+                      budget_scale: float = 1.0) -> Dict:
+    """
+    Measure an entry point and check it against its budget.
+    Time is the fastest of several runs, the least noisy figure.
+
+    Args:
+        name: Entry point name (a key of ENTRY_POINTS)
+        settings: Its statement, budget and forbidden modules
+        repeat: Fresh interpreters to measure
+        budget_scale: Multiplier for the time budget (e.g. 2 on slow CI machines)
+
+    Returns:
+        Result with the time, budget, slowest imports and any violations
+    """
+    budget_ms = settings['budget_ms'] * budget_scale
+    try:
+        runs = [measure_entry_point(name, settings['statement']) for _ in range(repeat)]
+    except RuntimeError as e:
+        return {'entry_point': name, 'budget_ms': budget_ms, 'violations': [f"import failed: {e}"]}
+    fastest = min(runs, key=lambda run: run['milliseconds'])
+    entries = fastest['entries']
+    violations = []
+    if fastest['milliseconds'] > budget_ms:
+        violations.append(f"{fastest['milliseconds']:.1f} ms is over the {budget_ms:.0f} ms budget")
+    violations.extend(find_eager_imports(entries, settings['forbidden']))
+    direct = [entry for entry in entries if entry['parent'] == name]
+    slowest = sorted(direct, key=lambda entry: entry['cumulative_us'], reverse=True)[:5]
+    return {
+        'entry_point': name,
+        'milliseconds': round(fastest['milliseconds'], 1),
+        'all_milliseconds': [round(run['milliseconds'], 1) for run in runs],
+        'budget_ms': budget_ms,
+        'slowest_imports': [{'module': entry['module'], 'milliseconds': round(entry['cumulative_us'] / 1000, 1)}
+                            for entry in slowest],
+        'violations': violations
+    }
+
+
+def format_results(results: List[Dict]) -> str:
+    """Format results as a plain text table."""
+    lines = [f"{'entry point':<18}{'import ms':>10}{'budget ms':>11}  status  slowest imports"]
+    for result in results:
+        status = 'FAIL' if result['violations'] else 'ok'
+        if 'milliseconds' not in result:
+            lines.append(f"{result['entry_point']:<18}{'-':>10}{result['budget_ms']:>11.0f}  {status}")
+        else:
+            slowest = ', '.join(f"{entry['module']} {entry['milliseconds']:.0f}"
+                                for entry in result['slowest_imports'][:3])
+            lines.append(f"{result['entry_point']:<18}{result['milliseconds']:>10.1f}"
+                         f"{result['budget_ms']:>11.0f}  {status:<6}  {slowest}")
+        for violation in result['violations']:
+            lines.append(f"{'':<20}{violation}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check startup import time against per-entry-point budgets.")
+    parser.add_argument('--entry', nargs='+', choices=list(ENTRY_POINTS),
+                        help="Entry points to check (default: all)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Fresh interpreters per entry point (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--budget-scale', type=float, default=1.0,
+                        help="Multiply the time budgets, e.g. 2 on slow machines (default: 1)")
+    parser.add_argument('-o', '--output', help="Also write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    results = [check_entry_point(name, ENTRY_POINTS[name], args.repeat, args.budget_scale)
+               for name in (args.entry or ENTRY_POINTS)]
+    print(format_results(results))
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({'python': sys.version.split()[0], 'results': results}, file, indent=2)
+
+    failures = [result for result in results if result['violations']]
+    if failures:
+        print(f"\n{len(failures)} entry point(s) over budget or importing lazy modules at startup")
+        return 1
+    print("\nAll entry points within budget.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""
+Command line interface for the Unite Toolbox.
+Runs the toolbox operations without the GUI or web server, for scripted and
+scheduled (cron) use. Only the modules needed by the chosen command are
+imported, so startup stays fast.
+
+Usage:
+    python cli.py csv2uwp export.csv -o uwp.csv
+    python cli.py sms export.csv.gz -o sms.csv
+    python cli.py divide export.csv -o workplaces/
+    python cli.py compare this_week.csv last_week.csv --key "Member Number"
+    python cli.py ingest export.csv && python cli.py sms export.csv --snapshot -o sms.csv
+    python cli.py html email.html -o email_inlined.html
+    python cli.py urls uwp.csv --path form/x --param FirstName --param MembershipNumber -o links.csv
+    python cli.py jotform --csv jotform_report.csv
+
+Use '-' as a file name to read from stdin or write to stdout:
+    zcat export.csv.gz | python cli.py csv2uwp - -o - > uwp.csv
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+
+STDIO = '-'
+
+
+def _log(args, message: str) -> None:
+    """Print a progress message to stderr unless --quiet is set."""
+    if not args.quiet:
+        print(message, file=sys.stderr)
+
+
+def _load(path: str, input_format: str = 'csv', columns=None) -> 'pd.DataFrame':
+    """
+    Load a data file, or stdin when path is '-'.
+
+    Args:
+        path: File path or '-'
+        input_format: Format of stdin data, as a file extension (e.g. 'csv', 'csv.gz', 'xlsx')
+        columns: Optional list of columns to read
+
+    Returns:
+        pandas DataFrame containing the data
+    """
+    from utils import DataProcessor
+    if path != STDIO:
+        return DataProcessor.load_data_file(path, columns=columns)
+    stream = sys.stdin.buffer
+    if input_format != 'csv':
+        # Excel, Parquet, Feather and zip readers need a seekable file
+        stream = io.BytesIO(stream.read())
+    return DataProcessor.load_data_file(stream, file_name=f"stdin.{input_format}", columns=columns)
+
+
+def _save(df: 'pd.DataFrame', path: str) -> None:
+    """
+    Save a DataFrame to a file, or as CSV to stdout when path is '-'.
+    A '.csv.gz' path is gzip-compressed while it is written.
+
+    Args:
+        df: DataFrame to save
+        path: Output path or '-'
+    """
+    from utils import DataProcessor, CompressionHandler
+    if path == STDIO:
+        for chunk in CompressionHandler.iter_csv_bytes(df):
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+    elif path.lower().endswith('.csv.gz'):
+        with open(path, 'wb') as file:
+            for chunk in CompressionHandler.iter_csv_bytes(df, compression='gzip'):
+                file.write(chunk)
+    else:
+        DataProcessor.save_data_file(df, path)
+
+
+def _snapshot_store(args):
+    """Open the snapshot store chosen with --snapshot-db (default from config)."""
+    from snapshot_store import SnapshotStore
+    return SnapshotStore(args.snapshot_db)
+
+
+def _snapshot_id(store, name: str) -> str:
+    """
+    Resolve an input to a snapshot, ingesting a data file on first use.
+
+    Args:
+        store: SnapshotStore to use
+        name: Data file path or snapshot id
+
+    Returns:
+        Snapshot id
+
+    Raises:
+        ValueError: If the input is stdin, or neither a file nor a known snapshot id
+    """
+    if name == STDIO:
+        raise ValueError("--snapshot cannot read from stdin.")
+    if os.path.isfile(name):
+        return store.ingest(name)
+    if store.get_snapshot(name) is None:
+        raise ValueError(f"'{name}' is neither a data file nor a snapshot id.")
+    return name
+
+
+def _load_mapping(path: str):
+    """Load a column mapping (source column -> UWP column) from a JSON file."""
+    if path is None:
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        mapping = json.load(file)
+    if not isinstance(mapping, dict):
+        raise ValueError(f"Mapping file '{path}' must contain a JSON object.")
+    return mapping
+
+
+def cmd_csv2uwp(args) -> None:
+    """Convert a data file to UWP format."""
+    column_mapping = _load_mapping(args.mapping)
+    df = _load(args.input, args.input_format)
+    if args.incremental:
+        from incremental import IncrementalUWPConverter
+        converter = IncrementalUWPConverter(args.incremental)
+        result = converter.convert(df, column_mapping=column_mapping)
+        _save(result.changed, args.output)
+        if args.deletions:
+            _save(result.deleted, args.deletions)
+        if args.full_output:
+            _save(result.full, args.full_output)
+        _log(args, f"{result.new_count} new, {result.changed_count} changed, "
+                   f"{result.unchanged_count} unchanged, {len(result.deleted)} deleted")
+        return
+    from utils import DataProcessor
+    df_uwp = DataProcessor.convert_csv_to_uwp(df, column_mapping=column_mapping)
+    del df
+    _save(df_uwp, args.output)
+    _log(args, f"Converted {len(df_uwp)} rows to UWP format")
+
+
+def cmd_batch(args) -> None:
+    """Convert a directory or zip of data files to UWP format."""
+    from batch_convert import convert_batch
+    output = sys.stdout.buffer if args.output == STDIO else args.output
+    output_format = args.output_format
+    if args.output == STDIO and output_format is None:
+        output_format = 'zip'
+    # A single directory or zip is expanded by convert_batch; anything else is a file list
+    source = args.source
+    if len(source) == 1 and (os.path.isdir(source[0]) or source[0].lower().endswith('.zip')):
+        source = source[0]
+    result = convert_batch(
+        source,
+        output,
+        column_mapping=_load_mapping(args.mapping),
+        workers=args.workers,
+        deduplicate=not args.keep_duplicates,
+        output_format=output_format,
+        report_path=args.report
+    )
+    failed = [entry for entry in result.report if entry['error']]
+    for entry in failed:
+        _log(args, f"{entry['file']}: {entry['error']}")
+    _log(args, f"Converted {len(result.report) - len(failed)} of {len(result.report)} files, "
+               f"{result.total_rows} rows ({result.duplicates_dropped} duplicates dropped) "
+               f"in {result.seconds:.2f}s")
+    if failed:
+        raise SystemExit(1)
+
+
+def cmd_ingest(args) -> None:
+    """Ingest data files into the snapshot store, or list stored snapshots."""
+    store = _snapshot_store(args)
+    for path in args.inputs:
+        _log(args, f"Ingesting {path}...")
+        print(store.ingest(path))
+    if args.list:
+        for snapshot in store.list_snapshots():
+            print(f"{snapshot['id']}\t{snapshot['row_count']}\t{snapshot['source_name']}")
+
+
+def cmd_sms(args) -> None:
+    """Create an SMS list from a data file."""
+    from utils import DataProcessor
+    if args.snapshot:
+        store = _snapshot_store(args)
+        df_sms = store.create_sms_list(_snapshot_id(store, args.input))
+    else:
+        df_sms = DataProcessor.create_sms_list(_load(args.input, args.input_format))
+    _save(df_sms, args.output)
+    _log(args, f"SMS list contains {len(df_sms)} members")
+
+
+def cmd_divide(args) -> None:
+    """Divide a data file into one file per workplace."""
+    from utils import DataProcessor, FileHandler, CompressionHandler
+    if args.snapshot:
+        store = _snapshot_store(args)
+        workplaces = store.divide_by_workplace(_snapshot_id(store, args.input), args.column)
+    else:
+        workplaces = DataProcessor.divide_by_workplace(_load(args.input, args.input_format), args.column)
+    named = ((f"{FileHandler.get_safe_filename(str(name))}.csv", df)
+             for name, df in workplaces.items())
+    if args.output == STDIO or args.output.lower().endswith('.zip'):
+        output = sys.stdout.buffer if args.output == STDIO else open(args.output, 'wb')
+        try:
+            for chunk in CompressionHandler.iter_zip_bytes(named):
+                output.write(chunk)
+        finally:
+            if args.output == STDIO:
+                output.flush()
+            else:
+                output.close()
+    else:
+        FileHandler.ensure_directory_exists(args.output)
+        for entry_name, df in named:
+            DataProcessor.save_data_file(df, os.path.join(args.output, entry_name))
+    _log(args, f"Created {len(workplaces)} workplace files")
+
+
+def cmd_compare(args) -> None:
+    """Find records in the first file that are missing from the second."""
+    if args.first == STDIO and args.second == STDIO:
+        raise ValueError("Only one of the two files can be read from stdin.")
+    if args.snapshot:
+        store = _snapshot_store(args)
+        missing = store.compare_dataframes(_snapshot_id(store, args.first),
+                                           _snapshot_id(store, args.second), args.key)
+        _save(missing, args.output)
+        _log(args, f"{len(missing)} records in {args.first} are missing from {args.second}")
+        return
+    from utils import DataProcessor
+    df1 = _load(args.first, args.input_format)
+    # Load every column so the output matches the GUI and web app (right-hand columns included)
+    df2 = _load(args.second, args.input_format)
+    missing = DataProcessor.compare_dataframes(df1, df2, args.key)
+    _save(missing, args.output)
+    _log(args, f"{len(missing)} records in {args.first} are missing from {args.second}")
+
+
+def cmd_urls(args) -> None:
+    """Build a personalised survey link for every member in a data file."""
+    from config import URL_BUILDER_PARAMS
+    from utils import URLBuilder
+    df = _load(args.input, args.input_format)
+    if args.all_params:
+        parameters = [name for name in URL_BUILDER_PARAMS
+                      if URLBuilder.get_parameter_column(name) in df.columns]
+    else:
+        parameters = args.param
+    if not parameters:
+        raise ValueError("Choose URL parameters with --param (or use --all-params).")
+    chunks = URLBuilder.iter_member_url_csv(df, args.path, parameters,
+                                            include_columns=args.include)
+    if args.output == STDIO:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+    else:
+        if args.output.lower().endswith('.gz'):
+            import gzip
+            file = gzip.open(args.output, 'wb')
+        else:
+            file = open(args.output, 'wb')
+        with file:
+            for chunk in chunks:
+                file.write(chunk)
+    _log(args, f"Built {len(df)} survey links")
+
+
+def cmd_jotform(args) -> None:
+    """Validate every JotForm template (or the given form URLs) and print one report."""
+    import jotform_validator
+    import lazy_imports
+    _log(args, "Validating forms...")
+    reports = jotform_validator.validate_forms(args.urls or None, args.workers, args.timeout,
+                                               use_cache=not args.no_cache)
+    print(jotform_validator.format_report(reports, flagged_only=not args.all_fields))
+    if args.csv:
+        pd = lazy_imports.load('pandas')
+        _save(pd.DataFrame(jotform_validator.report_rows(reports)), args.csv)
+        _log(args, f"Report saved to {args.csv}")
+
+
+def cmd_html(args) -> None:
+    """Remove MSO code from an HTML email and inline its CSS."""
+    from utils import HTMLProcessor
+    if args.input == STDIO:
+        html_content = sys.stdin.read()
+    else:
+        with open(args.input, 'r', encoding='utf-8') as file:
+            html_content = file.read()
+
+    if args.no_inline:
+        processed_html = HTMLProcessor.remove_mso_code(html_content)
+    else:
+        processed_html = HTMLProcessor.process_html(html_content)
+
+    if args.output == STDIO:
+        sys.stdout.write(processed_html)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(processed_html)
+        _log(args, f"Processed HTML saved to {args.output}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all subcommands."""
+    parser = argparse.ArgumentParser(
+        prog='unite-toolbox',
+        description="Unite Toolbox command line interface. Use '-' for stdin/stdout."
+    )
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="Do not print progress messages to stderr")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print per-stage and module import timings to stderr")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="Like --profile, also tracing peak memory per stage (slower)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_input_format(subparser):
+        subparser.add_argument('--input-format', default='csv',
+                               help="Format of data read from stdin, e.g. csv, csv.gz, xlsx "
+                                    "(default: csv)")
+
+    csv2uwp = subparsers.add_parser('csv2uwp', help="Convert a data file to UWP format")
+    csv2uwp.add_argument('input', help="Input data file or '-'")
+    csv2uwp.add_argument('-o', '--output', default=STDIO, help="Output file (default: stdout)")
+    csv2uwp.add_argument('--mapping', help="JSON file mapping source columns to UWP columns")
+    csv2uwp.add_argument('--incremental', metavar='MANIFEST',
+                         help="Only output rows changed since the run recorded in MANIFEST")
+    csv2uwp.add_argument('--deletions',
+                         help="With --incremental, file for membership numbers no longer present")
+    csv2uwp.add_argument('--full-output',
+                         help="With --incremental, file for the complete UWP output "
+                              "(unchanged rows reused from MANIFEST)")
+    add_input_format(csv2uwp)
+    csv2uwp.set_defaults(func=cmd_csv2uwp)
+
+    def add_snapshot_options(subparser, note: str = ''):
+        subparser.add_argument('--snapshot', action='store_true',
+                               help="Run as a query on the snapshot store: a data file is ingested "
+                                    "on first use (see 'ingest'), a snapshot id is used as is" + note)
+        subparser.add_argument('--snapshot-db', help="Snapshot database (default: from config)")
+
+    ingest = subparsers.add_parser('ingest', help="Store data files for repeated --snapshot queries")
+    ingest.add_argument('inputs', nargs='*', help="Data files to ingest (prints each snapshot id)")
+    ingest.add_argument('--list', action='store_true', help="List stored snapshots")
+    ingest.add_argument('--snapshot-db', help="Snapshot database (default: from config)")
+    ingest.set_defaults(func=cmd_ingest)
+
+    batch = subparsers.add_parser('batch', help="Convert many data files to UWP format")
+    batch.add_argument('source', nargs='+', help="Directory, .zip archive or list of data files")
+    batch.add_argument('-o', '--output', required=True,
+                       help="Output .zip (one file per input) or combined data file, or '-'")
+    batch.add_argument('--output-format',
+                       help="'zip' or a data file type (csv, xlsx, parquet, feather)")
+    batch.add_argument('--mapping', help="JSON file mapping source columns to UWP columns")
+    batch.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    batch.add_argument('--keep-duplicates', action='store_true',
+                       help="Keep members that appear in more than one file")
+    batch.add_argument('--report', help="Also save the per-file report to this file")
+    batch.set_defaults(func=cmd_batch)
+
+    sms = subparsers.add_parser('sms', help="Create an SMS list from a data file")
+    sms.add_argument('input', help="Input data file or '-'")
+    sms.add_argument('-o', '--output', default=STDIO, help="Output file (default: stdout)")
+    add_input_format(sms)
+    add_snapshot_options(sms)
+    sms.set_defaults(func=cmd_sms)
+
+    divide = subparsers.add_parser('divide', help="Divide a data file by workplace")
+    divide.add_argument('input', help="Input data file or '-'")
+    divide.add_argument('-o', '--output', required=True,
+                        help="Output directory, .zip file, or '-' for a zip on stdout")
+    divide.add_argument('--column', default="Workplace Name",
+                        help="Column holding the workplace (default: 'Workplace Name')")
+    add_input_format(divide)
+    add_snapshot_options(divide)
+    divide.set_defaults(func=cmd_divide)
+
+    compare = subparsers.add_parser('compare',
+                                    help="Find records in the first file missing from the second")
+    compare.add_argument('first', help="First data file or '-'")
+    compare.add_argument('second', help="Second data file or '-'")
+    compare.add_argument('--key', required=True, help="Column used to match records")
+    compare.add_argument('-o', '--output', default=STDIO, help="Output file (default: stdout)")
+    add_input_format(compare)
+    add_snapshot_options(compare, "; only the first file's columns are output")
+    compare.set_defaults(func=cmd_compare)
+
+    urls = subparsers.add_parser('urls', help="Build a personalised survey link for every member")
+    urls.add_argument('input', help="Member data file (e.g. a UWP file) or '-'")
+    urls.add_argument('--path', required=True, help="Survey path, e.g. form-templates/standalone/ur/x")
+    urls.add_argument('--param', action='append', default=[],
+                      help="URL parameter to fill from the member's data (repeatable), e.g. FirstName")
+    urls.add_argument('--all-params', action='store_true', help="Use every URL builder parameter the file has a column for")
+    urls.add_argument('--include', action='append',
+                      help="Column to copy next to each link (repeatable; default: MembershipNumber)")
+    urls.add_argument('-o', '--output', default=STDIO, help="Output CSV or .csv.gz (default: stdout)")
+    add_input_format(urls)
+    urls.set_defaults(func=cmd_urls)
+
+    jotform = subparsers.add_parser('jotform', help="Validate JotForm templates in bulk")
+    jotform.add_argument('urls', nargs='*', help="Form URLs (default: all configured templates)")
+    jotform.add_argument('--workers', type=int, help="Forms fetched at once (default: from config)")
+    jotform.add_argument('--timeout', type=float, help="Request timeout in seconds (default: from config)")
+    jotform.add_argument('--all-fields', action='store_true',
+                         help="List every field, not just flagged ones")
+    jotform.add_argument('--csv', help="Also save one row per field to this file")
+    jotform.add_argument('--no-cache', action='store_true',
+                         help="Always download the forms, bypassing the page cache")
+    jotform.set_defaults(func=cmd_jotform)
+
+    html = subparsers.add_parser('html', help="Remove MSO code and inline CSS in an HTML file")
+    html.add_argument('input', help="Input HTML file or '-'")
+    html.add_argument('-o', '--output', default=STDIO, help="Output file (default: stdout)")
+    html.add_argument('--no-inline', action='store_true',
+                      help="Only remove MSO code, do not inline CSS")
+    html.set_defaults(func=cmd_html)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    profile = args.profile or args.profile_memory
+    if profile:
+        import instrumentation
+        instrumentation.enable(memory=args.profile_memory, log=False)
+    try:
+        args.func(args)
+    except BrokenPipeError:
+        # Output was piped into a command that exited early (e.g. head). Point
+        # stdout at devnull so the flush at exit does not raise again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (ValueError, KeyError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profile:
+            import lazy_imports
+            print(instrumentation.format_summary(), file=sys.stderr)
+            print(lazy_imports.format_import_times(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    import multiprocessing
+    # Needed for batch conversion worker processes in frozen executables
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Automatic column mapping for CSV to UWP conversion.
+Scores every source column against every UWP column using normalized name
+tokens and edit distance, then resolves a one-to-one assignment. Results are
+memoized per header, so repeat uploads of the same export layout map instantly.
+"""
+
+import difflib
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from config import CSV_COLUMN_MAPPING
+
+# Splits camelCase/PascalCase words and letter/digit boundaries
+_WORD_BOUNDARY = re.compile(r'(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])|(?<=[0-9])(?=[A-Za-z])')
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+# Common abbreviations and synonyms in membership exports
+_TOKEN_SYNONYMS = {
+    'pc': ('postcode',),
+    'postal': ('postcode',),
+    'tel': ('phone',),
+    'telephone': ('phone',),
+    'mob': ('mobile',),
+    'no': ('number',),
+    'num': ('number',),
+    'addr': ('address',),
+    'forename': ('first', 'name'),
+    'surname': ('last', 'name')
+}
+_EMAIL_SPELLING = re.compile(r'\be[-_ ]mail', re.IGNORECASE)
+
+
+def normalize_tokens(column_name) -> Tuple[str, ...]:
+    """
+    Split a column name into lowercase word tokens.
+
+    Args:
+        column_name: Column name such as 'Address - Home - Line 1' or 'HomeAddress1'
+
+    Returns:
+        Tuple of tokens, e.g. ('address', 'home', 'line', '1')
+    """
+    spaced = _WORD_BOUNDARY.sub(' ', _EMAIL_SPELLING.sub('email', str(column_name)))
+    tokens = []
+    for token in _NON_ALPHANUMERIC.split(spaced.lower()):
+        if token:
+            tokens.extend(_TOKEN_SYNONYMS.get(token, (token,)))
+    return tuple(tokens)
+
+
+def header_signature(columns) -> str:
+    """
+    Get a stable fingerprint of a header row.
+
+    Args:
+        columns: Column names in file order
+
+    Returns:
+        Hex digest identifying the header layout
+    """
+    joined = '\x1f'.join(str(column).strip() for column in columns)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+class _ColumnIndex:
+    """Normalized tokens and compact forms of a set of column names, built once."""
+
+    def __init__(self, columns: Tuple):
+        self.columns = columns
+        self.tokens = [frozenset(normalize_tokens(column)) for column in columns]
+        self.compact = [''.join(normalize_tokens(column)) for column in columns]
+
+
+def _score(tokens_a: frozenset, compact_a: str, tokens_b: frozenset, compact_b: str) -> float:
+    """Score the similarity of two column names between 0 and 1."""
+    if compact_a == compact_b:
+        return 1.0
+    if not tokens_a or not tokens_b:
+        return 0.0
+    overlap = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    similarity = difflib.SequenceMatcher(None, compact_a, compact_b).ratio()
+    # A shortened name ('email' for 'emailaddress') is a strong hint
+    if compact_a.startswith(compact_b) or compact_b.startswith(compact_a):
+        similarity = max(similarity, 0.9)
+    return 0.6 * overlap + 0.4 * similarity
+
+
+@lru_cache(maxsize=64)
+def _auto_map(csv_columns: Tuple, uwp_columns: Tuple, min_score: float) -> Tuple:
+    """Compute the column assignment (cached, see ColumnAutoMapper.auto_map)."""
+    default_mapping = CSV_COLUMN_MAPPING["new_column_names"]
+    reverse_mapping = {v: k for k, v in default_mapping.items()}
+    csv_index = _ColumnIndex(csv_columns)
+
+    # Each UWP column is matched against its own name and its default source name
+    candidates = []
+    for uwp_position, uwp_col in enumerate(uwp_columns):
+        hints = _ColumnIndex(tuple({uwp_col, reverse_mapping.get(uwp_col, uwp_col)}))
+        for csv_position in range(len(csv_columns)):
+            score = max(
+                _score(hint_tokens, hint_compact,
+                       csv_index.tokens[csv_position], csv_index.compact[csv_position])
+                for hint_tokens, hint_compact in zip(hints.tokens, hints.compact)
+            )
+            # An exact match of the default source column always wins
+            if csv_columns[csv_position] == reverse_mapping.get(uwp_col):
+                score = 2.0
+            if score >= min_score:
+                candidates.append((-score, uwp_position, csv_position))
+
+    # Resolve as a one-to-one assignment, best scoring pairs first
+    candidates.sort()
+    assigned_uwp, assigned_csv, mapping = set(), set(), []
+    for _, uwp_position, csv_position in candidates:
+        if uwp_position in assigned_uwp or csv_position in assigned_csv:
+            continue
+        assigned_uwp.add(uwp_position)
+        assigned_csv.add(csv_position)
+        mapping.append((uwp_columns[uwp_position], csv_columns[csv_position]))
+    return tuple(sorted(mapping, key=lambda pair: uwp_columns.index(pair[0])))
+
+
+class ColumnAutoMapper:
+    """Suggests which source column maps to each UWP output column."""
+
+    # Minimum similarity score for a suggestion
+    MIN_SCORE = 0.55
+
+    @staticmethod
+    def auto_map(csv_columns, uwp_columns: List[str]) -> Dict[str, str]:
+        """
+        Suggest a source column for each UWP column.
+        Each source column is used at most once; UWP columns without a good
+        enough match are left out.
+
+        Args:
+            csv_columns: Column names of the uploaded file
+            uwp_columns: UWP output column names
+
+        Returns:
+            Dictionary mapping UWP column names to source column names
+        """
+        return dict(_auto_map(tuple(csv_columns), tuple(uwp_columns), ColumnAutoMapper.MIN_SCORE))
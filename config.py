@@ -85,8 +85,61 @@ SUPPORTED_FILE_TYPES = {
     "csv": [("CSV files", "*.csv")],
     "excel": [("Excel files", "*.xlsx")],
     "html": [("HTML files", "*.html")],
-    "all_data": [("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+    "zip": [("Zip files", "*.zip")],
+    "all_data": [("Excel files", "*.xlsx"), ("CSV files", "*.csv"),
+                 ("Compressed files", "*.gz *.bz2 *.zst *.zip"),
+                 ("Parquet/Feather files", "*.parquet *.feather")]
 }
 
 # Base URL for surveys
-BASE_SURVEY_URL = "https://surveys.unitetheunion.org/" 
\ No newline at end of file
+BASE_SURVEY_URL = "https://surveys.unitetheunion.org/"
+
+# Temporary upload storage settings (Flask app)
+TEMP_STORAGE_SETTINGS = {
+    "ttl_seconds": 3600,                 # Reap uploads not touched for an hour
+    "max_bytes": 500 * 1024 * 1024,      # Disk quota for all temporary uploads
+    "reap_interval_seconds": 60          # How often the reaper checks for expired files
+}
+
+# Download compression settings (Flask app)
+OUTPUT_COMPRESSION_SETTINGS = {
+    "negotiate_content_encoding": True,  # gzip plain CSV downloads when the browser accepts it
+    "default_level": 6,                  # Compression level (1-9) when none is chosen
+    "chunk_rows": 50000                  # Rows serialized per streamed chunk
+}
+
+# SQLite snapshot store location (optional, see snapshot_store.py)
+SNAPSHOT_STORE_PATH = "~/.unite_toolbox/snapshots.sqlite3"
+
+# Batch CSV to UWP conversion settings
+BATCH_SETTINGS = {
+    "max_workers": None   # Worker processes (None uses the CPU count)
+}
+
+# Metrics endpoint for the Flask app (Prometheus text format)
+METRICS_SETTINGS = {
+    "enabled": True,
+    "path": "/metrics"
+}
+
+# JSON URL builder API for the Flask app (POST /api/urlbuilder)
+URL_BUILDER_API_SETTINGS = {
+    "max_batch": 10000    # Most URL requests accepted in one call
+}
+
+# Bulk JotForm validation settings (see jotform_validator.py)
+JOTFORM_VALIDATOR_SETTINGS = {
+    "max_workers": 8,       # Forms fetched at once (also the connection pool size)
+    "timeout_seconds": 30,  # Request timeout per form
+    "parser": "auto",       # HTML parser: 'lxml', 'html.parser' or 'auto' (lxml when installed)
+    "cache_dir": "~/.unite_toolbox/http_cache",  # On-disk page cache (None disables it)
+    "cache_ttl_seconds": 300,                    # Serve cached pages without a request for this long
+    "cache_max_bytes": 50 * 1024 * 1024          # Disk quota for cached pages
+}
+
+# Background pre-warm of heavy modules once the window/server is up (see lazy_imports.py)
+PREWARM_SETTINGS = {
+    "enabled": True,
+    "modules": ["pandas", "openpyxl", "premailer"],  # Imported in this order
+    "delay_seconds": 0.5                             # Wait after startup before importing
+}
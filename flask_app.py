@@ -1,36 +1,44 @@
-from flask import Flask, render_template, request, redirect, url_for, send_file, flash, session
+from flask import (Flask, Response, jsonify, render_template, request, redirect, url_for, send_file, flash,
+                   session, stream_with_context)
 import os
 import sys
 import io
 import json
+from functools import lru_cache
 from werkzeug.utils import secure_filename
 
-# Lazy load heavy dependencies
-_pandas = None
-_config_cache = None
-
-def _get_pandas():
-    """Lazy load pandas for faster startup."""
-    global _pandas
-    if _pandas is None:
-        import pandas as pd
-        _pandas = pd
-    return _pandas
-
+# Heavy dependencies (pandas, premailer) are loaded on first use via lazy_imports
+@lru_cache(maxsize=None)
 def _get_config():
     """Cache config imports."""
-    global _config_cache
-    if _config_cache is None:
-        from config import JOTFORM_TEMPLATES, URL_BUILDER_PARAMS, CSV_COLUMN_MAPPING
-        _config_cache = {
-            'JOTFORM_TEMPLATES': JOTFORM_TEMPLATES,
-            'URL_BUILDER_PARAMS': URL_BUILDER_PARAMS,
-            'CSV_COLUMN_MAPPING': CSV_COLUMN_MAPPING
-        }
-    return _config_cache
+    from config import (JOTFORM_TEMPLATES, URL_BUILDER_PARAMS, CSV_COLUMN_MAPPING,
+                        TEMP_STORAGE_SETTINGS, OUTPUT_COMPRESSION_SETTINGS,
+                        METRICS_SETTINGS, URL_BUILDER_API_SETTINGS, PREWARM_SETTINGS)
+    return {
+        'JOTFORM_TEMPLATES': JOTFORM_TEMPLATES,
+        'URL_BUILDER_PARAMS': URL_BUILDER_PARAMS,
+        'CSV_COLUMN_MAPPING': CSV_COLUMN_MAPPING,
+        'TEMP_STORAGE_SETTINGS': TEMP_STORAGE_SETTINGS,
+        'OUTPUT_COMPRESSION_SETTINGS': OUTPUT_COMPRESSION_SETTINGS,
+        'METRICS_SETTINGS': METRICS_SETTINGS,
+        'URL_BUILDER_API_SETTINGS': URL_BUILDER_API_SETTINGS,
+        'PREWARM_SETTINGS': PREWARM_SETTINGS
+    }
 
 # Import utils (now optimized with lazy loading)
-from utils import DataProcessor, HTMLProcessor, URLBuilder, FileHandler
+from utils import DataProcessor, HTMLProcessor, URLBuilder, FileHandler, CompressionHandler
+from temp_storage import TempStorageManager
+from column_mapper import ColumnAutoMapper
+from mapping_profiles import MappingProfileStore
+from metrics import AppMetrics
+import instrumentation
+
+# tracemalloc peaks are process-wide, so concurrent requests on the threaded
+# server would corrupt each other's per-stage memory; record timings only
+if instrumentation.is_tracing_memory():
+    print("Per-stage memory tracing is not supported by the web app; recording timings only.",
+          file=sys.stderr)
+    instrumentation.enable(memory=False)
 
 app = Flask(__name__)
 app.secret_key = 'unite-toolbox-secret-key'  # For flash messages
@@ -50,6 +58,51 @@ RESULTS_FOLDER = os.path.join(APP_DIR, 'results')
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
+# Uploads get unique ids and are reaped/evicted so the folder stays bounded
+temp_storage = TempStorageManager(UPLOAD_FOLDER, **_get_config()['TEMP_STORAGE_SETTINGS'])
+
+# Column mappings saved per header layout, applied automatically on matching uploads
+mapping_profiles = MappingProfileStore(os.path.join(APP_DIR, 'mapping_profiles.json'))
+
+# Request, processing and upload storage metrics served at /metrics
+app_metrics = AppMetrics(temp_storage)
+if _get_config()['METRICS_SETTINGS']['enabled']:
+    app_metrics.init_app(app, _get_config()['METRICS_SETTINGS']['path'])
+
+def _get_compression_level():
+    """Read the requested compression level (1-9) from the form."""
+    default_level = _get_config()['OUTPUT_COMPRESSION_SETTINGS']['default_level']
+    try:
+        level = int(request.form.get('compression_level', default_level))
+    except ValueError:
+        level = default_level
+    return min(max(level, 1), 9)
+
+def _download_response(body, mimetype, download_name, headers=None):
+    """Build a streamed attachment response."""
+    response = Response(body, mimetype=mimetype, headers=headers or {})
+    response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    return response
+
+def _csv_download(df, download_name):
+    """
+    Stream a DataFrame as a CSV download.
+    Sends a .csv.gz file if the form asked for one, otherwise gzips the
+    transfer with Content-Encoding when the browser accepts it.
+    """
+    settings = _get_config()['OUTPUT_COMPRESSION_SETTINGS']
+    level = _get_compression_level()
+    chunk_rows = settings['chunk_rows']
+    if request.form.get('output_compression') == 'gzip':
+        body = CompressionHandler.iter_csv_bytes(df, 'gzip', level, chunk_rows)
+        return _download_response(body, 'application/gzip', download_name + '.gz')
+    if settings['negotiate_content_encoding'] and 'gzip' in request.accept_encodings:
+        body = CompressionHandler.iter_csv_bytes(df, 'gzip', level, chunk_rows)
+        headers = {'Content-Encoding': 'gzip', 'Vary': 'Accept-Encoding'}
+        return _download_response(body, 'text/csv', download_name, headers)
+    body = CompressionHandler.iter_csv_bytes(df, None, level, chunk_rows)
+    return _download_response(body, 'text/csv', download_name)
+
 @app.route('/')
 def home():
     config = _get_config()
@@ -65,34 +118,31 @@ def csv2uwp():
                 column_mapping_json = request.form.get('column_mapping')
                 column_mapping = json.loads(column_mapping_json)
                 
-                # Get the stored file path from session
-                if 'data_file_path' not in session:
+                # Get the stored file from session (may have been reaped or evicted)
+                file_id = session.get('data_file_id')
+                file_path = temp_storage.get_path(file_id) if file_id else None
+                if file_path is None:
                     flash('Session expired. Please upload the file again.', 'danger')
                     return redirect(url_for('csv2uwp'))
                 
                 # Read the file again (supports both CSV and Excel)
-                file_path = session['data_file_path']
                 df = DataProcessor.load_data_file(file_path)
+                app_metrics.record_rows(len(df))
                 
                 # Convert with custom mapping
                 df_uwp = DataProcessor.convert_csv_to_uwp(df, column_mapping=column_mapping)
                 
+                # Remember the mapping for future files with the same header
+                if request.form.get('save_profile'):
+                    mapping_profiles.save(df.columns, column_mapping)
+                
                 # Clean up temporary file
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                session.pop('data_file_path', None)
+                temp_storage.remove(file_id)
+                session.pop('data_file_id', None)
                 session.pop('data_columns', None)
                 
-                # Return converted file (optimized CSV writing)
-                output = io.StringIO()
-                df_uwp.to_csv(output, index=False, lineterminator='\n')
-                output.seek(0)
-                return send_file(
-                    io.BytesIO(output.getvalue().encode()),
-                    mimetype='text/csv',
-                    as_attachment=True,
-                    download_name='uwp_converted.csv'
-                )
+                # Return converted file (streamed, compressed if requested)
+                return _csv_download(df_uwp, 'uwp_converted.csv')
             except Exception as e:
                 flash(f'Error converting file: {e}', 'danger')
                 return redirect(url_for('csv2uwp'))
@@ -102,49 +152,105 @@ def csv2uwp():
             if not file or file.filename == '':
                 flash('No file selected', 'danger')
                 return redirect(request.url)
+            # Drop any earlier upload from this session that was never mapped
+            previous_file_id = session.pop('data_file_id', None)
+            if previous_file_id:
+                temp_storage.remove(previous_file_id)
+            file_id = None
             try:
-                # Save file temporarily
+                # Save file temporarily under a unique id
                 filename = secure_filename(file.filename)
-                file_path = os.path.join(UPLOAD_FOLDER, f'temp_{filename}')
-                file.save(file_path)
+                file_id = temp_storage.save_upload(file, filename)
+                file_path = temp_storage.get_path(file_id)
                 
                 # Read file to get columns (supports both CSV and Excel)
                 df = DataProcessor.load_data_file(file_path)
                 
-                # Store file path and columns in session
-                session['data_file_path'] = file_path
+                # A saved profile for this header layout skips the mapping page
+                saved_mapping = mapping_profiles.get(df.columns)
+                if saved_mapping and request.form.get('use_saved_profile'):
+                    app_metrics.record_rows(len(df))
+                    df_uwp = DataProcessor.convert_csv_to_uwp(df, column_mapping=saved_mapping)
+                    temp_storage.remove(file_id)
+                    return _csv_download(df_uwp, 'uwp_converted.csv')
+                
+                # Store file id and columns in session
+                session['data_file_id'] = file_id
                 session['data_columns'] = list(df.columns)
                 
                 # Get UWP output columns
                 uwp_columns = DataProcessor.get_uwp_output_columns()
                 
-                # Try to auto-map columns based on default mapping (cached)
-                config = _get_config()
-                default_mapping = config['CSV_COLUMN_MAPPING']["new_column_names"]
-                reverse_mapping = {v: k for k, v in default_mapping.items()}
-                auto_mapping = {}
-                for uwp_col in uwp_columns:
-                    # Try to find matching CSV column
-                    default_source = reverse_mapping.get(uwp_col, '')
-                    if default_source in df.columns:
-                        auto_mapping[uwp_col] = default_source
-                    else:
-                        # Try fuzzy matching
-                        for csv_col in df.columns:
-                            if csv_col.lower() == default_source.lower() or \
-                               default_source.lower() in csv_col.lower() or \
-                               csv_col.lower() in default_source.lower():
-                                auto_mapping[uwp_col] = csv_col
-                                break
+                # Start from the auto-mapper's suggestion (memoized per header layout);
+                # a saved profile is offered separately on the mapping page
+                auto_mapping = ColumnAutoMapper.auto_map(df.columns, uwp_columns)
+                if saved_mapping:
+                    saved_mapping = {uwp_col: csv_col for csv_col, uwp_col in saved_mapping.items()}
                 
                 return render_template('csv2uwp_map.html', 
                                      csv_columns=session['data_columns'],
                                      uwp_columns=uwp_columns,
-                                     auto_mapping=auto_mapping)
+                                     auto_mapping=auto_mapping,
+                                     saved_mapping=saved_mapping,
+                                     has_saved_profile=saved_mapping is not None)
             except Exception as e:
+                if file_id:
+                    temp_storage.remove(file_id)
+                    session.pop('data_file_id', None)
                 flash(f'Error reading file: {e}', 'danger')
     return render_template('csv2uwp.html')
 
+@app.route('/csv2uwp_batch', methods=['GET', 'POST'])
+def csv2uwp_batch():
+    if request.method == 'POST':
+        files = [f for f in request.files.getlist('data_files') if f and f.filename]
+        if not files:
+            flash('No files selected', 'danger')
+            return redirect(request.url)
+        from batch_convert import convert_batch_frame, iter_batch_zip_bytes, BatchInput
+        file_ids = []
+        try:
+            # Save uploads temporarily; a single zip is converted member by member
+            inputs = []
+            for file in files:
+                filename = secure_filename(file.filename)
+                file_id = temp_storage.save_upload(file, filename)
+                file_ids.append(file_id)
+                inputs.append(BatchInput(temp_storage.get_path(file_id), None, filename))
+            if len(inputs) == 1 and inputs[0].name.lower().endswith('.zip'):
+                source = inputs[0].path
+            else:
+                source = inputs
+            
+            # Converted in-process: the threaded server already runs requests side
+            # by side, and a worker pool would be forked from a multi-threaded server
+            def record_rows(result):
+                app_metrics.record_rows(sum(entry['rows_in'] for entry in result.report))
+            
+            if request.form.get('output_mode', 'zip') == 'zip':
+                body = iter_batch_zip_bytes(source, workers=1, level=_get_compression_level(),
+                                            on_complete=record_rows)
+                # Keep the request context so rows are recorded once the zip is complete
+                response = _download_response(stream_with_context(body), 'application/zip',
+                                              'uwp_batch.zip')
+                # The uploads are read while the zip streams; remove them afterwards
+                uploaded, file_ids = file_ids, []
+                
+                def remove_uploads():
+                    for file_id in uploaded:
+                        temp_storage.remove(file_id)
+                response.call_on_close(remove_uploads)
+                return response
+            df_all, result = convert_batch_frame(source, workers=1)
+            record_rows(result)
+            return _csv_download(df_all, 'uwp_combined.csv')
+        except Exception as e:
+            flash(f'Error converting files: {e}', 'danger')
+        finally:
+            for file_id in file_ids:
+                temp_storage.remove(file_id)
+    return render_template('csv2uwp_batch.html')
+
 @app.route('/csv2sms', methods=['GET', 'POST'])
 def csv2sms():
     if request.method == 'POST':
@@ -153,18 +259,10 @@ def csv2sms():
             flash('No file selected', 'danger')
             return redirect(request.url)
         try:
-            pd = _get_pandas()
-            df = pd.read_csv(file, engine='c', low_memory=False)
+            df = DataProcessor.load_data_file(file, file_name=file.filename)
+            app_metrics.record_rows(len(df))
             sms_df = DataProcessor.create_sms_list(df)
-            output = io.StringIO()
-            sms_df.to_csv(output, index=False, lineterminator='\n')
-            output.seek(0)
-            return send_file(
-                io.BytesIO(output.getvalue().encode()),
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name='sms_list.csv'
-            )
+            return _csv_download(sms_df, 'sms_list.csv')
         except Exception as e:
             flash(f'Error: {e}', 'danger')
     return render_template('csv2sms.html')
@@ -177,24 +275,19 @@ def csvdivide():
             flash('No file selected', 'danger')
             return redirect(request.url)
         try:
-            pd = _get_pandas()
-            df = pd.read_csv(file, engine='c', low_memory=False)
+            df = DataProcessor.load_data_file(file, file_name=file.filename)
+            app_metrics.record_rows(len(df))
             workplaces = DataProcessor.divide_by_workplace(df)
-            # Create a zip of all workplace files
+            # Stream a zip of all workplace files (deflated unless stored was chosen)
             import zipfile
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w') as zipf:
-                for name, wdf in workplaces.items():
-                    safe_name = FileHandler.get_safe_filename(name) or 'workplace'
-                    csv_bytes = wdf.to_csv(index=False).encode()
-                    zipf.writestr(f'{safe_name}.csv', csv_bytes)
-            zip_buffer.seek(0)
-            return send_file(
-                zip_buffer,
-                mimetype='application/zip',
-                as_attachment=True,
-                download_name='workplaces.zip'
+            compress_type = (zipfile.ZIP_STORED if request.form.get('zip_compression') == 'stored'
+                             else zipfile.ZIP_DEFLATED)
+            entries = (
+                (f'{FileHandler.get_safe_filename(str(name)) or "workplace"}.csv', wdf)
+                for name, wdf in workplaces.items()
             )
+            body = CompressionHandler.iter_zip_bytes(entries, compress_type, _get_compression_level())
+            return _download_response(body, 'application/zip', 'workplaces.zip')
         except Exception as e:
             flash(f'Error: {e}', 'danger')
     return render_template('csvdivide.html')
@@ -227,12 +320,43 @@ def urlbuilder():
     if request.method == 'POST':
         base_path = request.form.get('base_path', '').strip()
         params = {k: (k in request.form) for k in url_builder_params.keys()}
+        member_file = request.files.get('member_file')
         try:
+            if member_file and member_file.filename:
+                # One personalised link per member, streamed as CSV
+                df = DataProcessor.load_data_file(member_file, file_name=member_file.filename)
+                app_metrics.record_rows(len(df))
+                chunk_rows = config['OUTPUT_COMPRESSION_SETTINGS']['chunk_rows']
+                body = URLBuilder.iter_member_url_csv(df, base_path, params, chunk_rows=chunk_rows)
+                return _download_response(body, 'text/csv', 'survey_links.csv')
             url = URLBuilder.build_survey_url(base_path, params)
         except Exception as e:
             flash(f'Error: {e}', 'danger')
     return render_template('urlbuilder.html', url=url, params=url_builder_params)
 
+@app.route('/api/urlbuilder', methods=['GET', 'POST'])
+def api_urlbuilder():
+    """
+    Build survey URLs in bulk.
+    GET lists the available parameters. POST takes {"requests": [{"base_path": ...,
+    "parameters": [...]}, ...]} (or the bare list) and returns {"urls": [...]}.
+    """
+    config = _get_config()
+    max_batch = config['URL_BUILDER_API_SETTINGS']['max_batch']
+    if request.method == 'GET':
+        return jsonify({'parameters': list(config['URL_BUILDER_PARAMS']), 'max_batch': max_batch})
+    payload = request.get_json(silent=True)
+    items = payload.get('requests') if isinstance(payload, dict) else payload
+    if not isinstance(items, list):
+        return jsonify({'error': 'Expected a JSON list of requests or {"requests": [...]}.'}), 400
+    if len(items) > max_batch:
+        return jsonify({'error': f'At most {max_batch} requests per call.'}), 413
+    try:
+        urls = URLBuilder.build_survey_urls(items)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'urls': urls, 'count': len(urls)})
+
 @app.route('/csvcompare', methods=['GET', 'POST'])
 def csvcompare():
     if request.method == 'POST':
@@ -243,19 +367,11 @@ def csvcompare():
             flash('Please provide both files and the key column.', 'danger')
             return redirect(request.url)
         try:
-            pd = _get_pandas()
-            df1 = pd.read_csv(file1, engine='c', low_memory=False)
-            df2 = pd.read_csv(file2, engine='c', low_memory=False)
+            df1 = DataProcessor.load_data_file(file1, file_name=file1.filename)
+            df2 = DataProcessor.load_data_file(file2, file_name=file2.filename)
+            app_metrics.record_rows(len(df1) + len(df2))
             missing = DataProcessor.compare_dataframes(df1, df2, key_column)
-            output = io.StringIO()
-            missing.to_csv(output, index=False, lineterminator='\n')
-            output.seek(0)
-            return send_file(
-                io.BytesIO(output.getvalue().encode()),
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name='missing_rows.csv'
-            )
+            return _csv_download(missing, 'missing_rows.csv')
         except Exception as e:
             flash(f'Error: {e}', 'danger')
     return render_template('csvcompare.html')
@@ -269,6 +385,9 @@ def open_browser():
 
 if __name__ == '__main__':
     import threading
+    import multiprocessing
+    # Needed for batch conversion worker processes in frozen executables
+    multiprocessing.freeze_support()
     print("Starting Unite Toolbox Flask App...")
     print("App will be available at: http://127.0.0.1:5000")
     print("Opening browser automatically...")
@@ -278,5 +397,12 @@ if __name__ == '__main__':
     browser_thread.daemon = True
     browser_thread.start()
     
+    # Import pandas etc. in the background so the first request does not pay for it
+    prewarm_settings = _get_config()['PREWARM_SETTINGS']
+    if prewarm_settings['enabled']:
+        import lazy_imports
+        lazy_imports.prewarm(prewarm_settings['modules'],
+                             delay_seconds=prewarm_settings['delay_seconds'])
+    
     # Run Flask app (use_threaded=False for PyInstaller compatibility)
     app.run(debug=False, port=5000, use_reloader=False) 
\ No newline at end of file
@@ -11,11 +11,20 @@ a = Analysis(
         ('archive/templates', 'templates'),  # Include all template files
         ('config.py', '.'),                  # Include config
         ('utils.py', '.'),                   # Include utils
+        ('lazy_imports.py', '.'),            # Include lazy import registry
+        ('instrumentation.py', '.'),         # Include stage instrumentation
+        ('metrics.py', '.'),                 # Include /metrics collectors
+        ('temp_storage.py', '.'),            # Include upload storage manager
+        ('column_mapper.py', '.'),           # Include column auto-mapper
+        ('mapping_profiles.py', '.'),        # Include saved mapping profiles
+        ('batch_convert.py', '.'),           # Include batch UWP conversion
+        ('snapshot_store.py', '.'),          # Include SQLite snapshot store
         ('gui_components.py', '.'),         # Include GUI components (if needed)
     ],
     hiddenimports=[
         'flask',
         'pandas',
+        'sqlite3',
         'premailer',
         'werkzeug',
         'jinja2',
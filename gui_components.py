@@ -4,7 +4,6 @@ Contains reusable GUI elements and dialog functions.
 """
 
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
 from typing import Optional, List, Tuple, Callable
 from config import SUPPORTED_FILE_TYPES
 
@@ -32,6 +31,7 @@ class DialogHelper:
         Returns:
             Selected file path or None if cancelled
         """
+        from tkinter import filedialog
         root = DialogHelper.create_hidden_root()
         if file_types is None:
             file_types = SUPPORTED_FILE_TYPES["all_data"]
@@ -58,6 +58,7 @@ class DialogHelper:
         Returns:
             Selected save path or None if cancelled
         """
+        from tkinter import filedialog
         root = DialogHelper.create_hidden_root()
         if file_types is None:
             file_types = SUPPORTED_FILE_TYPES["csv"]
@@ -81,6 +82,7 @@ class DialogHelper:
         Returns:
             Selected directory path or None if cancelled
         """
+        from tkinter import filedialog
         root = DialogHelper.create_hidden_root()
         directory_path = filedialog.askdirectory(title=title)
         root.destroy()
@@ -98,6 +100,7 @@ class DialogHelper:
         Returns:
             User input or None if cancelled
         """
+        from tkinter import simpledialog
         root = DialogHelper.create_hidden_root()
         user_input = simpledialog.askstring(title, prompt)
         root.destroy()
@@ -106,6 +109,7 @@ class DialogHelper:
     @staticmethod
     def show_info(message: str, title: str = "Information") -> None:
         """Show an information message box."""
+        from tkinter import messagebox
         root = DialogHelper.create_hidden_root()
         messagebox.showinfo(title, message, parent=root)
         root.destroy()
@@ -113,6 +117,7 @@ class DialogHelper:
     @staticmethod
     def show_error(message: str, title: str = "Error") -> None:
         """Show an error message box."""
+        from tkinter import messagebox
         root = DialogHelper.create_hidden_root()
         messagebox.showerror(title, message, parent=root)
         root.destroy()
@@ -120,6 +125,7 @@ class DialogHelper:
     @staticmethod
     def show_warning(message: str, title: str = "Warning") -> None:
         """Show a warning message box."""
+        from tkinter import messagebox
         root = DialogHelper.create_hidden_root()
         messagebox.showwarning(title, message, parent=root)
         root.destroy()
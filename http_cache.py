@@ -0,0 +1,211 @@
+"""
+On-disk HTTP cache for pages fetched by the Unite Toolbox (JotForm forms).
+Responses are kept for a TTL without any request, then revalidated with
+ETag/Last-Modified conditional requests so an unchanged page costs a 304.
+The cache folder is bounded by a size quota with LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Dict
+
+
+class CachedResponse(NamedTuple):
+    """A page served through the cache."""
+    url: str
+    text: str
+    status: str       # 'fresh' (no request), 'revalidated' (304) or 'fetched' (200)
+
+
+class HTTPCache:
+    """Caches GET responses on disk, one JSON file per URL."""
+
+    def __init__(self, directory: str, ttl_seconds: int = 300,
+                 max_bytes: int = 50 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Folder holding cached responses (created if missing)
+            ttl_seconds: Seconds a response is served without contacting the server
+            max_bytes: Disk quota for all cached responses combined
+        """
+        self.directory = os.path.expanduser(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        # file name -> size, ordered from least to most recently used
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._bytes_held = 0
+        self._lock = threading.Lock()
+        self._counters = {'fresh': 0, 'revalidated': 0, 'fetched': 0, 'evicted': 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._adopt_existing_files()
+
+    @staticmethod
+    def _file_name(url: str) -> str:
+        """Cache file name for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json'
+
+    def _adopt_existing_files(self) -> None:
+        """Track responses cached by a previous run, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.json') and os.path.isfile(path):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._entries[name] = size
+            self._bytes_held += size
+
+    def _read(self, url: str) -> Optional[Dict]:
+        """Read the cached entry for a URL, dropping it if it is unreadable."""
+        name = self._file_name(url)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._remove(name)
+            return None
+        # Guard against hash collisions and files from elsewhere
+        return entry if entry.get('url') == url else None
+
+    def _write(self, entry: Dict) -> None:
+        """Store an entry atomically and evict to stay within the quota."""
+        name = self._file_name(entry['url'])
+        data = json.dumps(entry).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        path = os.path.join(self.directory, name)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+        with self._lock:
+            self._bytes_held += len(data) - self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._evict_to_quota(keep=name)
+
+    def _touch(self, url: str) -> None:
+        """Mark a URL's entry as recently used."""
+        name = self._file_name(url)
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+        try:
+            os.utime(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _remove(self, name: str) -> None:
+        """Delete one cache file and forget it."""
+        with self._lock:
+            self._bytes_held -= self._entries.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+
+    def _evict_to_quota(self, keep: str) -> None:
+        """Remove least recently used entries until under the quota (lock held)."""
+        while self._bytes_held > self.max_bytes and len(self._entries) > 1:
+            name = next(iter(self._entries))
+            if name == keep:
+                self._entries.move_to_end(name)
+                continue
+            self._bytes_held -= self._entries.pop(name)
+            self._counters['evicted'] += 1
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def get(self, session, url: str, timeout: Optional[float] = None) -> CachedResponse:
+        """
+        Get a page through the cache.
+
+        Args:
+            session: requests.Session used for network requests
+            url: Page URL
+            timeout: Request timeout in seconds
+
+        Returns:
+            CachedResponse with the page text and how it was served
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        entry = self._read(url)
+        now = time.time()
+        if entry is not None and now - entry['stored_at'] < self.ttl_seconds:
+            self._touch(url)
+            self._count('fresh')
+            return CachedResponse(url, entry['text'], 'fresh')
+
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if response.status_code == 304 and entry is not None:
+            entry['stored_at'] = now
+            entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+            self._write(entry)
+            self._count('revalidated')
+            return CachedResponse(url, entry['text'], 'revalidated')
+
+        response.raise_for_status()
+        if 'no-store' not in response.headers.get('Cache-Control', ''):
+            self._write({
+                'url': url,
+                'stored_at': now,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'text': response.text
+            })
+        self._count('fetched')
+        return CachedResponse(url, response.text, 'fetched')
+
+    def _count(self, status: str) -> None:
+        with self._lock:
+            self._counters[status] += 1
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._lock:
+            names = list(self._entries)
+        for name in names:
+            self._remove(name)
+
+    def stats(self) -> Dict:
+        """
+        Get cache usage statistics.
+
+        Returns:
+            Dictionary with entries held, bytes held, the quota and counts of
+            fresh hits, revalidations, full fetches and evictions
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes_held': self._bytes_held,
+                'max_bytes': self.max_bytes,
+                'fresh_total': self._counters['fresh'],
+                'revalidated_total': self._counters['revalidated'],
+                'fetched_total': self._counters['fetched'],
+                'evicted_total': self._counters['evicted']
+            }
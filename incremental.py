@@ -0,0 +1,151 @@
+"""
+Incremental CSV to UWP conversion for the Unite Toolbox.
+Keeps a manifest of the previous run's UWP output with a per-member row
+hash, so a daily export only has its new and changed rows converted and
+emitted, together with the membership numbers that have disappeared since
+the last run. The full output is assembled from the manifest's unchanged
+rows and the newly converted ones.
+"""
+
+import hashlib
+import os
+from typing import NamedTuple, Dict
+
+import lazy_imports
+from utils import DataProcessor
+
+_get_pandas = lazy_imports.getter('pandas')
+
+MEMBERSHIP_COLUMN = "MembershipNumber"
+
+
+class IncrementalResult(NamedTuple):
+    """Outcome of an incremental conversion."""
+    changed: 'pd.DataFrame'   # UWP rows for new and changed members
+    full: 'pd.DataFrame'      # Complete UWP output: reused unchanged rows plus changed rows
+    deleted: 'pd.DataFrame'   # MembershipNumber of members missing since the last run
+    new_count: int
+    changed_count: int
+    unchanged_count: int
+
+
+class IncrementalUWPConverter:
+    """Converts only the rows that changed since the previous run."""
+
+    def __init__(self, manifest_path: str):
+        """
+        Initialize the converter.
+
+        Args:
+            manifest_path: File holding the previous UWP output and row hashes
+                           between runs (.csv, or .parquet/.feather when pyarrow
+                           is installed)
+        """
+        self.manifest_path = manifest_path
+
+    def load_manifest(self) -> 'pd.DataFrame':
+        """
+        Load the manifest from the previous run.
+
+        Returns:
+            DataFrame with the previous UWP output (MembershipNumber as string)
+            and a row_hash column, empty if there is no previous run
+        """
+        pd = _get_pandas()
+        if not os.path.exists(self.manifest_path):
+            return pd.DataFrame({MEMBERSHIP_COLUMN: pd.Series(dtype=str),
+                                 'row_hash': pd.Series(dtype='int64')})
+        manifest = DataProcessor.load_data_file(self.manifest_path)
+        manifest = manifest[manifest[MEMBERSHIP_COLUMN].notna()].copy()
+        manifest[MEMBERSHIP_COLUMN] = manifest[MEMBERSHIP_COLUMN].astype(str)
+        return manifest
+
+    def _save_manifest(self, manifest: 'pd.DataFrame') -> None:
+        """Write the manifest atomically so an interrupted run keeps the old one."""
+        directory = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(directory, exist_ok=True)
+        name, extension = os.path.splitext(self.manifest_path)
+        temp_path = f"{name}.tmp{extension}"
+        DataProcessor.save_data_file(manifest, temp_path)
+        os.replace(temp_path, self.manifest_path)
+
+    def convert(self, df: 'pd.DataFrame', column_mapping: Dict[str, str] = None,
+                update_manifest: bool = True) -> IncrementalResult:
+        """
+        Convert only the rows that are new or changed since the last run.
+        Rows are hashed on the mapped source columns, so only changed rows are
+        mapped to UWP columns; unchanged rows are taken from the manifest. When
+        a membership number appears more than once, its first row wins (as in
+        batch_convert). Rows without a membership number are kept, converted
+        and emitted as new on every run, and left out of the manifest.
+
+        Args:
+            df: Full input DataFrame for this run
+            column_mapping: Optional custom mapping (see DataProcessor.convert_csv_to_uwp)
+            update_manifest: Whether to record this run as the new baseline
+
+        Returns:
+            IncrementalResult with changed rows, the full output, deleted members
+            and counts
+
+        Raises:
+            ValueError: If no column maps to MembershipNumber or mapped columns are missing
+        """
+        pd = _get_pandas()
+        plan = DataProcessor.compile_mapping_plan(df.columns, column_mapping)
+        if MEMBERSHIP_COLUMN not in plan.output_columns:
+            raise ValueError(f"Incremental conversion needs a column mapped to {MEMBERSHIP_COLUMN}")
+        key_source = plan.source_columns[plan.output_columns.index(MEMBERSHIP_COLUMN)]
+
+        source = df[list(plan.source_columns)]
+        # Rows without a membership number cannot be matched between runs, so
+        # they are never deduplicated and are converted and emitted every time
+        has_key = source[key_source].notna()
+        first = ~(has_key & source[key_source].duplicated(keep='first'))
+        source, has_key = source[first.values], has_key[first.values].values
+        keys = source.loc[has_key, key_source].astype(str)
+
+        # Salt hashes with the mapping so a changed mapping re-emits every row
+        signature = repr(list(zip(plan.source_columns, plan.output_columns))).encode()
+        hash_key = hashlib.md5(signature).hexdigest()[:16]
+        row_hashes = pd.util.hash_pandas_object(source[has_key], index=False, hash_key=hash_key)
+        current = pd.DataFrame({MEMBERSHIP_COLUMN: keys.values,
+                                'row_hash': row_hashes.values.view('int64')})
+
+        previous = self.load_manifest()
+        previous['row_hash'] = previous['row_hash'].astype('int64')
+        previous_hashes = previous[[MEMBERSHIP_COLUMN, 'row_hash']]
+        if not set(plan.output_columns).issubset(previous.columns):
+            # Manifest without reusable output for this mapping: convert every row again
+            previous_hashes = previous_hashes.iloc[0:0]
+        # Join on key and hash together so hashes are compared as exact int64 values
+        unchanged_keys = current.merge(previous_hashes, on=[MEMBERSHIP_COLUMN, 'row_hash'])[MEMBERSHIP_COLUMN]
+        is_new = ~current[MEMBERSHIP_COLUMN].isin(previous[MEMBERSHIP_COLUMN])
+        is_changed = ~is_new & ~current[MEMBERSHIP_COLUMN].isin(unchanged_keys)
+        emit_mask = ~has_key
+        emit_mask[has_key] = (is_new | is_changed).values
+
+        changed = plan.apply(source[emit_mask])
+        # Reuse unchanged rows from the manifest and put every row back in input order
+        reused = (previous.set_axis(previous[MEMBERSHIP_COLUMN].values)
+                  .reindex(current.loc[~emit_mask[has_key], MEMBERSHIP_COLUMN].values)
+                  .reindex(columns=list(plan.output_columns)))
+        positions = pd.RangeIndex(len(source))
+        full = (pd.concat([reused.set_axis(positions[~emit_mask]), changed.set_axis(positions[emit_mask])])
+                .sort_index()
+                .reset_index(drop=True))
+        deleted_keys = previous.loc[~previous[MEMBERSHIP_COLUMN].isin(current[MEMBERSHIP_COLUMN]),
+                                    MEMBERSHIP_COLUMN]
+        deleted = pd.DataFrame({MEMBERSHIP_COLUMN: deleted_keys.values})
+
+        if update_manifest:
+            self._save_manifest(full[has_key].assign(row_hash=current['row_hash'].values))
+
+        return IncrementalResult(
+            changed=changed,
+            full=full,
+            deleted=deleted,
+            new_count=int(is_new.sum() + (~has_key).sum()),
+            changed_count=int(is_changed.sum()),
+            unchanged_count=int(len(source) - emit_mask.sum())
+        )
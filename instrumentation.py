@@ -0,0 +1,287 @@
+"""
+Opt-in per-stage instrumentation for the Unite Toolbox.
+Records wall time, CPU time, rows, bytes and peak memory growth for each
+processing stage (load, map, filter, partition, serialize, inline CSS) as
+structured log records, and aggregates them into a summary. CPU time is
+that of the thread running the stage, so concurrent web requests do not
+count towards each other's stages (work handed to worker processes is not
+included).
+
+Instrumentation is off by default and costs one flag check per call when off.
+Turn it on with the UNITE_TOOLBOX_INSTRUMENT environment variable
+('1' for timings, 'memory' to also trace memory) or by calling enable().
+
+Memory tracing is for single-threaded runs (CLI, benchmarks): tracemalloc's
+peak is process-wide, so stages running at the same time on other threads
+would reset and inflate each other's peaks. The web app turns it off.
+"""
+
+import atexit
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, List
+
+ENV_VAR = "UNITE_TOOLBOX_INSTRUMENT"
+# Most recent stage records kept for the summary
+MAX_RECORDS = 10000
+
+logger = logging.getLogger("unite_toolbox.instrumentation")
+
+_enabled = False
+_trace_memory = False
+_records = deque(maxlen=MAX_RECORDS)
+_local = threading.local()
+
+
+class StageRecord:
+    """Measurements for one run of a stage. Set rows/bytes inside the stage if known."""
+
+    __slots__ = ('name', 'rows', 'bytes', 'wall_seconds', 'cpu_seconds',
+                 'memory_peak_delta', '_start_wall', '_start_cpu',
+                 '_start_memory', '_child_peak')
+
+    # Measurements are recorded; callers can skip computing them otherwise
+    active = True
+
+    def __init__(self, name: str, rows: Optional[int] = None, bytes: Optional[int] = None):
+        self.name = name
+        self.rows = rows
+        self.bytes = bytes
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.memory_peak_delta = None
+        self._start_memory = 0
+        self._child_peak = 0
+
+    def as_dict(self) -> Dict:
+        """Get the measurements as a dictionary."""
+        return {
+            'stage': self.name,
+            'wall_seconds': self.wall_seconds,
+            'cpu_seconds': self.cpu_seconds,
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'memory_peak_delta': self.memory_peak_delta
+        }
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        if _trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stage's peak before resetting it for this stage
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+            self._start_memory = current
+        stack.append(self)
+        self._start_cpu = time.thread_time()
+        self._start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_seconds = round(time.perf_counter() - self._start_wall, 6)
+        self.cpu_seconds = round(time.thread_time() - self._start_cpu, 6)
+        stack = _local.stack
+        stack.pop()
+        if _trace_memory:
+            import tracemalloc
+            peak = max(tracemalloc.get_traced_memory()[1], self._child_peak)
+            self.memory_peak_delta = peak - self._start_memory
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        record = self.as_dict()
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        _records.append(record)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(record))
+        return False
+
+
+class _NullStage:
+    """Stand-in used while instrumentation is off; ignores everything."""
+
+    __slots__ = ()
+
+    active = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def is_enabled() -> bool:
+    """Check whether instrumentation is on."""
+    return _enabled
+
+
+def is_tracing_memory() -> bool:
+    """Check whether peak memory is being recorded per stage."""
+    return _enabled and _trace_memory
+
+
+def enable(memory: bool = False, log: bool = True) -> None:
+    """
+    Turn instrumentation on.
+
+    Args:
+        memory: Also record peak memory growth per stage (uses tracemalloc,
+                which slows allocation-heavy code noticeably). Single-threaded
+                use only; see the module docstring
+        log: Emit each stage as a JSON log record on stderr, unless logging
+             for 'unite_toolbox.instrumentation' is already configured
+    """
+    global _enabled, _trace_memory
+    if memory:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    elif _trace_memory:
+        import tracemalloc
+        tracemalloc.stop()
+    _trace_memory = memory
+    _enabled = True
+    if log and not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def disable() -> None:
+    """Turn instrumentation off (recorded stages are kept until reset())."""
+    global _enabled, _trace_memory
+    if _trace_memory:
+        import tracemalloc
+        tracemalloc.stop()
+    _enabled = False
+    _trace_memory = False
+
+
+def reset() -> None:
+    """Forget all recorded stages."""
+    _records.clear()
+
+
+def stage(name: str, rows: Optional[int] = None, bytes: Optional[int] = None):
+    """
+    Measure a block of code as a named stage.
+
+    Usage:
+        with stage('serialize', rows=len(df)) as record:
+            df.to_csv(path)
+            record.bytes = os.path.getsize(path)
+
+    Args:
+        name: Stage name
+        rows: Rows processed, if known up front
+        bytes: Bytes processed, if known up front
+
+    Returns:
+        Context manager yielding a StageRecord (or a no-op stand-in when off)
+    """
+    if not _enabled:
+        return _NULL_STAGE
+    return StageRecord(name, rows, bytes)
+
+
+def instrumented(name: str):
+    """
+    Decorator measuring every call of a function as a named stage.
+    Rows are taken from a DataFrame result, bytes from a str/bytes result.
+
+    Args:
+        name: Stage name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with StageRecord(name) as record:
+                result = func(*args, **kwargs)
+                if hasattr(result, 'shape'):
+                    record.rows = result.shape[0]
+                elif isinstance(result, (str, bytes)):
+                    record.bytes = len(result)
+            return result
+        return wrapper
+    return decorator
+
+
+def records() -> List[Dict]:
+    """Get the recorded stages, oldest first."""
+    return list(_records)
+
+
+def summary() -> Dict[str, Dict]:
+    """
+    Aggregate recorded stages by name.
+
+    Returns:
+        Dictionary mapping stage names to calls, total/max wall time, total CPU
+        time, total rows and bytes and the largest peak memory growth
+    """
+    totals = {}
+    for record in list(_records):
+        total = totals.setdefault(record['stage'], {
+            'calls': 0, 'wall_seconds': 0.0, 'max_wall_seconds': 0.0, 'cpu_seconds': 0.0,
+            'rows': 0, 'bytes': 0, 'max_memory_peak_delta': None, 'errors': 0
+        })
+        total['calls'] += 1
+        total['wall_seconds'] += record['wall_seconds']
+        total['max_wall_seconds'] = max(total['max_wall_seconds'], record['wall_seconds'])
+        total['cpu_seconds'] += record['cpu_seconds']
+        total['rows'] += record['rows'] or 0
+        total['bytes'] += record['bytes'] or 0
+        if record['memory_peak_delta'] is not None:
+            total['max_memory_peak_delta'] = max(total['max_memory_peak_delta'] or 0,
+                                                 record['memory_peak_delta'])
+        total['errors'] += 'error' in record
+    return totals
+
+
+def format_summary() -> str:
+    """Format the summary as a plain text table, slowest stages first."""
+    totals = sorted(summary().items(), key=lambda item: item[1]['wall_seconds'], reverse=True)
+    lines = [f"{'stage':<20}{'calls':>7}{'wall s':>10}{'cpu s':>10}{'rows':>12}"
+             f"{'MB':>10}{'peak MB':>10}"]
+    for name, total in totals:
+        peak = total['max_memory_peak_delta']
+        lines.append(
+            f"{name:<20}{total['calls']:>7}{total['wall_seconds']:>10.3f}{total['cpu_seconds']:>10.3f}"
+            f"{total['rows']:>12}{total['bytes'] / 1048576:>10.1f}"
+            f"{'-' if peak is None else format(peak / 1048576, '.1f'):>10}"
+        )
+    return '\n'.join(lines)
+
+
+def _print_summary_at_exit() -> None:
+    """Print the summary to stderr when the process exits, if anything was recorded."""
+    if _records:
+        print(format_summary(), file=sys.stderr)
+
+
+# Turn on from the environment so any entry point (GUI, web app, CLI) can be profiled
+_env_value = os.environ.get(ENV_VAR, '').strip().lower()
+if _env_value in ('1', 'true', 'yes', 'on', 'memory'):
+    enable(memory=(_env_value == 'memory'))
+    atexit.register(_print_summary_at_exit)
@@ -0,0 +1,373 @@
+"""
+Headless JotForm validation for the Unite Toolbox.
+Fetches forms concurrently over one shared keep-alive connection pool, checks
+every labelled input (read only, required, MembershipNumber unique name) and
+produces a single report, so all templates can be audited in one run.
+Pages go through an on-disk HTTP cache, so repeat runs revalidate or skip
+the download entirely.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple, Optional, Dict, List
+
+import lazy_imports
+
+# Lazy imports for faster startup
+_get_requests = lazy_imports.getter('requests')
+_get_bs4 = lazy_imports.getter('bs4')
+
+_session = None
+_session_lock = threading.Lock()
+_cache = None
+_cache_lock = threading.Lock()
+_parser = None
+
+# Tags the validator reads; JotForm's form header is a heading (h1-h6)
+FORM_TAGS = ('label', 'input', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+
+@lru_cache(maxsize=None)
+def _get_config():
+    """Cache config imports."""
+    from config import JOTFORM_TEMPLATES, JOTFORM_VALIDATOR_SETTINGS
+    return {
+        'JOTFORM_TEMPLATES': JOTFORM_TEMPLATES,
+        'JOTFORM_VALIDATOR_SETTINGS': JOTFORM_VALIDATOR_SETTINGS
+    }
+
+
+class FormReport(NamedTuple):
+    """Validation outcome for one form."""
+    name: str                 # Template name, or the URL when none is given
+    url: str
+    title: Optional[str]      # Text of the form header, if found
+    fields: List[Dict]        # One entry per label, in page order
+    error: Optional[str]      # Why the form could not be fetched, if it failed
+    seconds: float            # Time to fetch and validate
+
+    @property
+    def flagged(self) -> List[Dict]:
+        """Fields without an input, or whose MembershipNumber input is not read-only and required."""
+        return [field for field in self.fields if field['flagged']]
+
+
+def get_session():
+    """
+    Get the shared HTTP session, creating it on first use.
+    Connections are kept alive and pooled so repeated fetches to the same
+    host skip the TCP and TLS handshakes.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                requests = _get_requests()
+                pool_size = _get_config()['JOTFORM_VALIDATOR_SETTINGS']['max_workers']
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size,
+                                                        pool_maxsize=pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def get_cache():
+    """
+    Get the shared page cache, creating it on first use.
+
+    Returns:
+        HTTPCache, or None if caching is disabled in config
+    """
+    global _cache
+    if _cache is None:
+        settings = _get_config()['JOTFORM_VALIDATOR_SETTINGS']
+        if not settings.get('cache_dir'):
+            return None
+        with _cache_lock:
+            if _cache is None:
+                from http_cache import HTTPCache
+                _cache = HTTPCache(settings['cache_dir'], settings['cache_ttl_seconds'],
+                                   settings['cache_max_bytes'])
+    return _cache
+
+
+def fetch_form(url: str, timeout: Optional[float] = None, use_cache: bool = True) -> str:
+    """
+    Fetch the HTML of a form.
+
+    Args:
+        url: Form URL
+        timeout: Seconds to wait for the server (default from config)
+        use_cache: Serve from or revalidate against the on-disk cache
+
+    Returns:
+        Page HTML
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    if timeout is None:
+        timeout = _get_config()['JOTFORM_VALIDATOR_SETTINGS']['timeout_seconds']
+    cache = get_cache() if use_cache else None
+    if cache is not None:
+        return cache.get(get_session(), url, timeout).text
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def get_parser() -> str:
+    """
+    Get the BeautifulSoup tree builder set in config.
+    'auto' picks lxml (several times faster) when it is installed and
+    falls back to Python's html.parser.
+    """
+    global _parser
+    if _parser is None:
+        parser = _get_config()['JOTFORM_VALIDATOR_SETTINGS'].get('parser', 'auto')
+        if parser == 'auto':
+            import importlib.util
+            parser = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+        _parser = parser
+    return _parser
+
+
+def parse_form_html(html: str, parser: Optional[str] = None, strain: bool = True):
+    """
+    Parse a form page.
+
+    Args:
+        html: Page HTML
+        parser: Tree builder ('lxml', 'html.parser', ...; default from config)
+        strain: Build only FORM_TAGS (and their contents), skipping scripts,
+                styles and layout markup
+
+    Returns:
+        BeautifulSoup document
+    """
+    bs4 = _get_bs4()
+    parse_only = bs4.SoupStrainer(list(FORM_TAGS)) if strain else None
+    try:
+        return bs4.BeautifulSoup(html, parser or get_parser(), parse_only=parse_only)
+    except bs4.FeatureNotFound:
+        return bs4.BeautifulSoup(html, 'html.parser', parse_only=parse_only)
+
+
+def analyze_input(input_element):
+    """
+    Check an input element.
+
+    Args:
+        input_element: BeautifulSoup input tag
+
+    Returns:
+        List of (description, value) pairs; a value of "No" is a failed check
+    """
+    result = []
+    classes = input_element.get('class', [])
+
+    # Check various attributes and append the results
+    has_form_readonly = 'form-readonly' in classes
+    result.append(('Read Only: ', "Yes" if has_form_readonly else "No"))
+
+    has_validate_required = 'validate[required]' in classes
+    result.append(('Required: ', "Yes" if has_validate_required else "No"))
+
+    name_attribute = input_element.get('name', '')
+    has_membership_number = name_attribute.endswith("MembershipNumber")
+    result.append(('Unique Name is "MembershipNumber": ', "Yes" if has_membership_number else "No"))
+
+    # Include the actual name if it doesn't end with "MembershipNumber"
+    if not has_membership_number:
+        result.append(('Unique Name is: ', name_attribute))
+
+    return result
+
+
+def _membership_check_failed(checks) -> bool:
+    """Whether a MembershipNumber input is missing its read-only or required setting."""
+    results = dict(checks)
+    if results.get('Unique Name is "MembershipNumber": ') != "Yes":
+        # Ordinary fields are usually editable and optional; only the member key must be locked
+        return False
+    return results.get('Read Only: ') != "Yes" or results.get('Required: ') != "Yes"
+
+
+def normalize_label(text: str) -> str:
+    """Normalize label text for lookups (whitespace collapsed, required '*' removed)."""
+    return ' '.join(text.split()).rstrip('*').strip()
+
+
+class FormIndex(NamedTuple):
+    """A parsed form with every label resolved and validated once."""
+    title: Optional[str]             # Text of the form header, if found
+    fields: List[Dict]               # One entry per label, in page order
+    by_label: Dict[str, Dict]        # Normalized label text -> first field with that label
+    inputs_by_id: Dict[str, object]  # Input id -> BeautifulSoup input tag
+
+    def lookup(self, label_text: str) -> Optional[Dict]:
+        """Get the field for a label's text, or None if the form has no such label."""
+        return self.by_label.get(normalize_label(label_text))
+
+
+def index_form(html: str, parser: Optional[str] = None, strain: bool = True) -> FormIndex:
+    """
+    Parse a form page and validate every labelled input.
+    Inputs are indexed by id and each label is resolved and checked with
+    analyze_input here, so later lookups do no searching.
+
+    Args:
+        html: Page HTML
+        parser: Tree builder (default from config, see parse_form_html)
+        strain: Parse only the tags the validator reads
+
+    Returns:
+        FormIndex
+    """
+    soup = parse_form_html(html, parser, strain)
+    form_header = soup.find(class_="form-header")
+    title = form_header.get_text(strip=True) if form_header else None
+
+    inputs_by_id = {}
+    for input_element in soup.find_all('input', id=True):
+        inputs_by_id.setdefault(input_element['id'], input_element)
+
+    fields = []
+    by_label = {}
+    for label in soup.find_all('label'):
+        input_element = inputs_by_id.get(label.get('for')) if label.has_attr('for') else None
+        field = {'label': normalize_label(label.get_text(' ')),
+                 'input_id': label.get('for'), 'checks': [], 'problem': None}
+        if input_element is None:
+            field['problem'] = "Associated input not found."
+        else:
+            field['checks'] = analyze_input(input_element)
+        field['flagged'] = field['problem'] is not None or _membership_check_failed(field['checks'])
+        fields.append(field)
+        by_label.setdefault(field['label'], field)
+    return FormIndex(title, fields, by_label, inputs_by_id)
+
+
+def validate_html(html: str):
+    """
+    Validate every labelled input of a form page.
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        Tuple of (form title or None, list of field entries)
+    """
+    form = index_form(html)
+    return form.title, form.fields
+
+
+def validate_form(url: str, name: Optional[str] = None, timeout: Optional[float] = None,
+                  use_cache: bool = True) -> FormReport:
+    """
+    Fetch and validate one form. Failures are reported, not raised.
+
+    Args:
+        url: Form URL
+        name: Display name (default: the URL)
+        timeout: Request timeout in seconds
+        use_cache: Use the on-disk page cache
+
+    Returns:
+        FormReport
+    """
+    start = time.perf_counter()
+    try:
+        title, fields = validate_html(fetch_form(url, timeout, use_cache))
+        error = None
+    except Exception as e:
+        title, fields, error = None, [], str(e)
+    return FormReport(name or url, url, title, fields, error, round(time.perf_counter() - start, 3))
+
+
+def validate_forms(forms=None, max_workers: Optional[int] = None,
+                   timeout: Optional[float] = None, use_cache: bool = True) -> List[FormReport]:
+    """
+    Fetch and validate many forms concurrently.
+
+    Args:
+        forms: Dictionary of name -> URL, or a list of URLs (default: JOTFORM_TEMPLATES)
+        max_workers: Concurrent fetches (default from config)
+        timeout: Request timeout in seconds
+        use_cache: Use the on-disk page cache
+
+    Returns:
+        List of FormReport in input order
+    """
+    if forms is None:
+        forms = _get_config()['JOTFORM_TEMPLATES']
+    items = list(forms.items()) if isinstance(forms, dict) else [(url, url) for url in forms]
+    if not items:
+        return []
+    if max_workers is None:
+        max_workers = _get_config()['JOTFORM_VALIDATOR_SETTINGS']['max_workers']
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(lambda item: validate_form(item[1], item[0], timeout, use_cache),
+                                 items))
+
+
+def report_rows(reports: List[FormReport]) -> List[Dict]:
+    """
+    Flatten reports into one row per field (or per failed form) for CSV export.
+
+    Args:
+        reports: Validation reports
+
+    Returns:
+        List of dictionaries with the same keys
+    """
+    rows = []
+    for report in reports:
+        base = {'form': report.name, 'url': report.url, 'title': report.title or ''}
+        if report.error:
+            rows.append({**base, 'label': '', 'input_id': '', 'read_only': '', 'required': '',
+                         'unique_name': '', 'flagged': True, 'problem': report.error})
+            continue
+        for field in report.fields:
+            checks = dict(field['checks'])
+            rows.append({**base, 'label': field['label'], 'input_id': field['input_id'] or '',
+                         'read_only': checks.get('Read Only: ', ''),
+                         'required': checks.get('Required: ', ''),
+                         'unique_name': checks.get('Unique Name is: ', 'MembershipNumber' if checks else ''),
+                         'flagged': field['flagged'], 'problem': field['problem'] or ''})
+    return rows
+
+
+def format_report(reports: List[FormReport], flagged_only: bool = True) -> str:
+    """
+    Format reports as plain text.
+
+    Args:
+        reports: Validation reports
+        flagged_only: List only flagged fields (see FormReport.flagged)
+
+    Returns:
+        Report text
+    """
+    lines = []
+    for report in reports:
+        header = f"{report.name} ({report.url})"
+        if report.error:
+            lines.append(f"{header}\n  ERROR: {report.error}")
+            continue
+        lines.append(f"{header}\n  {report.title or 'Form Title Not Found'}: "
+                     f"{len(report.fields)} fields, {len(report.flagged)} flagged, {report.seconds:.2f}s")
+        for field in (report.flagged if flagged_only else report.fields):
+            if field['problem']:
+                detail = field['problem']
+            else:
+                detail = ', '.join(f"{text.strip()} {value}" for text, value in field['checks'])
+            lines.append(f"  {'!' if field['flagged'] else ' '} {field['label']}: {detail}")
+    failed = sum(1 for report in reports if report.error)
+    flagged = sum(len(report.flagged) for report in reports)
+    lines.append(f"\n{len(reports)} forms checked, {failed} failed to load, {flagged} fields flagged")
+    return '\n'.join(lines)
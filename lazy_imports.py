@@ -0,0 +1,165 @@
+"""
+Shared lazy import registry for the Unite Toolbox.
+Heavy modules (pandas, premailer, requests, bs4, ...) are imported on first
+use through this one registry instead of per-module globals. Each import is
+guarded by its own lock, so concurrent first callers (e.g. requests on
+Flask's threaded server) import once; modules can be pre-warmed on a
+background thread; and the duration of every import is recorded.
+"""
+
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+
+class _Entry:
+    """Registry state for one module."""
+
+    __slots__ = ('name', 'module', 'lock', 'seconds', 'thread', 'error')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.module = None
+        self.lock = threading.Lock()
+        self.seconds = None
+        self.thread = None
+        self.error = None
+
+
+_entries: Dict[str, _Entry] = {}
+_entries_lock = threading.Lock()
+
+
+def _entry(name: str) -> _Entry:
+    """Get (or create) the registry entry for a module name."""
+    entry = _entries.get(name)
+    if entry is None:
+        with _entries_lock:
+            entry = _entries.setdefault(name, _Entry(name))
+    return entry
+
+
+def load(name: str):
+    """
+    Import a module on first use and return it.
+    After the first import this is a dictionary lookup with no locking.
+
+    Args:
+        name: Module name, e.g. 'pandas'
+
+    Returns:
+        The module
+
+    Raises:
+        ImportError: If the module is not installed (retried on the next call)
+    """
+    entry = _entry(name)
+    module = entry.module
+    if module is not None:
+        return module
+    with entry.lock:
+        if entry.module is None:
+            already_imported = name in sys.modules
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(name)
+            except ImportError as e:
+                entry.error = str(e)
+                raise
+            # Modules imported elsewhere first cost nothing here; record that as zero
+            entry.seconds = 0.0 if already_imported else round(time.perf_counter() - start, 6)
+            entry.thread = threading.current_thread().name
+            entry.error = None
+            entry.module = module
+    return entry.module
+
+
+def getter(name: str) -> Callable[[], object]:
+    """
+    Get a function returning a module, imported on first call.
+
+    Usage:
+        _get_pandas = lazy_imports.getter('pandas')
+        pd = _get_pandas()
+    """
+    def get_module():
+        module = _entry(name).module
+        return module if module is not None else load(name)
+    get_module.__name__ = f"get_{name.replace('.', '_')}"
+    get_module.__doc__ = f"Lazy load {name}."
+    return get_module
+
+
+def is_available(name: str) -> bool:
+    """Check whether a module can be imported (importing it if needed)."""
+    try:
+        load(name)
+    except ImportError:
+        return False
+    return True
+
+
+def is_loaded(name: str) -> bool:
+    """Check whether a module has been loaded through the registry."""
+    entry = _entries.get(name)
+    return entry is not None and entry.module is not None
+
+
+def prewarm(names: Iterable[str], background: bool = True,
+            delay_seconds: float = 0) -> Optional[threading.Thread]:
+    """
+    Import modules ahead of first use. Missing optional modules are skipped.
+
+    Args:
+        names: Module names, imported in order
+        background: Import on a daemon thread instead of blocking
+        delay_seconds: Wait this long before starting (background only)
+
+    Returns:
+        The pre-warm thread, or None when run in the foreground
+    """
+    names = list(names)
+
+    def run():
+        if delay_seconds:
+            time.sleep(delay_seconds)
+        for name in names:
+            try:
+                load(name)
+            except ImportError:
+                pass
+
+    if not background:
+        run()
+        return None
+    thread = threading.Thread(target=run, name='lazy-imports-prewarm', daemon=True)
+    thread.start()
+    return thread
+
+
+def import_times() -> Dict[str, Dict]:
+    """
+    Get the recorded imports.
+
+    Returns:
+        Dictionary mapping module names to the seconds the import took, the
+        thread that did it and any import error
+    """
+    with _entries_lock:
+        entries = list(_entries.values())
+    return {entry.name: {'seconds': entry.seconds, 'thread': entry.thread, 'error': entry.error}
+            for entry in entries if entry.module is not None or entry.error}
+
+
+def format_import_times() -> str:
+    """Format the recorded imports as a plain text table, slowest first."""
+    times = sorted(import_times().items(), key=lambda item: item[1]['seconds'] or 0, reverse=True)
+    lines = [f"{'module':<20}{'import s':>10}  thread"]
+    for name, record in times:
+        if record['error']:
+            lines.append(f"{name:<20}{'-':>10}  not installed")
+        else:
+            lines.append(f"{name:<20}{record['seconds']:>10.3f}  {record['thread']}")
+    return '\n'.join(lines)
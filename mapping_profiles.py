@@ -0,0 +1,97 @@
+"""
+Saved column mapping profiles for CSV to UWP conversion.
+Profiles are keyed by a fingerprint of the file's header row, so an export
+with a known layout can be converted without visiting the mapping page.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Optional, Dict
+
+from column_mapper import header_signature
+
+
+class MappingProfileStore:
+    """Stores column mappings in a JSON file keyed by header fingerprint."""
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the store.
+
+        Args:
+            file_path: JSON file holding the profiles (created on first save)
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._profiles = None
+        self._loaded_mtime = None
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load profiles, re-reading the file only if it changed. Caller holds the lock.
+        An unreadable file counts as empty and is replaced on the next save."""
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except OSError:
+            mtime = None
+        if self._profiles is None or mtime != self._loaded_mtime:
+            self._profiles = {}
+            if mtime is not None:
+                try:
+                    with open(self.file_path, 'r', encoding='utf-8') as file:
+                        profiles = json.load(file)
+                except ValueError:
+                    # Corrupt or partially written file: treat the store as empty
+                    profiles = {}
+                if isinstance(profiles, dict):
+                    self._profiles = profiles
+            self._loaded_mtime = mtime
+        return self._profiles
+
+    def _write(self) -> None:
+        """Write profiles atomically. Caller holds the lock."""
+        directory = os.path.dirname(os.path.abspath(self.file_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = self.file_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self._profiles, file, indent=2)
+        os.replace(temp_path, self.file_path)
+        self._loaded_mtime = os.path.getmtime(self.file_path)
+
+    def get(self, columns) -> Optional[Dict[str, str]]:
+        """
+        Get the saved mapping for a header row.
+
+        Args:
+            columns: Column names of the file
+
+        Returns:
+            Mapping from source column names to UWP column names, or None
+        """
+        with self._lock:
+            profile = self._load().get(header_signature(columns))
+        return dict(profile['mapping']) if profile else None
+
+    def save(self, columns, column_mapping: Dict[str, str]) -> None:
+        """
+        Save the mapping used for a header row, replacing any earlier one.
+
+        Args:
+            columns: Column names of the file
+            column_mapping: Mapping from source column names to UWP column names
+        """
+        with self._lock:
+            profiles = self._load()
+            profiles[header_signature(columns)] = {
+                'columns': [str(column) for column in columns],
+                'mapping': column_mapping,
+                'updated_at': time.time()
+            }
+            self._write()
+
+    def delete(self, columns) -> None:
+        """Delete the saved mapping for a header row, if any."""
+        with self._lock:
+            if self._load().pop(header_signature(columns), None) is not None:
+                self._write()
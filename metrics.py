@@ -0,0 +1,264 @@
+"""
+In-process metrics for the Unite Toolbox web app.
+Collects request counts, latency and size histograms, rows processed and
+in-flight requests with lock-protected counters, and serves them at /metrics
+in the Prometheus text exposition format. No external service or client
+library is needed.
+"""
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Histogram buckets (upper bounds); +Inf is always added
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760, 52428800, 104857600, 524288000)
+
+PREFIX = "unite_toolbox_"
+
+
+def _format_value(value) -> str:
+    """Format a sample value, keeping integers free of a trailing '.0'."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = '') -> str:
+    """Format a label set such as {endpoint="csv2uwp",method="POST"}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Metric:
+    """Base class for a named metric with optional labels."""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        """
+        Args:
+            name: Metric name (the 'unite_toolbox_' prefix is added)
+            documentation: Help text
+            labelnames: Label names, if any
+            callback: Optional function read at scrape time instead of stored values
+        """
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self) -> str:
+        """Render this metric in the Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._sample_lines())
+        return '\n'.join(lines)
+
+    def _sample_lines(self):
+        if self.callback is not None:
+            yield f"{self.name} {_format_value(self.callback())}"
+            return
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that goes up and down."""
+
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets, with a sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, the +Inf bucket last, then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][position] += 1
+            state[1] += value
+
+    def _sample_lines(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(float(bound))
+                labels = _format_labels(self.labelnames, key, 'le="%s"' % le)
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+class MetricsRegistry:
+    """The set of metrics exported by one app."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+
+class AppMetrics:
+    """Request, processing and storage metrics for the Flask app."""
+
+    def __init__(self, temp_storage=None):
+        """
+        Create the metrics.
+
+        Args:
+            temp_storage: Optional TempStorageManager whose disk usage is exported
+        """
+        self.registry = MetricsRegistry()
+        register = self.registry.register
+        self.requests = register(Counter(
+            'http_requests_total', "HTTP requests handled.", ('endpoint', 'method', 'status')))
+        self.latency = register(Histogram(
+            'http_request_duration_seconds', "Time to produce a response (streamed bodies excluded).",
+            ('endpoint',), LATENCY_BUCKETS))
+        self.upload_size = register(Histogram(
+            'http_request_size_bytes', "Size of request bodies (uploads).", ('endpoint',), SIZE_BUCKETS))
+        self.input_bytes = register(Counter(
+            'http_request_bytes_total', "Bytes received in request bodies.", ('endpoint',)))
+        self.output_bytes = register(Counter(
+            'http_response_bytes_total', "Bytes sent in response bodies.", ('endpoint',)))
+        self.rows = register(Counter(
+            'rows_processed_total', "Data rows loaded for processing.", ('endpoint',)))
+        self.in_flight = register(Gauge(
+            'requests_in_flight', "Requests currently being handled."))
+        if temp_storage is not None:
+            stats = temp_storage.stats
+            register(Gauge('temp_storage_bytes', "Bytes of uploads held on disk.",
+                           callback=lambda: stats()['bytes_held']))
+            register(Gauge('temp_storage_files', "Uploads held on disk.",
+                           callback=lambda: stats()['files_held']))
+            register(Gauge('temp_storage_max_bytes', "Disk quota for uploads.",
+                           callback=lambda: stats()['max_bytes']))
+            register(Counter('temp_storage_evicted_total', "Uploads evicted to stay within the quota.",
+                             callback=lambda: stats()['evicted_total']))
+            register(Counter('temp_storage_reaped_total', "Uploads removed after their TTL expired.",
+                             callback=lambda: stats()['reaped_total']))
+
+    def init_app(self, app, path: str = '/metrics') -> None:
+        """
+        Install request hooks and the metrics endpoint on a Flask app.
+
+        Args:
+            app: Flask application
+            path: URL of the metrics endpoint
+        """
+        from flask import Response, g, request
+
+        @app.before_request
+        def _start_request():
+            g._metrics_start = time.perf_counter()
+            self.in_flight.inc()
+            g._metrics_in_flight = True
+            endpoint = request.endpoint or 'unmatched'
+            if request.content_length:
+                self.input_bytes.inc(request.content_length, endpoint=endpoint)
+                self.upload_size.observe(request.content_length, endpoint=endpoint)
+
+        @app.after_request
+        def _finish_request(response):
+            endpoint = request.endpoint or 'unmatched'
+            start = g.pop('_metrics_start', None)
+            if start is not None:
+                self.latency.observe(time.perf_counter() - start, endpoint=endpoint)
+            self.requests.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+            if response.content_length is not None:
+                self.output_bytes.inc(response.content_length, endpoint=endpoint)
+            elif response.is_streamed and not response.direct_passthrough:
+                response.response = self._count_bytes(response.response, endpoint)
+            # Streamed bodies are still being sent after teardown; the request
+            # stays in flight until the server closes the response
+            if g.pop('_metrics_in_flight', False):
+                response.call_on_close(self.in_flight.dec)
+            return response
+
+        @app.teardown_request
+        def _end_request(exception=None):
+            # Only reached with the flag set when no response was produced
+            if g.pop('_metrics_in_flight', False):
+                self.in_flight.dec()
+
+        def metrics_endpoint():
+            return Response(self.registry.render(), mimetype='text/plain; version=0.0.4')
+
+        app.add_url_rule(path, 'metrics', metrics_endpoint)
+
+    def _count_bytes(self, body, endpoint: str):
+        """Pass a streamed body through, counting the bytes sent."""
+        sent = 0
+        try:
+            for chunk in body:
+                sent += len(chunk)
+                yield chunk
+        finally:
+            self.output_bytes.inc(sent, endpoint=endpoint)
+            close = getattr(body, 'close', None)
+            if close is not None:
+                close()
+
+    def record_rows(self, rows: int) -> None:
+        """Count data rows loaded by the current request's tool."""
+        from flask import request
+        self.rows.inc(rows, endpoint=request.endpoint or 'unmatched')
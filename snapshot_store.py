@@ -0,0 +1,320 @@
+"""
+SQLite snapshot store for the Unite Toolbox.
+A membership export is ingested once into an indexed SQLite table and the
+toolbox operations then run as queries against it, so repeat operations on
+the same week's data skip re-reading and re-parsing the file.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Optional, Dict, List
+
+import lazy_imports
+from config import SNAPSHOT_STORE_PATH
+from utils import DataProcessor
+
+_get_pandas = lazy_imports.getter('pandas')
+
+# Columns indexed on ingest (when present in the file)
+INDEXED_COLUMNS = ["Member Number", "Workplace Name", "Employer"]
+# Seconds to wait for another process's write (e.g. a concurrent ingest) to finish
+LOCK_TIMEOUT_SECONDS = 60
+
+
+def _quote(identifier: str) -> str:
+    """Quote a column or table name for use in SQL."""
+    return '"' + str(identifier).replace('"', '""') + '"'
+
+
+class SnapshotStore:
+    """Stores ingested data files in SQLite and runs toolbox operations as queries."""
+
+    def __init__(self, db_path: str = None):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path to the SQLite database file ('~' is expanded).
+                     If None, uses SNAPSHOT_STORE_PATH from config.
+        """
+        self.db_path = os.path.expanduser(db_path or SNAPSHOT_STORE_PATH)
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "id TEXT PRIMARY KEY, source_name TEXT, row_count INTEGER, "
+                "columns TEXT, created_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection (one per operation keeps the store thread-safe)."""
+        return sqlite3.connect(self.db_path, timeout=LOCK_TIMEOUT_SECONDS)
+
+    @staticmethod
+    def file_fingerprint(file_path: str) -> str:
+        """
+        Hash a file's contents so the same export is only ingested once.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex digest identifying the file contents
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _table_name(snapshot_id: str) -> str:
+        """Get the quoted table name holding a snapshot's rows."""
+        return _quote(f"snapshot_{snapshot_id}")
+
+    def ingest(self, file_path: str) -> str:
+        """
+        Ingest a data file, reusing an existing snapshot of identical contents.
+        Rows are written to a staging table that is published in a single
+        transaction, so concurrent ingests of the same file are safe.
+
+        Args:
+            file_path: Path to a file supported by DataProcessor.load_data_file
+
+        Returns:
+            Snapshot id
+        """
+        snapshot_id = self.file_fingerprint(file_path)[:16]
+        if self.get_snapshot(snapshot_id) is not None:
+            return snapshot_id
+
+        df = DataProcessor.load_data_file(file_path)
+        table = self._table_name(snapshot_id)
+        staging_name = f"staging_{snapshot_id}_{uuid.uuid4().hex[:8]}"
+        staging = _quote(staging_name)
+        with closing(self._connect()) as conn:
+            df.to_sql(staging_name, conn, index=False, chunksize=50000)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                exists = conn.execute("SELECT 1 FROM snapshots WHERE id = ?",
+                                      (snapshot_id,)).fetchone()
+                if exists:
+                    # Another process ingested the same contents meanwhile
+                    conn.execute(f"DROP TABLE {staging}")
+                else:
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+                    for column in INDEXED_COLUMNS:
+                        if column in df.columns:
+                            self._create_index(conn, snapshot_id, column)
+                    conn.execute(
+                        "INSERT INTO snapshots (id, source_name, row_count, columns, created_at) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (snapshot_id, os.path.basename(file_path), len(df),
+                         json.dumps([str(column) for column in df.columns]), time.time())
+                    )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                conn.execute(f"DROP TABLE IF EXISTS {staging}")
+                conn.commit()
+                raise
+        return snapshot_id
+
+    def _create_index(self, conn: sqlite3.Connection, snapshot_id: str, column: str) -> None:
+        """Create an index on a snapshot column if it does not exist yet."""
+        index_name = _quote(f"idx_{snapshot_id}_{hashlib.md5(column.encode()).hexdigest()[:8]}")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} "
+            f"ON {self._table_name(snapshot_id)} ({_quote(column)})"
+        )
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[Dict]:
+        """
+        Get a snapshot's metadata.
+
+        Returns:
+            Dictionary with id, source_name, row_count, columns and created_at,
+            or None if the snapshot does not exist
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, source_name, row_count, columns, created_at "
+                "FROM snapshots WHERE id = ?", (snapshot_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'id': row[0],
+            'source_name': row[1],
+            'row_count': row[2],
+            'columns': json.loads(row[3]),
+            'created_at': row[4]
+        }
+
+    def list_snapshots(self) -> List[Dict]:
+        """Get metadata for all snapshots, newest first."""
+        with closing(self._connect()) as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM snapshots ORDER BY created_at DESC")]
+        return [self.get_snapshot(snapshot_id) for snapshot_id in ids]
+
+    def delete_snapshot(self, snapshot_id: str) -> None:
+        """Delete a snapshot and its rows."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"DROP TABLE IF EXISTS {self._table_name(snapshot_id)}")
+            conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+
+    def _require_snapshot(self, snapshot_id: str) -> Dict:
+        """Get snapshot metadata or raise ValueError if it does not exist."""
+        snapshot = self.get_snapshot(snapshot_id)
+        if snapshot is None:
+            raise ValueError(f"Snapshot '{snapshot_id}' not found")
+        return snapshot
+
+    def _query(self, sql: str, params: tuple = ()) -> 'pd.DataFrame':
+        """Run a query and return the result as a DataFrame."""
+        pd = _get_pandas()
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def load(self, snapshot_id: str, columns: List[str] = None) -> 'pd.DataFrame':
+        """
+        Load a snapshot back into a DataFrame.
+
+        Args:
+            snapshot_id: Snapshot id
+            columns: Optional list of columns to load
+
+        Returns:
+            DataFrame with the snapshot rows in their original order
+        """
+        self._require_snapshot(snapshot_id)
+        select = ', '.join(_quote(column) for column in columns) if columns else '*'
+        return self._query(
+            f"SELECT {select} FROM {self._table_name(snapshot_id)} ORDER BY rowid")
+
+    def convert_csv_to_uwp(self, snapshot_id: str,
+                           column_mapping: Dict[str, str] = None) -> 'pd.DataFrame':
+        """
+        Convert a snapshot to UWP format (see DataProcessor.convert_csv_to_uwp).
+
+        Args:
+            snapshot_id: Snapshot id
+            column_mapping: Optional custom mapping from source column names to UWP
+                            column names. If None, uses default mapping from config.
+
+        Returns:
+            DataFrame with UWP format
+        """
+        snapshot = self._require_snapshot(snapshot_id)
+        plan = DataProcessor.compile_mapping_plan(snapshot['columns'], column_mapping)
+        select = ', '.join(f"{_quote(source)} AS {_quote(target)}"
+                           for source, target in zip(plan.source_columns, plan.output_columns))
+        return self._query(
+            f"SELECT {select} FROM {self._table_name(snapshot_id)} ORDER BY rowid")
+
+    def create_sms_list(self, snapshot_id: str) -> 'pd.DataFrame':
+        """
+        Create an SMS list from a snapshot (see DataProcessor.create_sms_list).
+
+        Args:
+            snapshot_id: Snapshot id
+
+        Returns:
+            DataFrame containing only SMS-eligible records
+        """
+        snapshot = self._require_snapshot(snapshot_id)
+        # Column names are matched case-insensitively, as in DataProcessor
+        lower_columns = {}
+        for column in snapshot['columns']:
+            lower_columns.setdefault(column.lower(), column)
+        needed = ["member number", "first name", "surname", "allow sms",
+                  "mobile phone", "home phone"]
+        missing_columns = [column for column in needed if column not in lower_columns]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+        col = {name: _quote(lower_columns[name]) for name in needed}
+
+        # Home phone numbers starting with "07" or "7" replace the mobile phone
+        mobile = (
+            f"CASE WHEN {col['home phone']} IS NOT NULL AND "
+            f"(CAST({col['home phone']} AS TEXT) LIKE '07%' OR "
+            f"CAST({col['home phone']} AS TEXT) LIKE '7%') "
+            f"THEN {col['home phone']} ELSE {col['mobile phone']} END"
+        )
+        return self._query(
+            f"SELECT {col['member number']} AS \"member number\", "
+            f"{col['first name']} AS \"first name\", "
+            f"{col['surname']} AS \"surname\", "
+            f"{col['allow sms']} AS \"allow sms\", "
+            f"{mobile} AS \"mobile phone\" "
+            f"FROM {self._table_name(snapshot_id)} "
+            f"WHERE {col['allow sms']} = 'Y' AND {mobile} IS NOT NULL ORDER BY rowid"
+        )
+
+    def divide_by_workplace(self, snapshot_id: str,
+                            workplace_column: str = "Workplace Name") -> Dict[str, 'pd.DataFrame']:
+        """
+        Divide a snapshot by workplace (see DataProcessor.divide_by_workplace).
+
+        Args:
+            snapshot_id: Snapshot id
+            workplace_column: Name of the column containing workplace information
+
+        Returns:
+            Dictionary mapping workplace names to their respective DataFrames
+        """
+        snapshot = self._require_snapshot(snapshot_id)
+        if workplace_column not in snapshot['columns']:
+            raise ValueError(f"Workplace column '{workplace_column}' not found in snapshot")
+
+        table = self._table_name(snapshot_id)
+        column = _quote(workplace_column)
+        with closing(self._connect()) as conn, conn:
+            self._create_index(conn, snapshot_id, workplace_column)
+            workplaces = [row[0] for row in conn.execute(
+                f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL "
+                f"GROUP BY {column} ORDER BY MIN(rowid)")]
+
+        return {
+            workplace: self._query(
+                f"SELECT * FROM {table} WHERE {column} = ? ORDER BY rowid", (workplace,))
+            for workplace in workplaces
+        }
+
+    def compare_dataframes(self, snapshot_id: str, other_snapshot_id: str,
+                           key_column: str) -> 'pd.DataFrame':
+        """
+        Find records in one snapshot whose key does not exist in another.
+        Unlike DataProcessor.compare_dataframes, the result keeps only the
+        first snapshot's columns (no merge suffixes or empty columns).
+
+        Args:
+            snapshot_id: First snapshot id
+            other_snapshot_id: Second snapshot id
+            key_column: Column to use for comparison
+
+        Returns:
+            DataFrame containing records from the first snapshot missing from the second
+        """
+        snapshot = self._require_snapshot(snapshot_id)
+        other_snapshot = self._require_snapshot(other_snapshot_id)
+        if key_column not in snapshot['columns'] or key_column not in other_snapshot['columns']:
+            raise ValueError(f"Key column '{key_column}' not found in one or both snapshots")
+
+        with closing(self._connect()) as conn, conn:
+            self._create_index(conn, other_snapshot_id, key_column)
+        key = _quote(key_column)
+        return self._query(
+            f"SELECT a.* FROM {self._table_name(snapshot_id)} AS a "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {self._table_name(other_snapshot_id)} AS b "
+            f"WHERE b.{key} = a.{key}) ORDER BY a.rowid"
+        )
@@ -0,0 +1,210 @@
+"""
+Temporary upload storage for the Unite Toolbox Flask application.
+Stores uploaded files under unique ids and keeps the upload folder bounded
+with TTL-based background reaping and LRU eviction against a disk quota.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Dict
+
+
+class TempStorageManager:
+    """Manages the lifecycle of temporary upload files."""
+
+    def __init__(self, directory: str, ttl_seconds: int = 3600,
+                 max_bytes: int = 500 * 1024 * 1024,
+                 reap_interval_seconds: int = 60):
+        """
+        Initialize the storage manager.
+
+        Args:
+            directory: Folder where temporary files are stored
+            ttl_seconds: Seconds since last access after which a file is reaped
+            max_bytes: Disk quota for all temporary files combined
+            reap_interval_seconds: How often the background reaper runs
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.reap_interval_seconds = reap_interval_seconds
+
+        # file_id -> entry dict, ordered from least to most recently used
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._bytes_held = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._reaper_thread = None
+        self._counters = {'stored': 0, 'reaped': 0, 'evicted': 0, 'removed': 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._adopt_existing_files()
+
+    @staticmethod
+    def _get_suffix(filename: str) -> str:
+        """Return the full extension of a filename (e.g. '.csv' or '.csv.gz')."""
+        base = os.path.basename(filename)
+        if '.' not in base.lstrip('.'):
+            return ''
+        return '.' + base.lstrip('.').split('.', 1)[1].lower()
+
+    def _adopt_existing_files(self) -> None:
+        """
+        Track files left behind by a previous run so they are reaped too.
+        Uses the file modification time as the last access time.
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            self._entries[name] = {
+                'path': path,
+                'size': stat.st_size,
+                'original_name': name,
+                'created': stat.st_mtime,
+                'last_access': stat.st_mtime
+            }
+            self._bytes_held += stat.st_size
+        # Oldest first so LRU eviction picks leftovers before new uploads
+        self._entries = OrderedDict(
+            sorted(self._entries.items(), key=lambda item: item[1]['last_access'])
+        )
+
+    def save_upload(self, file, filename: str) -> str:
+        """
+        Save an uploaded file under a unique id.
+
+        Args:
+            file: Uploaded file object with a save() method (werkzeug FileStorage)
+            filename: Original (sanitised) filename, used to keep the extension
+
+        Returns:
+            Unique id to retrieve the file with
+
+        Raises:
+            ValueError: If the file alone exceeds the storage quota
+        """
+        self._ensure_reaper()
+        file_id = uuid.uuid4().hex
+        path = os.path.join(self.directory, file_id + self._get_suffix(filename))
+        file.save(path)
+        size = os.path.getsize(path)
+
+        if size > self.max_bytes:
+            os.remove(path)
+            raise ValueError("Uploaded file exceeds the temporary storage quota.")
+
+        now = time.time()
+        with self._lock:
+            self._entries[file_id] = {
+                'path': path,
+                'size': size,
+                'original_name': filename,
+                'created': now,
+                'last_access': now
+            }
+            self._bytes_held += size
+            self._counters['stored'] += 1
+            self._evict_to_quota(keep=file_id)
+        return file_id
+
+    def get_path(self, file_id: str) -> Optional[str]:
+        """
+        Get the path of a stored file and mark it as recently used.
+
+        Args:
+            file_id: Id returned by save_upload
+
+        Returns:
+            File path, or None if the file has expired or been evicted
+        """
+        with self._lock:
+            entry = self._entries.get(file_id)
+            if entry is None or not os.path.exists(entry['path']):
+                return None
+            entry['last_access'] = time.time()
+            self._entries.move_to_end(file_id)
+            return entry['path']
+
+    def remove(self, file_id: str) -> None:
+        """Delete a stored file once it is no longer needed."""
+        with self._lock:
+            if self._drop_entry(file_id):
+                self._counters['removed'] += 1
+
+    def reap_expired(self) -> int:
+        """
+        Delete files that have not been accessed within the TTL.
+
+        Returns:
+            Number of files reaped
+        """
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [file_id for file_id, entry in self._entries.items()
+                       if entry['last_access'] < cutoff]
+            for file_id in expired:
+                self._drop_entry(file_id)
+            self._counters['reaped'] += len(expired)
+        return len(expired)
+
+    def _evict_to_quota(self, keep: str) -> None:
+        """Evict least recently used files until under quota. Caller holds the lock."""
+        for file_id in list(self._entries.keys()):
+            if self._bytes_held <= self.max_bytes:
+                break
+            if file_id == keep:
+                continue
+            self._drop_entry(file_id)
+            self._counters['evicted'] += 1
+
+    def _drop_entry(self, file_id: str) -> bool:
+        """Forget a file and delete it from disk. Caller holds the lock."""
+        entry = self._entries.pop(file_id, None)
+        if entry is None:
+            return False
+        self._bytes_held -= entry['size']
+        try:
+            os.remove(entry['path'])
+        except FileNotFoundError:
+            pass
+        return True
+
+    def _ensure_reaper(self) -> None:
+        """Start the background reaper thread if it is not running yet."""
+        if self._reaper_thread is not None and self._reaper_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._reaper_thread = threading.Thread(target=self._reap_loop, daemon=True)
+        self._reaper_thread.start()
+
+    def _reap_loop(self) -> None:
+        """Background loop that periodically reaps expired files."""
+        while not self._stop_event.wait(self.reap_interval_seconds):
+            self.reap_expired()
+
+    def stop(self) -> None:
+        """Stop the background reaper thread."""
+        self._stop_event.set()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get storage metrics.
+
+        Returns:
+            Dictionary with bytes and files held, quota and lifetime counters
+        """
+        with self._lock:
+            return {
+                'bytes_held': self._bytes_held,
+                'files_held': len(self._entries),
+                'max_bytes': self.max_bytes,
+                'stored_total': self._counters['stored'],
+                'reaped_total': self._counters['reaped'],
+                'evicted_total': self._counters['evicted'],
+                'removed_total': self._counters['removed']
+            }
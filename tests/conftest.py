@@ -0,0 +1,24 @@
+"""Shared pytest setup: top-level modules importable from tests/, member export fixture."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_export():
+    """Build a member export DataFrame with every column the UWP conversion needs."""
+    pd = pytest.importorskip('pandas')
+    from config import CSV_COLUMN_MAPPING
+
+    def build(**columns):
+        rows = len(next(iter(columns.values())))
+        data = {column: [f"{column} {row}" for row in range(rows)]
+                for column in CSV_COLUMN_MAPPING['columns_to_keep']}
+        data.update(columns)
+        return pd.DataFrame(data)
+
+    return build
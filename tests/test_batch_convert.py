@@ -0,0 +1,47 @@
+"""
+Tests for batch_convert: cross-file deduplication of members.
+"""
+
+import io
+import zipfile
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import batch_convert  # noqa: E402
+
+
+@pytest.fixture
+def branch_files(tmp_path, make_export):
+    make_export(**{'First Name': ['Ann', 'Bob', 'Cat'],
+                   'Member Number': [1001, None, None]}).to_csv(tmp_path / 'a.csv', index=False)
+    make_export(**{'First Name': ['Ann', 'Dan', 'Eve', 'Eve'],
+                   'Member Number': [1001, None, 1002, 1002]}).to_csv(tmp_path / 'b.csv', index=False)
+    return tmp_path
+
+
+def test_blank_membership_numbers_are_not_deduplicated(branch_files):
+    df_all, result = batch_convert.convert_batch_frame(str(branch_files), workers=1)
+
+    assert df_all['FirstName'].tolist() == ['Ann', 'Bob', 'Cat', 'Dan', 'Eve']
+    assert df_all['MembershipNumber'].isna().sum() == 3
+    assert result.duplicates_dropped == 2
+    assert [entry['duplicates_dropped'] for entry in result.report] == [0, 2]
+    assert [entry['rows_out'] for entry in result.report] == [3, 2]
+
+
+def test_deduplicate_off_keeps_every_row(branch_files):
+    df_all, result = batch_convert.convert_batch_frame(str(branch_files), workers=1, deduplicate=False)
+
+    assert len(df_all) == 7
+    assert result.duplicates_dropped == 0
+
+
+def test_zip_output_matches_combined_output(branch_files):
+    body = b''.join(batch_convert.iter_batch_zip_bytes(str(branch_files), workers=1))
+
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.namelist() == ['a_uwp.csv', 'b_uwp.csv', 'batch_report.csv']
+        second = pd.read_csv(archive.open('b_uwp.csv'))
+    assert second['FirstName'].tolist() == ['Dan', 'Eve']
@@ -0,0 +1,231 @@
+"""
+Tests for http_cache.HTTPCache against a local stand-in HTTP server:
+conditional revalidation (ETag and Last-Modified), TTL expiry, no-store,
+quota eviction and recovery from corrupt cache files.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip('requests')
+
+import http_cache  # noqa: E402
+from http_cache import HTTPCache  # noqa: E402
+
+
+class StandInServer:
+    """Serves configurable pages and records the request headers it receives."""
+
+    def __init__(self):
+        self.pages = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                page = server.pages.get(self.path)
+                if page is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                etag, last_modified = page.get('etag'), page.get('last_modified')
+                if ((etag and self.headers.get('If-None-Match') == etag) or
+                        (last_modified and self.headers.get('If-Modified-Since') == last_modified)):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = page['body'].encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                if last_modified:
+                    self.send_header('Last-Modified', last_modified)
+                if page.get('cache_control'):
+                    self.send_header('Cache-Control', page['cache_control'])
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}{path}"
+
+    def requests_for(self, path: str):
+        return [headers for request_path, headers in self.requests if request_path == path]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer()
+    yield stand_in
+    stand_in.close()
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as http_session:
+        yield http_session
+
+
+def test_fetch_then_fresh_hit(server, session, tmp_path):
+    server.pages['/form'] = {'body': '<h1>Form</h1>', 'etag': '"v1"'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300)
+
+    first = cache.get(session, server.url('/form'))
+    second = cache.get(session, server.url('/form'))
+
+    assert (first.status, first.text) == ('fetched', '<h1>Form</h1>')
+    assert (second.status, second.text) == ('fresh', '<h1>Form</h1>')
+    assert len(server.requests_for('/form')) == 1
+
+
+def test_fresh_hit_after_restart(server, session, tmp_path):
+    server.pages['/form'] = {'body': 'cached'}
+    HTTPCache(str(tmp_path), ttl_seconds=300).get(session, server.url('/form'))
+
+    restarted = HTTPCache(str(tmp_path), ttl_seconds=300)
+    response = restarted.get(session, server.url('/form'))
+
+    assert (response.status, response.text) == ('fresh', 'cached')
+    assert restarted.stats()['entries'] == 1
+    assert len(server.requests_for('/form')) == 1
+
+
+def test_etag_revalidation(server, session, tmp_path):
+    server.pages['/form'] = {'body': 'etag page', 'etag': '"abc"'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=0)
+
+    cache.get(session, server.url('/form'))
+    response = cache.get(session, server.url('/form'))
+
+    assert (response.status, response.text) == ('revalidated', 'etag page')
+    assert server.requests_for('/form')[-1].get('If-None-Match') == '"abc"'
+    assert cache.stats()['revalidated_total'] == 1
+
+
+def test_last_modified_revalidation(server, session, tmp_path):
+    last_modified = 'Mon, 19 Oct 2026 08:00:00 GMT'
+    server.pages['/form'] = {'body': 'dated page', 'last_modified': last_modified}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=0)
+
+    cache.get(session, server.url('/form'))
+    response = cache.get(session, server.url('/form'))
+
+    assert (response.status, response.text) == ('revalidated', 'dated page')
+    headers = server.requests_for('/form')[-1]
+    assert headers.get('If-Modified-Since') == last_modified
+    assert 'If-None-Match' not in headers
+
+
+def test_changed_page_is_fetched_again(server, session, tmp_path):
+    server.pages['/form'] = {'body': 'old', 'etag': '"1"'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=0)
+    cache.get(session, server.url('/form'))
+
+    server.pages['/form'] = {'body': 'new', 'etag': '"2"'}
+    response = cache.get(session, server.url('/form'))
+
+    assert (response.status, response.text) == ('fetched', 'new')
+
+
+def test_ttl_expiry(server, session, tmp_path, monkeypatch):
+    server.pages['/form'] = {'body': 'page', 'etag': '"v1"'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=60)
+    now = http_cache.time.time()
+    monkeypatch.setattr(http_cache.time, 'time', lambda: now)
+    cache.get(session, server.url('/form'))
+
+    monkeypatch.setattr(http_cache.time, 'time', lambda: now + 59)
+    assert cache.get(session, server.url('/form')).status == 'fresh'
+
+    monkeypatch.setattr(http_cache.time, 'time', lambda: now + 61)
+    assert cache.get(session, server.url('/form')).status == 'revalidated'
+    # Revalidation restarts the TTL
+    monkeypatch.setattr(http_cache.time, 'time', lambda: now + 100)
+    assert cache.get(session, server.url('/form')).status == 'fresh'
+    assert len(server.requests_for('/form')) == 2
+
+
+def test_no_store_is_not_cached(server, session, tmp_path):
+    server.pages['/private'] = {'body': 'secret', 'etag': '"x"', 'cache_control': 'private, no-store'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300)
+
+    first = cache.get(session, server.url('/private'))
+    second = cache.get(session, server.url('/private'))
+
+    assert first.status == second.status == 'fetched'
+    assert cache.stats()['entries'] == 0
+    assert os.listdir(tmp_path) == []
+    assert 'If-None-Match' not in server.requests_for('/private')[-1]
+
+
+def test_quota_evicts_least_recently_used(server, session, tmp_path):
+    for name in 'abcd':
+        server.pages[f'/{name}'] = {'body': name * 1000}
+    # Room for three entries of ~1.1 KB each, not four
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300, max_bytes=3500)
+    for name in 'abc':
+        cache.get(session, server.url(f'/{name}'))
+    cache.get(session, server.url('/a'))  # 'b' is now the least recently used
+
+    cache.get(session, server.url('/d'))
+
+    stats = cache.stats()
+    assert stats['entries'] == 3
+    assert stats['evicted_total'] == 1
+    assert stats['bytes_held'] <= 3500
+    assert cache.get(session, server.url('/a')).status == 'fresh'
+    assert cache.get(session, server.url('/b')).status == 'fetched'
+
+
+def test_corrupt_entry_is_dropped_and_refetched(server, session, tmp_path):
+    server.pages['/form'] = {'body': 'good', 'etag': '"v1"'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300)
+    cache.get(session, server.url('/form'))
+    [file_name] = os.listdir(tmp_path)
+    with open(os.path.join(tmp_path, file_name), 'w', encoding='utf-8') as file:
+        file.write('{"url": "truncated')
+
+    response = cache.get(session, server.url('/form'))
+
+    assert (response.status, response.text) == ('fetched', 'good')
+    # Nothing to revalidate against, so the request is unconditional
+    assert 'If-None-Match' not in server.requests_for('/form')[-1]
+    assert cache.get(session, server.url('/form')).status == 'fresh'
+    assert cache.stats()['entries'] == 1
+
+
+def test_http_error_raises_and_is_not_cached(server, session, tmp_path):
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300)
+
+    with pytest.raises(requests.HTTPError):
+        cache.get(session, server.url('/missing'))
+
+    assert cache.stats()['entries'] == 0
+
+
+def test_clear(server, session, tmp_path):
+    server.pages['/form'] = {'body': 'page'}
+    cache = HTTPCache(str(tmp_path), ttl_seconds=300)
+    cache.get(session, server.url('/form'))
+
+    cache.clear()
+
+    assert cache.stats()['entries'] == 0
+    assert os.listdir(tmp_path) == []
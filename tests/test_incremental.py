@@ -0,0 +1,70 @@
+"""
+Tests for incremental.IncrementalUWPConverter.
+"""
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from incremental import IncrementalUWPConverter  # noqa: E402
+from utils import DataProcessor  # noqa: E402
+
+
+@pytest.fixture
+def export(make_export):
+    return make_export(**{'First Name': ['Ann', 'Bob', 'Cat', 'Dan'],
+                          'Member Number': [1001, None, 1002, None]})
+
+
+def assert_same_output(actual, expected):
+    # Reused rows come back from the manifest file, so compare values as text
+    pd.testing.assert_frame_equal(actual.astype(str).reset_index(drop=True),
+                                  expected.astype(str).reset_index(drop=True))
+
+
+def test_first_run_matches_full_conversion(export, tmp_path):
+    converter = IncrementalUWPConverter(str(tmp_path / 'manifest.csv'))
+
+    result = converter.convert(export)
+
+    expected = DataProcessor.convert_csv_to_uwp(export)
+    assert_same_output(result.full, expected)
+    pd.testing.assert_frame_equal(result.changed, expected)
+    assert (result.new_count, result.changed_count, result.unchanged_count) == (4, 0, 0)
+
+
+def test_blank_keys_are_emitted_every_run(export, tmp_path):
+    converter = IncrementalUWPConverter(str(tmp_path / 'manifest.csv'))
+    converter.convert(export)
+    export.loc[2, 'Surname'] = 'Changed'
+
+    result = converter.convert(export)
+
+    assert_same_output(result.full, DataProcessor.convert_csv_to_uwp(export))
+    assert result.changed['FirstName'].tolist() == ['Bob', 'Cat', 'Dan']
+    assert (result.new_count, result.changed_count, result.unchanged_count) == (2, 1, 1)
+    assert result.deleted.empty
+    manifest = converter.load_manifest()
+    assert manifest['MembershipNumber'].tolist() == ['1001.0', '1002.0']
+
+
+def test_duplicate_keys_keep_first_row(make_export, tmp_path):
+    export = make_export(**{'First Name': ['Ann', 'Ann again', 'Bob'],
+                            'Member Number': [1001, 1001, 1002]})
+    converter = IncrementalUWPConverter(str(tmp_path / 'manifest.csv'))
+
+    result = converter.convert(export)
+
+    assert result.full['FirstName'].tolist() == ['Ann', 'Bob']
+
+
+def test_unchanged_rows_are_reused_and_deletions_reported(export, tmp_path):
+    converter = IncrementalUWPConverter(str(tmp_path / 'manifest.csv'))
+    converter.convert(export)
+    remaining = export.drop(index=2)
+
+    result = converter.convert(remaining)
+
+    assert_same_output(result.full, DataProcessor.convert_csv_to_uwp(remaining))
+    assert result.changed['FirstName'].tolist() == ['Bob', 'Dan']
+    assert result.deleted['MembershipNumber'].tolist() == ['1002.0']
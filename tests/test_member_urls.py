@@ -0,0 +1,49 @@
+"""
+Tests for bulk personalised survey links (URLBuilder.build_member_urls and
+the `urls` CLI command).
+"""
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import cli  # noqa: E402
+from utils import URLBuilder  # noqa: E402
+
+
+@pytest.fixture
+def members():
+    return pd.DataFrame({
+        'MembershipNumber': [1001, 1002],
+        'FirstName': ['Ann', 'Bob Jr'],
+        'MobilePhone': [7700900001, None]
+    })
+
+
+def test_build_member_urls(members):
+    urls = URLBuilder.build_member_urls(members, 'f/x', ['FirstName', 'MembershipNumber'])
+
+    assert urls.iloc[1].endswith('f/x?FirstName=Bob%20Jr&MembershipNumber=1002')
+
+
+def test_unknown_parameter_is_rejected(members):
+    with pytest.raises(ValueError, match='Nope'):
+        URLBuilder.build_member_urls(members, 'f/x', ['FirstName', 'MembershipNumber', 'Nope'])
+
+
+def test_non_string_parameter_is_rejected(members):
+    with pytest.raises(ValueError, match='strings'):
+        URLBuilder.build_member_urls(members, 'f/x', ['FirstName', 1])
+
+
+def test_cli_rejects_unknown_param(members, tmp_path, capsys):
+    source = tmp_path / 'members.csv'
+    output = tmp_path / 'links.csv'
+    members.to_csv(source, index=False)
+
+    code = cli.main(['-q', 'urls', str(source), '--path', 'f/x', '--param', 'Bogus',
+                     '-o', str(output)])
+
+    assert code == 1
+    assert 'Unknown URL parameters: Bogus' in capsys.readouterr().err
+    assert not output.exists()
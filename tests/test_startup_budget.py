@@ -0,0 +1,33 @@
+"""
+Startup checks from benchmarks/startup_budget.py. Every entry point must keep
+heavy modules lazy. The wall-clock budgets depend on the machine, so they only
+run with RUN_BUDGETS=1 (scale them with STARTUP_BUDGET_SCALE, e.g. 2 on slow CI).
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from startup_budget import (ENTRY_POINTS, check_entry_point, find_eager_imports,  # noqa: E402
+                            measure_entry_point)
+
+
+@pytest.mark.parametrize('name', list(ENTRY_POINTS))
+def test_entry_point_keeps_heavy_modules_lazy(name):
+    settings = ENTRY_POINTS[name]
+    entries = measure_entry_point(name, settings['statement'])['entries']
+
+    assert find_eager_imports(entries, settings['forbidden']) == []
+
+
+@pytest.mark.skipif(os.environ.get('RUN_BUDGETS') != '1', reason="set RUN_BUDGETS=1 to check import-time budgets")
+@pytest.mark.parametrize('name', list(ENTRY_POINTS))
+def test_entry_point_within_budget(name):
+    budget_scale = float(os.environ.get('STARTUP_BUDGET_SCALE', '1'))
+
+    result = check_entry_point(name, ENTRY_POINTS[name], repeat=3, budget_scale=budget_scale)
+
+    assert result['violations'] == []
@@ -4,58 +4,238 @@ Contains common data processing and file handling functions.
 Optimized for performance with lazy loading and caching.
 """
 
+import io
 import os
 import re
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 
-# Lazy loading - import heavy dependencies only when needed
-_pandas = None
-_premailer_transform = None
-_config_cache = None
+import lazy_imports
+from instrumentation import stage, instrumented
 
-
-def _get_pandas():
-    """Lazy load pandas module."""
-    global _pandas
-    if _pandas is None:
-        import pandas as pd
-        _pandas = pd
-    return _pandas
+# Lazy loading - heavy dependencies are imported on first use (see lazy_imports)
+_get_pandas = lazy_imports.getter('pandas')
+_get_numpy = lazy_imports.getter('numpy')
 
 
 def _get_premailer():
     """Lazy load premailer transform function."""
-    global _premailer_transform
-    if _premailer_transform is None:
-        from premailer import transform
-        _premailer_transform = transform
-    return _premailer_transform
+    return lazy_imports.load('premailer').transform
 
 
+@lru_cache(maxsize=None)
 def _get_config():
     """Cache config imports."""
-    global _config_cache
-    if _config_cache is None:
-        from config import CSV_COLUMN_MAPPING, URL_BUILDER_PARAMS, BASE_SURVEY_URL
-        _config_cache = {
-            'CSV_COLUMN_MAPPING': CSV_COLUMN_MAPPING,
-            'URL_BUILDER_PARAMS': URL_BUILDER_PARAMS,
-            'BASE_SURVEY_URL': BASE_SURVEY_URL
-        }
-    return _config_cache
+    from config import CSV_COLUMN_MAPPING, URL_BUILDER_PARAMS, BASE_SURVEY_URL
+    return {
+        'CSV_COLUMN_MAPPING': CSV_COLUMN_MAPPING,
+        'URL_BUILDER_PARAMS': URL_BUILDER_PARAMS,
+        'BASE_SURVEY_URL': BASE_SURVEY_URL
+    }
+
+
+class CompressionHandler:
+    """Handles transparent decompression of compressed input files."""
+    
+    # File extension -> compression name (as understood by pandas)
+    COMPRESSION_EXTENSIONS = {
+        '.gz': 'gzip',
+        '.bz2': 'bz2',
+        '.zst': 'zstd',
+        '.zip': 'zip'
+    }
+    
+    @staticmethod
+    def split_compression(file_name: str) -> Tuple[str, Optional[str]]:
+        """
+        Split a compression extension off a file name.
+        
+        Args:
+            file_name: File name such as 'export.csv.gz'
+            
+        Returns:
+            Tuple of (name without compression extension, compression or None)
+        """
+        lower_name = file_name.lower()
+        for extension, compression in CompressionHandler.COMPRESSION_EXTENSIONS.items():
+            if lower_name.endswith(extension):
+                return file_name[:-len(extension)], compression
+        return file_name, None
+    
+    @staticmethod
+    def check_available(compression: Optional[str]) -> None:
+        """
+        Check that the module needed for a compression format is installed.
+        
+        Raises:
+            ValueError: If zstd is requested but 'zstandard' is not installed
+        """
+        if compression == 'zstd' and not lazy_imports.is_available('zstandard'):
+            raise ValueError("Reading .zst files requires the 'zstandard' package.")
+    
+    @staticmethod
+    def open_decompressed(source, compression: str):
+        """
+        Open a streaming, decompressing binary reader over a file.
+        
+        Args:
+            source: File path or binary file object
+            compression: 'gzip', 'bz2' or 'zstd'
+            
+        Returns:
+            Readable binary file object yielding decompressed data
+        """
+        if compression == 'gzip':
+            import gzip
+            return gzip.open(source, 'rb')
+        if compression == 'bz2':
+            import bz2
+            return bz2.open(source, 'rb')
+        if compression == 'zstd':
+            CompressionHandler.check_available(compression)
+            zstandard = lazy_imports.load('zstandard')
+            raw = open(source, 'rb') if isinstance(source, (str, os.PathLike)) else source
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=raw is not source)
+        raise ValueError(f"Unsupported compression: {compression}")
+    
+    @staticmethod
+    def find_zip_member(zip_file: 'zipfile.ZipFile') -> str:
+        """
+        Find the single data file inside a zip archive.
+        
+        Args:
+            zip_file: Open zip archive
+            
+        Returns:
+            Name of the .csv or .xlsx member
+            
+        Raises:
+            ValueError: If the archive holds no data file or more than one
+        """
+        members = [
+            info.filename for info in zip_file.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('._')
+            and info.filename.lower().endswith(('.csv', '.xlsx'))
+        ]
+        if not members:
+            raise ValueError("Zip archive does not contain a .csv or .xlsx file.")
+        if len(members) > 1:
+            raise ValueError(f"Zip archive contains more than one data file: {', '.join(members)}")
+        return members[0]
+
+    
+    @staticmethod
+    def iter_csv_bytes(df: 'pd.DataFrame', compression: Optional[str] = None,
+                       level: int = 6, chunk_rows: int = 50000):
+        """
+        Serialize a DataFrame to CSV in row chunks, optionally gzip-compressing
+        each chunk as it is produced, so large outputs can be streamed.
+        
+        Args:
+            df: DataFrame to serialize
+            compression: None for plain CSV or 'gzip'
+            level: Compression level (1-9)
+            chunk_rows: Number of rows serialized per chunk
+            
+        Yields:
+            Chunks of (compressed) CSV bytes
+        """
+        compressor = None
+        if compression == 'gzip':
+            import zlib
+            # wbits=31 produces a gzip container rather than raw zlib
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif compression is not None:
+            raise ValueError(f"Unsupported output compression: {compression}")
+        
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows].to_csv(
+                index=False, header=(start == 0), lineterminator='\n'
+            ).encode()
+            if compressor is None:
+                yield chunk
+            else:
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+        if compressor is not None:
+            yield compressor.flush()
+    
+    @staticmethod
+    def iter_zip_bytes(named_dataframes, compress_type: int = None, level: int = 6):
+        """
+        Build a zip archive of CSV files, yielding archive bytes after each entry.
+        
+        Args:
+            named_dataframes: Iterable of (entry name, DataFrame) pairs
+            compress_type: zipfile.ZIP_DEFLATED (default) or zipfile.ZIP_STORED
+            level: Deflate level (1-9), ignored for stored entries
+            
+        Yields:
+            Chunks of zip archive bytes
+        """
+        import zipfile
+        if compress_type is None:
+            compress_type = zipfile.ZIP_DEFLATED
+        buffer = _StreamBuffer()
+        # The buffer is not seekable, so zipfile writes streaming data descriptors
+        with zipfile.ZipFile(buffer, 'w', compression=compress_type, compresslevel=level) as zip_file:
+            for entry_name, df in named_dataframes:
+                zip_file.writestr(entry_name, df.to_csv(index=False, lineterminator='\n'))
+                yield buffer.drain()
+        yield buffer.drain()
+
+
+class _StreamBuffer:
+    """Write-only buffer that hands written bytes over to a streaming response."""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written so far."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
 
 
 class DataProcessor:
     """Handles data processing operations for CSV and Excel files."""
     
     @staticmethod
-    def load_data_file(file_path: str) -> 'pd.DataFrame':
+    def _require_pyarrow(file_type: str) -> None:
+        """
+        Check that pyarrow is installed for Parquet/Feather files.
+        
+        Raises:
+            ValueError: If pyarrow is not installed
         """
-        Load a data file (CSV or Excel) into a pandas DataFrame.
+        if not lazy_imports.is_available('pyarrow'):
+            raise ValueError(f"{file_type.capitalize()} files require the 'pyarrow' package.")
+    
+    @staticmethod
+    def load_data_file(file_path, file_name: str = None,
+                       columns: List[str] = None) -> 'pd.DataFrame':
+        """
+        Load a data file (CSV, Excel, Parquet or Feather) into a pandas DataFrame.
         Optimized for performance with faster CSV engine.
+        Compressed files (.gz, .bz2, .zst, or a .zip holding one data file)
+        are decompressed while streaming, never extracted to disk.
         
         Args:
-            file_path: Path to the file to load
+            file_path: Path to the file to load, or a binary file object (e.g. an upload)
+            file_name: Name used to detect the file type when file_path is a file object
+            columns: Optional list of columns to read; other columns are skipped
+                     while parsing (Parquet/Feather never read them from disk)
             
         Returns:
             pandas DataFrame containing the file data
@@ -63,14 +243,55 @@ class DataProcessor:
         Raises:
             ValueError: If file type is not supported
         """
+        if file_name is None:
+            file_name = file_path if isinstance(file_path, str) else getattr(file_path, 'filename', '')
+        with stage('load') as record:
+            df = DataProcessor._read_data_file(file_path, file_name, columns)
+            record.rows = len(df)
+            if record.active and isinstance(file_path, str):
+                record.bytes = os.path.getsize(file_path)
+        return df
+    
+    @staticmethod
+    def _read_data_file(file_path, file_name: str, columns: Optional[List[str]]) -> 'pd.DataFrame':
+        """Read a data file (see load_data_file)."""
         pd = _get_pandas()
-        if file_path.endswith('.xlsx'):
-            return pd.read_excel(file_path)
-        elif file_path.endswith('.csv'):
-            # Use faster C engine for CSV reading
-            return pd.read_csv(file_path, engine='c', low_memory=False)
+        base_name, compression = CompressionHandler.split_compression(file_name)
+        CompressionHandler.check_available(compression)
+        
+        if compression == 'zip':
+            import zipfile
+            with zipfile.ZipFile(file_path) as zip_file:
+                member = CompressionHandler.find_zip_member(zip_file)
+                with zip_file.open(member) as stream:
+                    if member.lower().endswith('.xlsx'):
+                        return pd.read_excel(stream, engine='openpyxl', usecols=columns)
+                    return pd.read_csv(stream, engine='c', low_memory=False, usecols=columns)
+        
+        lower_name = base_name.lower()
+        if lower_name.endswith(('.parquet', '.feather')):
+            file_type = 'parquet' if lower_name.endswith('.parquet') else 'feather'
+            if compression is not None:
+                raise ValueError(f"{file_type.capitalize()} files are already compressed "
+                                 f"and cannot be read from a {compression} archive.")
+            DataProcessor._require_pyarrow(file_type)
+            if file_type == 'parquet':
+                return pd.read_parquet(file_path, columns=columns)
+            return pd.read_feather(file_path, columns=columns)
+        elif lower_name.endswith('.xlsx'):
+            if compression is None:
+                return pd.read_excel(file_path, usecols=columns)
+            # openpyxl needs random access, so decompress the workbook into memory
+            with CompressionHandler.open_decompressed(file_path, compression) as stream:
+                return pd.read_excel(io.BytesIO(stream.read()), engine='openpyxl', usecols=columns)
+        elif lower_name.endswith('.csv'):
+            # Use faster C engine for CSV reading (pandas decompresses while parsing)
+            return pd.read_csv(file_path, engine='c', low_memory=False,
+                               compression=compression, usecols=columns)
         else:
-            raise ValueError("File type not supported. Please use .csv or .xlsx files.")
+            raise ValueError("File type not supported. Please use .csv, .xlsx, .parquet or "
+                             ".feather files (CSV/Excel optionally compressed as .gz, .bz2, "
+                             ".zst or .zip).")
     
     @staticmethod
     def save_data_file(df: 'pd.DataFrame', file_path: str, file_type: str = None) -> None:
@@ -81,18 +302,59 @@ class DataProcessor:
         Args:
             df: DataFrame to save
             file_path: Path where to save the file
-            file_type: Type of file to save ('csv' or 'xlsx'). If None, inferred from file_path
+            file_type: Type of file to save ('csv', 'xlsx', 'parquet' or 'feather').
+                       If None, inferred from file_path
         """
         if file_type is None:
-            file_type = 'xlsx' if file_path.endswith('.xlsx') else 'csv'
+            lower_path = file_path.lower()
+            if lower_path.endswith('.xlsx'):
+                file_type = 'xlsx'
+            elif lower_path.endswith('.parquet'):
+                file_type = 'parquet'
+            elif lower_path.endswith('.feather'):
+                file_type = 'feather'
+            else:
+                file_type = 'csv'
         
-        if file_type == 'xlsx':
-            df.to_excel(file_path, index=False, engine='openpyxl')
-        else:
-            # Use faster CSV writing
-            df.to_csv(file_path, index=False, lineterminator='\n')
+        with stage('serialize', rows=len(df)) as record:
+            if file_type == 'xlsx':
+                df.to_excel(file_path, index=False, engine='openpyxl')
+            elif file_type == 'parquet':
+                DataProcessor._require_pyarrow(file_type)
+                df.to_parquet(file_path, index=False)
+            elif file_type == 'feather':
+                DataProcessor._require_pyarrow(file_type)
+                # Feather cannot store a non-default index
+                df.reset_index(drop=True).to_feather(file_path)
+            else:
+                # Use faster CSV writing
+                df.to_csv(file_path, index=False, lineterminator='\n')
+            if record.active:
+                record.bytes = os.path.getsize(file_path)
     
     @staticmethod
+    def compile_mapping_plan(columns, column_mapping: Dict[str, str] = None) -> 'ColumnMappingPlan':
+        """
+        Get a validated mapping plan for a header row.
+        Plans are cached per distinct header and mapping, so batch runs over
+        files with identical headers validate the mapping only once.
+        
+        Args:
+            columns: Column names of the input (e.g. df.columns)
+            column_mapping: Optional custom mapping from CSV column names to UWP column names.
+                          If None, uses default mapping from config.
+            
+        Returns:
+            ColumnMappingPlan for the header
+            
+        Raises:
+            ValueError: If required or mapped columns are missing
+        """
+        mapping_key = None if column_mapping is None else tuple(column_mapping.items())
+        return _compile_mapping_plan(tuple(columns), mapping_key)
+    
+    @staticmethod
+    @instrumented('map')
     def convert_csv_to_uwp(df: 'pd.DataFrame', column_mapping: Dict[str, str] = None) -> 'pd.DataFrame':
         """
         Convert CSV data to UWP format by keeping specific columns and renaming them.
@@ -105,35 +367,8 @@ class DataProcessor:
         Returns:
             DataFrame with UWP format
         """
-        config = _get_config()
-        if column_mapping is None:
-            # Use default mapping
-            columns_to_keep = config['CSV_COLUMN_MAPPING']["columns_to_keep"]
-            new_column_names = config['CSV_COLUMN_MAPPING']["new_column_names"]
-            
-            # Check if all required columns exist
-            missing_columns = set(columns_to_keep) - set(df.columns)
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
-            
-            # Keep only required columns and rename them (avoid unnecessary copy if possible)
-            df_uwp = df[columns_to_keep].copy()
-            df_uwp.rename(columns=new_column_names, inplace=True)
-        else:
-            # Use custom mapping
-            # Filter out None values (unmapped columns)
-            valid_mapping = {k: v for k, v in column_mapping.items() if v is not None and v != ''}
-            
-            # Check if mapped columns exist in source DataFrame
-            missing_columns = set(valid_mapping.keys()) - set(df.columns)
-            if missing_columns:
-                raise ValueError(f"Missing mapped columns: {', '.join(missing_columns)}")
-            
-            # Select and rename columns (avoid unnecessary copy if possible)
-            df_uwp = df[list(valid_mapping.keys())].copy()
-            df_uwp.rename(columns=valid_mapping, inplace=True)
-        
-        return df_uwp
+        plan = DataProcessor.compile_mapping_plan(df.columns, column_mapping)
+        return plan.apply(df)
     
     @staticmethod
     def get_uwp_output_columns() -> List[str]:
@@ -163,16 +398,18 @@ class DataProcessor:
             raise ValueError(f"Workplace column '{workplace_column}' not found in DataFrame")
         
         workplaces = {}
-        unique_workplaces = df[workplace_column].unique()
-        
-        pd = _get_pandas()
-        for workplace in unique_workplaces:
-            if pd.notna(workplace):  # Skip NaN values
-                workplaces[workplace] = df[df[workplace_column] == workplace].copy()
+        with stage('partition', rows=len(df)):
+            unique_workplaces = df[workplace_column].unique()
+            
+            pd = _get_pandas()
+            for workplace in unique_workplaces:
+                if pd.notna(workplace):  # Skip NaN values
+                    workplaces[workplace] = df[df[workplace_column] == workplace].copy()
         
         return workplaces
     
     @staticmethod
+    @instrumented('filter')
     def create_sms_list(df: 'pd.DataFrame') -> 'pd.DataFrame':
         """
         Create an SMS list from the input DataFrame.
@@ -205,6 +442,7 @@ class DataProcessor:
         return sms_eligible[sms_columns].copy()
     
     @staticmethod
+    @instrumented('compare')
     def compare_dataframes(df1: 'pd.DataFrame', df2: 'pd.DataFrame', 
                           key_column: str) -> 'pd.DataFrame':
         """
@@ -222,6 +460,7 @@ class DataProcessor:
             raise ValueError(f"Key column '{key_column}' not found in one or both DataFrames")
         
         # Merge DataFrames to find differences
+        pd = _get_pandas()
         merged = pd.merge(df1, df2, on=key_column, how='outer', indicator=True)
         
         # Find records that exist only in df1
@@ -233,10 +472,68 @@ class DataProcessor:
         return missing_records
 
 
+class ColumnMappingPlan:
+    """Validated selection and renaming of columns for UWP conversion."""
+    
+    __slots__ = ('source_columns', 'output_columns')
+    
+    def __init__(self, source_columns: Tuple[str, ...], output_columns: Tuple[str, ...]):
+        """
+        Initialize the plan.
+        
+        Args:
+            source_columns: Input columns to keep, in output order
+            output_columns: New names for the kept columns
+        """
+        self.source_columns = source_columns
+        self.output_columns = output_columns
+    
+    def apply(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
+        """
+        Select and rename the columns of a DataFrame in a single step.
+        
+        Args:
+            df: Input DataFrame with the header the plan was compiled for
+            
+        Returns:
+            New DataFrame with the selected columns under their output names
+        """
+        # Column selection already returns a new frame; relabel it in place
+        # rather than copying again and renaming
+        df_out = df[list(self.source_columns)]
+        df_out.columns = list(self.output_columns)
+        return df_out
+
+
+@lru_cache(maxsize=128)
+def _compile_mapping_plan(header: Tuple, mapping_items: Optional[Tuple]) -> ColumnMappingPlan:
+    """Build and validate a mapping plan (cached, see DataProcessor.compile_mapping_plan)."""
+    available = set(header)
+    if mapping_items is None:
+        # Use default mapping
+        mapping_config = _get_config()['CSV_COLUMN_MAPPING']
+        source_columns = tuple(mapping_config["columns_to_keep"])
+        new_column_names = mapping_config["new_column_names"]
+        output_columns = tuple(new_column_names.get(column, column) for column in source_columns)
+        error_prefix = "Missing required columns"
+    else:
+        # Filter out None values (unmapped columns)
+        valid_items = [(k, v) for k, v in mapping_items if v is not None and v != '']
+        source_columns = tuple(k for k, _ in valid_items)
+        output_columns = tuple(v for _, v in valid_items)
+        error_prefix = "Missing mapped columns"
+    
+    missing_columns = [column for column in source_columns if column not in available]
+    if missing_columns:
+        raise ValueError(f"{error_prefix}: {', '.join(missing_columns)}")
+    return ColumnMappingPlan(source_columns, output_columns)
+
+
 class HTMLProcessor:
     """Handles HTML processing operations."""
     
     @staticmethod
+    @instrumented('remove_mso')
     def remove_mso_code(html_content: str) -> str:
         """
         Remove Microsoft Office (MSO) conditional comments from HTML.
@@ -251,6 +548,7 @@ class HTMLProcessor:
         return re.sub(mso_regex, '', html_content, flags=re.DOTALL)
     
     @staticmethod
+    @instrumented('inline_css')
     def inline_css(html_content: str) -> str:
         """
         Inline CSS styles in HTML content.
@@ -295,24 +593,259 @@ class URLBuilder:
             parameters: Dictionary mapping parameter names to boolean values
             
         Returns:
-            Complete survey URL with parameters
+            Complete survey URL with parameters, in URL_BUILDER_PARAMS order
         """
-        config = _get_config()
-        url = config['BASE_SURVEY_URL'] + base_path
-        url_builder_params = config['URL_BUILDER_PARAMS']
-        
-        # Add parameters to URL (optimized with list comprehension)
-        param_list = [
-            f"{param_name}={url_builder_params[param_name]}"
-            for param_name, include in parameters.items()
-            if include and param_name in url_builder_params
-        ]
+        url = _get_config()['BASE_SURVEY_URL'] + base_path
         
-        if param_list:
+        # The query suffix is compiled once per distinct parameter selection
+        suffix = _compile_parameter_suffix(URLBuilder.parameter_mask(parameters))
+        if suffix:
             separator = "&" if "?" in url else "?"
-            url += separator + "&".join(param_list)
+            url += separator + suffix
         
         return url
+    
+    @staticmethod
+    def parameter_mask(parameters) -> int:
+        """
+        Encode a parameter selection as a bitmask over URL_BUILDER_PARAMS.
+        Unknown parameter names are ignored.
+        
+        Args:
+            parameters: Dictionary mapping parameter names to boolean values,
+                        or a list of parameter names
+            
+        Returns:
+            Integer with bit i set when the i-th parameter is selected
+        """
+        bits = _parameter_bits()
+        if isinstance(parameters, dict):
+            parameters = [name for name, include in parameters.items() if include]
+        mask = 0
+        for name in parameters:
+            mask |= bits.get(name, 0)
+        return mask
+    
+    @staticmethod
+    def build_survey_urls(requests: List[Dict]) -> List[str]:
+        """
+        Build many survey URLs in one call.
+        
+        Args:
+            requests: List of dictionaries with a 'base_path' string and
+                      'parameters' (a list of names or a name -> bool dictionary)
+            
+        Returns:
+            List of URLs in request order
+            
+        Raises:
+            ValueError: If a request is malformed or names an unknown parameter
+        """
+        bits = _parameter_bits()
+        urls = []
+        for index, item in enumerate(requests):
+            if not isinstance(item, dict) or not isinstance(item.get('base_path'), str):
+                raise ValueError(f"Request {index}: 'base_path' must be a string")
+            parameters = item.get('parameters') or []
+            if not isinstance(parameters, (dict, list)):
+                raise ValueError(f"Request {index}: 'parameters' must be a list or an object")
+            if not all(isinstance(name, str) for name in parameters):
+                raise ValueError(f"Request {index}: parameter names must be strings")
+            unknown = [name for name in parameters if name not in bits]
+            if unknown:
+                raise ValueError(f"Request {index}: unknown parameters: {', '.join(map(str, unknown))}")
+            urls.append(URLBuilder.build_survey_url(item['base_path'].strip(), parameters))
+        return urls
+    
+    @staticmethod
+    def get_parameter_column(param_name: str) -> str:
+        """
+        Get the member file column that fills a URL parameter.
+        The merge placeholder names the UWP column, e.g. '(|MM_HomeAddress1|)'
+        is filled from 'HomeAddress1'.
+        
+        Args:
+            param_name: URL parameter name from URL_BUILDER_PARAMS
+            
+        Returns:
+            Column name
+        """
+        placeholder = _get_config()['URL_BUILDER_PARAMS'][param_name]
+        field = placeholder.strip('(|)')
+        return field[3:] if field.startswith('MM_') else field
+    
+    @staticmethod
+    def build_member_urls(df: 'pd.DataFrame', base_path: str, parameters,
+                          column_mapping: Dict[str, str] = None) -> 'pd.Series':
+        """
+        Build a personalised survey URL for every row of a member file.
+        Each column is URL-encoded once per distinct value, so repeated names,
+        employers and workplaces cost almost nothing.
+        
+        Args:
+            df: Member data (e.g. a UWP file)
+            base_path: Base path for the survey
+            parameters: Dictionary mapping parameter names to boolean values
+                        (as for build_survey_url), or a list of parameter names
+            column_mapping: Optional mapping from parameter names to column names,
+                            overriding get_parameter_column
+            
+        Returns:
+            Series of URLs aligned with df
+            
+        Raises:
+            ValueError: If a parameter name is unknown or a column needed by a
+                        selected parameter is missing
+        """
+        pd = _get_pandas()
+        template, columns = URLBuilder._compile_member_url(df.columns, base_path, parameters,
+                                                           column_mapping)
+        encoded_columns = URLBuilder._encode_url_columns(df, columns)
+        return pd.Series(URLBuilder._fill_url_template(template, encoded_columns, len(df)),
+                         index=df.index, name='SurveyURL', dtype=object)
+    
+    @staticmethod
+    def iter_member_url_csv(df: 'pd.DataFrame', base_path: str, parameters,
+                            column_mapping: Dict[str, str] = None,
+                            include_columns: List[str] = None,
+                            url_column: str = 'SurveyURL', chunk_rows: int = 50000):
+        """
+        Build member URLs in row chunks and serialize them as CSV, so links for
+        millions of members can be streamed without holding them all in memory.
+        
+        Args:
+            df: Member data
+            base_path: Base path for the survey
+            parameters: Selected parameters (see build_member_urls)
+            column_mapping: Optional parameter to column overrides
+            include_columns: Columns copied next to the URL (default: MembershipNumber
+                             if present)
+            url_column: Name of the URL column
+            chunk_rows: Number of rows per chunk
+            
+        Returns:
+            Iterator over chunks of CSV bytes
+            
+        Raises:
+            ValueError: If a parameter name is unknown or a column needed by a
+                        selected parameter is missing (raised here, before any
+                        output is produced)
+        """
+        template, columns = URLBuilder._compile_member_url(df.columns, base_path, parameters,
+                                                           column_mapping)
+        if include_columns is None:
+            include_columns = [column for column in ('MembershipNumber',) if column in df.columns]
+        # Encoding is done once up front; only the URL strings are built per chunk
+        encoded_columns = URLBuilder._encode_url_columns(df, columns)
+        
+        def generate():
+            for start in range(0, max(len(df), 1), chunk_rows):
+                end = start + chunk_rows
+                out = df.iloc[start:end][list(include_columns)].copy()
+                out[url_column] = URLBuilder._fill_url_template(
+                    template, [encoded[start:end] for encoded in encoded_columns], len(out))
+                yield out.to_csv(index=False, header=(start == 0), lineterminator='\n').encode()
+        
+        return generate()
+    
+    @staticmethod
+    def _compile_member_url(header, base_path: str, parameters,
+                            column_mapping: Optional[Dict[str, str]]) -> Tuple[str, Tuple[str, ...]]:
+        """Resolve and validate the URL template for a header (see _compile_url_template)."""
+        if isinstance(parameters, dict):
+            names = tuple(name for name, include in parameters.items() if include)
+        else:
+            names = tuple(parameters)
+        if not all(isinstance(name, str) for name in names):
+            raise ValueError("URL parameter names must be strings")
+        unknown = [name for name in names if name not in _parameter_bits()]
+        if unknown:
+            raise ValueError(f"Unknown URL parameters: {', '.join(unknown)}")
+        mapping_key = None if column_mapping is None else tuple(sorted(column_mapping.items()))
+        template, columns = _compile_url_template(base_path, names, mapping_key)
+        missing = [column for column in columns if column not in set(header)]
+        if missing:
+            raise ValueError(f"Missing columns for URL parameters: {', '.join(missing)}")
+        return template, columns
+    
+    @staticmethod
+    def _encode_url_columns(df: 'pd.DataFrame', columns: Tuple[str, ...]) -> List:
+        """URL-encode the parameter columns, each distinct value only once."""
+        np = _get_numpy()
+        pd = _get_pandas()
+        encoded_columns = []
+        for column in columns:
+            series = df[column]
+            present = series.notna().to_numpy()
+            if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) \
+                    and (series[present] % 1 == 0).all():
+                # Whole numbers (member numbers, phones) are digits only and need no encoding
+                encoded = np.full(len(series), '', dtype=object)
+                encoded[present] = series[present].astype('int64').astype(str).to_numpy(dtype=object)
+            else:
+                codes, uniques = pd.factorize(series)
+                # The extra last entry serves missing values (code -1)
+                lookup = np.array([_encode_url_value(value) for value in uniques] + [''], dtype=object)
+                encoded = lookup[codes]
+            encoded_columns.append(encoded)
+        return encoded_columns
+    
+    @staticmethod
+    def _fill_url_template(template: str, encoded_columns: List, rows: int):
+        """Fill the URL template with the encoded values of every row in one pass."""
+        np = _get_numpy()
+        if not encoded_columns:
+            return np.full(rows, template, dtype=object)
+        return np.array(list(map(template.format, *encoded_columns)), dtype=object)
+
+
+@lru_cache(maxsize=1)
+def _parameter_bits() -> Dict[str, int]:
+    """Bit for each URL_BUILDER_PARAMS entry, in config order."""
+    return {name: 1 << index for index, name in enumerate(_get_config()['URL_BUILDER_PARAMS'])}
+
+
+@lru_cache(maxsize=256)
+def _compile_parameter_suffix(mask: int) -> str:
+    """Build the 'Name=(|Placeholder|)&...' query suffix for a parameter bitmask."""
+    url_builder_params = _get_config()['URL_BUILDER_PARAMS']
+    return "&".join(
+        f"{name}={placeholder}"
+        for index, (name, placeholder) in enumerate(url_builder_params.items())
+        if mask >> index & 1
+    )
+
+
+def _encode_url_value(value) -> str:
+    """URL-encode one value; whole-number floats (e.g. phone numbers read with gaps) lose '.0'."""
+    from urllib.parse import quote
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return quote(str(value), safe='')
+
+
+@lru_cache(maxsize=64)
+def _compile_url_template(base_path: str, names: Tuple[str, ...],
+                          mapping_key: Optional[Tuple]) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Precompile a member URL template.
+    Parameter names are validated by URLBuilder._compile_member_url.
+    
+    Returns:
+        Tuple of (template, columns): a str.format template with one '{}' per
+        parameter, and the column filling each parameter
+    """
+    config = _get_config()
+    url = config['BASE_SURVEY_URL'] + base_path
+    column_mapping = dict(mapping_key or ())
+
+    separator = "&" if "?" in url else "?"
+    template, columns = url.replace('{', '{{').replace('}', '}}'), []
+    for name in names:
+        template += f"{separator}{name}={{}}"
+        columns.append(column_mapping.get(name) or URLBuilder.get_parameter_column(name))
+        separator = "&"
+    return template, tuple(columns)
 
 
 class FileHandler:
@@ -0,0 +1,135 @@
+"""
+JotForm validator window for the Unite Toolbox.
+Opens as a Toplevel inside the running application, sharing its loaded
+modules and the validator's pooled HTTP session and page cache, so no new
+Python process is started. validate-jot.py runs the same window standalone.
+"""
+
+import tkinter as tk
+from tkinter import scrolledtext, Listbox, END, messagebox
+from typing import Optional
+
+import jotform_validator
+
+
+class ValidatorWindow(tk.Toplevel):
+    """Window for checking the inputs of a JotForm form."""
+
+    def __init__(self, master: tk.Misc, url: Optional[str] = None):
+        """
+        Create the validator window.
+
+        Args:
+            master: Parent window (the application root)
+            url: Optional form URL to fill in
+        """
+        super().__init__(master)
+        self.title("JotForm Validator")
+        # Parsed form: every label is resolved and validated once, when the form is loaded
+        self.form = None
+        self._build()
+        if url:
+            self.url_entry.insert(0, url)
+
+    def _build(self) -> None:
+        """Create the widgets."""
+        tk.Label(self, text="Enter JotForm URL:").pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        self.url_entry = tk.Entry(self)
+        self.url_entry.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        self.url_entry.bind('<Return>', lambda event: self.load_form())
+        self.url_entry.focus_set()
+
+        tk.Button(self, text="Search", command=self.load_form).pack(
+            side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+        self.form_title_label = tk.Label(self, text="Form Title", font=('TkDefaultFont', 24))
+        self.form_title_label.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+        tk.Label(self, text="Labels:").pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        self.labels_listbox = Listbox(self)
+        self.labels_listbox.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.labels_listbox.bind('<Double-Button-1>', lambda event: self.validate_selected())
+
+        tk.Button(self, text="Validate", command=self.validate_selected).pack(
+            side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        tk.Button(self, text="Validate All", command=self.validate_all).pack(
+            side=tk.TOP, fill=tk.X, padx=10, pady=5)
+
+        tk.Label(self, text="Validated Data:").pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+        self.output_text = scrolledtext.ScrolledText(self, height=10, font=('TkDefaultFont', 22))
+        self.output_text.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.output_text.tag_config('red', foreground='red')
+        self.output_text.tag_config('heading', underline=True)
+        self.output_text.config(state=tk.DISABLED)
+
+    def load_form(self) -> None:
+        """Fetch and index the form at the entered URL."""
+        url = self.url_entry.get().strip()
+        if not url:
+            return
+        self.config(cursor='watch')
+        self.update_idletasks()
+        try:
+            html_data = jotform_validator.fetch_form(url)
+        except Exception as e:
+            messagebox.showerror("Error", f"Request failed: {e}", parent=self)
+            return
+        finally:
+            self.config(cursor='')
+
+        self.form = jotform_validator.index_form(html_data)
+        self.form_title_label.config(text=self.form.title or "Form Title Not Found")
+
+        # List every label; rows line up with form.fields, flagged ones in red
+        self.labels_listbox.delete(0, END)
+        for field in self.form.fields:
+            self.labels_listbox.insert(END, field['label'])
+            if field['flagged']:
+                self.labels_listbox.itemconfig(END, foreground='red')
+        self._set_output([])
+
+    def validate_selected(self) -> None:
+        """Show the results of the selected label."""
+        selection = self.labels_listbox.curselection()
+        if not selection or not self.form:
+            return
+        field = self.form.fields[selection[0]]
+        if field['problem']:
+            messagebox.showerror("Error", field['problem'], parent=self)
+            return
+        self._set_output(self._field_lines(field))
+
+    def validate_all(self) -> None:
+        """Show the results of every field, flagged fields first."""
+        if not self.form:
+            return
+        flagged = [field for field in self.form.fields if field['flagged']]
+        lines = [(f"{len(self.form.fields)} fields, {len(flagged)} flagged\n\n", 'heading')]
+        for field in flagged + [field for field in self.form.fields if not field['flagged']]:
+            lines.extend(self._field_lines(field, show_label=True))
+            lines.append(('\n', 'black'))
+        self._set_output(lines)
+
+    @staticmethod
+    def _field_lines(field, show_label: bool = False):
+        """Output lines (text, tag) for one field's precomputed results."""
+        lines = [(field['label'] + '\n', 'heading')] if show_label else []
+        if field['problem']:
+            lines.append((field['problem'] + '\n', 'red'))
+        for text, value in field['checks']:
+            lines.append((text + value + '\n', 'red' if value == "No" else 'black'))
+        return lines
+
+    def _set_output(self, lines) -> None:
+        """Replace the output text."""
+        self.output_text.config(state=tk.NORMAL)
+        self.output_text.delete('1.0', tk.END)
+        for text, tag in lines:
+            self.output_text.insert(tk.END, text, tag)
+        self.output_text.config(state=tk.DISABLED)
+
+    def show(self) -> None:
+        """Bring the window to the front."""
+        self.deiconify()
+        self.lift()
+        self.url_entry.focus_set()